@@ -1,180 +1,147 @@
 """
 Analytics Endpoint
 Provides aggregated data for visualizations
-Self-contained file for Vercel serverless deployment
+Vercel serverless function (shared BigQuery client in api/utils)
 """
 
 import os
-import json
+import sys
 from http.server import BaseHTTPRequestHandler
 from urllib.parse import parse_qs, urlparse
-from datetime import datetime
-from google.cloud import bigquery
-from google.oauth2 import service_account
 
+# Shared utilities live in api/utils
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-# ============================================================================
-# BIGQUERY CLIENT (inline utility)
-# ============================================================================
-
-class BigQueryClient:
-    """Singleton BigQuery client for serverless functions"""
-
-    _instance = None
-    _client = None
+from utils.query_backend import get_query_backend, scalar_param
+from utils.cache import cached_response, response_etag
+from utils.response import send_success, send_bytes, error_response, etag_matches, not_modified_response
+from utils.columnar import (
+    to_columnar, to_arrow_ipc, arrow_available, is_row_list, RESPONSE_FORMATS, ARROW_CONTENT_TYPE
+)
+from utils.concurrency import run_parallel
+from utils.rate_limit import enforce_rate_limit, request_cost
+from utils.timing import begin_request
 
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(BigQueryClient, cls).__new__(cls)
-            cls._instance._initialize_client()
-        return cls._instance
+# Pipeline-built rollup (year x quarter x govt_type x employer x payee)
+SPENDING_CUBE_TABLE = 'ca-lobby.ca_lobby.spending_cube'
+LATEST_CUBE_YEAR = f"(SELECT MAX(year) FROM `{SPENDING_CUBE_TABLE}`)"
 
-    def _initialize_client(self):
-        """Initialize BigQuery client with service account credentials"""
-        try:
-            # Get credentials from environment variable
-            credentials_json = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS_JSON')
-
-            if not credentials_json:
-                # Try file-based credentials for local development
-                credentials_file = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS')
-                if credentials_file:
-                    credentials = service_account.Credentials.from_service_account_file(credentials_file)
-                    project_id = os.environ.get('BIGQUERY_PROJECT_ID')
-                else:
-                    raise ValueError("No credentials found")
-            else:
-                # Parse JSON credentials for Vercel deployment
-                credentials_info = json.loads(credentials_json)
-                credentials = service_account.Credentials.from_service_account_info(credentials_info)
-                project_id = os.environ.get('BIGQUERY_PROJECT_ID') or credentials_info['project_id']
-
-            # Initialize BigQuery client
-            self._client = bigquery.Client(
-                credentials=credentials,
-                project=project_id
-            )
-
-            print(f"✅ BigQuery client initialized for project: {project_id}")
-
-        except Exception as e:
-            print(f"❌ Failed to initialize BigQuery client: {e}")
-            raise
-
-    def execute_query(self, query, params=None):
-        """Execute a BigQuery query and return results"""
-        try:
-            job_config = bigquery.QueryJobConfig()
-            if params:
-                job_config.query_parameters = params
-
-            query_job = self._client.query(query, job_config=job_config)
-            results = query_job.result()
-
-            # Convert to list of dicts
-            return [dict(row) for row in results]
-
-        except Exception as e:
-            print(f"Query execution failed: {e}")
-            raise
+# Zero-filled spending breakdown returned when there is no data (or the query fails)
+EMPTY_SPENDING_BREAKDOWN = [
+    {'govt_type': 'city', 'spending_category': 'membership', 'total_amount': 0, 'filer_count': 0},
+    {'govt_type': 'city', 'spending_category': 'other_lobbying', 'total_amount': 0, 'filer_count': 0},
+    {'govt_type': 'county', 'spending_category': 'membership', 'total_amount': 0, 'filer_count': 0},
+    {'govt_type': 'county', 'spending_category': 'other_lobbying', 'total_amount': 0, 'filer_count': 0}
+]
 
 
 # ============================================================================
-# RESPONSE UTILITIES (inline utility)
+# VERCEL SERVERLESS FUNCTION HANDLER
 # ============================================================================
 
-def success_response(data, status_code=200):
-    """Create a successful JSON response"""
-    response = {
-        "success": True,
-        "data": data,
-        "timestamp": datetime.utcnow().isoformat() + "Z"
-    }
+class handler(BaseHTTPRequestHandler):
+    """Vercel serverless function handler for analytics"""
 
-    headers = {
-        "Content-Type": "application/json",
-        "Access-Control-Allow-Origin": "https://ca-lobbymono.vercel.app",
-        "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
-        "Access-Control-Allow-Headers": "Content-Type"
+    # Analytics type -> method that computes it
+    ANALYTICS_TYPES = {
+        'summary': '_get_summary_analytics',
+        'trends': '_get_trends_analytics',
+        'top_organizations': '_get_top_organizations',
+        'spending': '_get_spending_trends',
+        'spending_breakdown': '_get_spending_breakdown',
+        'org_spending_by_govt': '_get_org_spending_by_govt',
+        'top_city_recipients': '_get_top_city_recipients',
+        'top_county_recipients': '_get_top_county_recipients'
     }
 
-    return (
-        json.dumps(response, default=str),
-        status_code,
-        headers
+    # Spending chart types answered from the spending cube; they accept a year range
+    SPENDING_CUBE_TYPES = (
+        'spending',
+        'spending_breakdown',
+        'org_spending_by_govt',
+        'top_city_recipients',
+        'top_county_recipients'
     )
 
+    # Set when a fallback was served; degraded responses are not given an ETag
+    degraded = False
 
-def error_response(message, status_code=500, error_type="ServerError"):
-    """Create an error JSON response"""
-    response = {
-        "success": False,
-        "error": {
-            "type": error_type,
-            "message": message
-        },
-        "timestamp": datetime.utcnow().isoformat() + "Z"
-    }
-
-    headers = {
-        "Content-Type": "application/json",
-        "Access-Control-Allow-Origin": "https://ca-lobbymono.vercel.app",
-        "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
-        "Access-Control-Allow-Headers": "Content-Type"
+    # Data returned when a chart query fails, so the dashboard still renders
+    FALLBACKS = {
+        'spending_breakdown': EMPTY_SPENDING_BREAKDOWN,
+        'org_spending_by_govt': [],
+        'top_city_recipients': [],
+        'top_county_recipients': []
     }
 
-    return (
-        json.dumps(response),
-        status_code,
-        headers
-    )
-
-
-# ============================================================================
-# VERCEL SERVERLESS FUNCTION HANDLER
-# ============================================================================
-
-class handler(BaseHTTPRequestHandler):
-    """Vercel serverless function handler for analytics"""
-
     def do_GET(self):
         """Handle GET request for analytics"""
+        begin_request(self)
+
         try:
             # Parse query parameters
             parsed_url = urlparse(self.path)
             params = parse_qs(parsed_url.query)
 
-            # Extract analytics type
-            analytics_type = params.get('type', ['summary'])[0]
-
-            # Route to appropriate analytics function
-            if analytics_type == 'summary':
-                data = self._get_summary_analytics()
-            elif analytics_type == 'trends':
-                data = self._get_trends_analytics()
-            elif analytics_type == 'top_organizations':
-                data = self._get_top_organizations()
-            elif analytics_type == 'spending':
-                data = self._get_spending_trends()
-            elif analytics_type == 'spending_breakdown':
-                data = self._get_spending_breakdown()
-            elif analytics_type == 'org_spending_by_govt':
-                data = self._get_org_spending_by_govt()
-            elif analytics_type == 'top_city_recipients':
-                data = self._get_top_city_recipients()
-            elif analytics_type == 'top_county_recipients':
-                data = self._get_top_county_recipients()
+            # Extract analytics type(s): '?type=a,b,c' or '?types[]=a&types[]=b'
+            requested = params.get('types[]', []) + params.get('types', []) + params.get('type', [])
+            analytics_types = list(dict.fromkeys(
+                t.strip() for value in requested for t in value.split(',') if t.strip()
+            )) or ['summary']
+            batch = len(analytics_types) > 1 or 'types[]' in params or 'types' in params
+
+            # A batch reports unknown types per entry; a single type fails the request
+            if not batch and analytics_types[0] not in self.ANALYTICS_TYPES:
+                self._send_validation_error(
+                    f"Invalid type: must be one of {', '.join(self.ANALYTICS_TYPES)}"
+                )
+                return
+
+            # '?year=2024' or '?from=2020&to=2024' (spending chart types only)
+            try:
+                year_range = self._parse_year_range(params)
+            except ValueError as e:
+                self._send_validation_error(str(e))
+                return
+
+            # '?format=columnar' (column arrays) or '?format=arrow' (Arrow IPC, one type)
+            response_format = params.get('format', ['json'])[0].lower()
+            if response_format not in RESPONSE_FORMATS:
+                self._send_validation_error(f"Invalid format: must be one of {', '.join(RESPONSE_FORMATS)}")
+                return
+            if response_format == 'arrow' and (batch or not arrow_available()):
+                self._send_validation_error(
+                    "format=arrow requires a single analytics type" if batch
+                    else "format=arrow is not available on this deployment"
+                )
+                return
+
+            # Revalidation: skip every query if the client's copy is current
+            etag = response_etag('analytics', {
+                'types': analytics_types, 'batch': [str(batch)],
+                'from': [str(year_range[0] or '')], 'to': [str(year_range[1] or '')],
+                'format': [response_format]
+            })
+            if self._send_if_not_modified(etag):
+                return
+
+            # Charge the client's rate limit budget by each type's historical cost
+            if not enforce_rate_limit(self, sum(request_cost('analytics', t) for t in analytics_types)):
+                return
+
+            if not batch:
+                data, cache_hit = self._get_analytics_data(analytics_types[0], year_range)
+                etag = None if self.degraded else etag
+                headers = {'X-Cache': 'HIT' if cache_hit else 'MISS'}
+
+                if response_format == 'arrow':
+                    send_bytes(self, to_arrow_ipc(self._as_rows(data)), ARROW_CONTENT_TYPE, etag, headers)
+                else:
+                    if response_format == 'columnar':
+                        data = to_columnar(self._as_rows(data))
+                    send_success(self, data, etag=etag, headers=headers)
             else:
-                raise ValueError(f"Unknown analytics type: {analytics_type}")
-
-            # Return success response
-            body, status, headers = success_response(data)
-
-            self.send_response(status)
-            for key, value in headers.items():
-                self.send_header(key, value)
-            self.end_headers()
-            self.wfile.write(body.encode())
+                self._send_batch_response(analytics_types, year_range, etag, response_format)
 
         except Exception as e:
             # Return error response
@@ -191,66 +158,176 @@ class handler(BaseHTTPRequestHandler):
             self.end_headers()
             self.wfile.write(body.encode())
 
+    def _parse_year_range(self, params):
+        """Parse year/from/to query parameters
+
+        Returns:
+            tuple: (from_year, to_year), either may be None for the type's default
+
+        Raises:
+            ValueError: If a year is not a plausible integer or from > to
+        """
+        def parse_year(name):
+            value = params.get(name, [''])[0].strip()
+            if not value:
+                return None
+            if not value.isdigit() or not 1900 <= int(value) <= 2100:
+                raise ValueError(f"Invalid {name}: must be a four-digit year")
+            return int(value)
+
+        year = parse_year('year')
+        if year is not None:
+            return year, year
+
+        from_year, to_year = parse_year('from'), parse_year('to')
+        if from_year is not None and to_year is not None and from_year > to_year:
+            raise ValueError("Invalid year range: from must not be after to")
+        return from_year, to_year
+
+    def _send_if_not_modified(self, etag):
+        """Answer with 304 Not Modified if the client's cached copy is current
+
+        Returns:
+            bool: True if a 304 was sent
+        """
+        if not etag_matches(self.headers.get('If-None-Match'), etag):
+            return False
+
+        body, status, headers = not_modified_response(etag)
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        return True
+
+    def _send_validation_error(self, message):
+        """Send a 400 response for invalid request parameters"""
+        body, status, headers = error_response(
+            message=message,
+            status_code=400,
+            error_type="ValidationError"
+        )
+
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def _get_analytics_data(self, analytics_type, year_range=(None, None)):
+        """Get data for one analytics type, served from the response cache when possible
+
+        Returns:
+            tuple: (data, cache_hit)
+        """
+        if analytics_type not in self.ANALYTICS_TYPES:
+            raise ValueError(f"Unknown analytics type: {analytics_type}")
+
+        method = getattr(self, self.ANALYTICS_TYPES[analytics_type])
+        cache_params = {'type': [analytics_type]}
+        compute = method
+
+        # Only spending chart types take a year range (others keep one cache entry)
+        if analytics_type in self.SPENDING_CUBE_TYPES:
+            from_year, to_year = year_range
+            cache_params['from'] = [str(from_year or '')]
+            cache_params['to'] = [str(to_year or '')]
+            compute = lambda: method(from_year, to_year)
+
+        # Serve from the response cache while the data version is unchanged
+        try:
+            return cached_response('analytics', cache_params, compute)
+        except Exception as e:
+            if analytics_type not in self.FALLBACKS:
+                raise
+            # Chart types degrade to an empty/default payload (never cached)
+            print(f"ERROR: {self.ANALYTICS_TYPES[analytics_type]} failed: {e}")
+            self.degraded = True
+            return self.FALLBACKS[analytics_type], False
+
+    def _as_rows(self, data):
+        """Rows for columnar formats; a single-object result (e.g. summary) is one row"""
+        return data if is_row_list(data) else [data]
+
+    def _send_batch_response(self, analytics_types, year_range=(None, None), etag=None,
+                             response_format='json'):
+        """Compute several analytics types concurrently in one request
+
+        Sends one payload keyed by type. A failed type maps to None and its
+        error is reported under metadata.errors; the other types still succeed.
+        """
+        results = run_parallel(
+            {t: (lambda t=t: self._get_analytics_data(t, year_range)) for t in analytics_types},
+            return_exceptions=True
+        )
+
+        data = {}
+        errors = {}
+        hits = 0
+        for analytics_type, result in results.items():
+            if isinstance(result, Exception):
+                print(f"ERROR: Analytics type {analytics_type} failed: {result}")
+                data[analytics_type] = None
+                errors[analytics_type] = (
+                    str(result) if isinstance(result, ValueError)
+                    else "Analytics request failed. Please try again."
+                )
+            else:
+                data[analytics_type], cache_hit = result
+                hits += cache_hit
+                if response_format == 'columnar':
+                    data[analytics_type] = to_columnar(self._as_rows(data[analytics_type]))
+
+        send_success(
+            self, data,
+            metadata={"types": analytics_types, "errors": errors},
+            etag=None if errors or self.degraded else etag,
+            headers={'X-Cache': 'HIT' if hits == len(results) else ('PARTIAL' if hits else 'MISS')}
+        )
+
     def _get_summary_analytics(self):
         """Get summary statistics
 
-        FIXED: Now filters to latest amendments only to avoid counting amendments
-        as separate filings. Uses ROW_NUMBER() window function for deduplication.
+        Reads cvr_lobby_disclosure_latest (one row per filing, latest amendment,
+        built by the pipeline) so amendments are not counted as separate filings.
         """
         query = """
-        WITH latest_filings AS (
-            SELECT
-                FILER_ID,
-                FILING_ID,
-                RPT_DATE_DATE,
-                ROW_NUMBER() OVER (PARTITION BY FILING_ID ORDER BY AMEND_ID DESC) as rn
-            FROM `ca-lobby.ca_lobby.cvr_lobby_disclosure_cd`
-            WHERE RPT_DATE_DATE IS NOT NULL
-              AND RPT_DATE_DATE <= CURRENT_DATE()
-              AND EXTRACT(YEAR FROM RPT_DATE_DATE) >= 2000
-        )
         SELECT
             COUNT(DISTINCT FILER_ID) as total_organizations,
             COUNT(*) as total_filings,
             MAX(RPT_DATE_DATE) as latest_filing
-        FROM latest_filings
-        WHERE rn = 1
+        FROM `ca-lobby.ca_lobby.cvr_lobby_disclosure_latest`
+        WHERE RPT_DATE_DATE IS NOT NULL
+          AND RPT_DATE_DATE <= CURRENT_DATE()
+          AND RPT_DATE_DATE >= '2000-01-01'
         """
 
-        client = BigQueryClient()
-        result = client.execute_query(query)
+        client = get_query_backend()
+        result = client.execute_query(query, template='analytics.summary')
         return result[0] if result else {}
 
     def _get_trends_analytics(self):
         """Get filing trends over time
 
-        FIXED: Now filters to latest amendments only to avoid counting amendments
-        as separate filings. Uses ROW_NUMBER() window function for deduplication.
+        Reads cvr_lobby_disclosure_latest (one row per filing, latest amendment,
+        built by the pipeline) so amendments are not counted as separate filings.
         """
         query = """
-        WITH latest_filings AS (
-            SELECT
-                RPT_DATE_DATE,
-                RPT_DATE,
-                ROW_NUMBER() OVER (PARTITION BY FILING_ID ORDER BY AMEND_ID DESC) as rn
-            FROM `ca-lobby.ca_lobby.cvr_lobby_disclosure_cd`
-            WHERE RPT_DATE_DATE IS NOT NULL
-              AND RPT_DATE_DATE <= CURRENT_DATE()
-              AND EXTRACT(YEAR FROM RPT_DATE_DATE) >= 2020
-        )
         SELECT
             EXTRACT(YEAR FROM RPT_DATE_DATE) as year,
             RPT_DATE as period,
             COUNT(*) as filing_count
-        FROM latest_filings
-        WHERE rn = 1
+        FROM `ca-lobby.ca_lobby.cvr_lobby_disclosure_latest`
+        WHERE RPT_DATE_DATE IS NOT NULL
+          AND RPT_DATE_DATE <= CURRENT_DATE()
+          AND RPT_DATE_DATE >= '2020-01-01'
         GROUP BY year, period
         ORDER BY year DESC, period DESC
         LIMIT 12
         """
 
-        client = BigQueryClient()
-        return client.execute_query(query)
+        client = get_query_backend()
+        return client.execute_query(query, template='analytics.trends')
 
     def _get_top_organizations(self):
         """Get top organizations by spending - uses v_organization_summary view
@@ -276,206 +353,98 @@ class handler(BaseHTTPRequestHandler):
         LIMIT 10
         """
 
-        client = BigQueryClient()
-        return client.execute_query(query)
+        client = get_query_backend()
+        return client.execute_query(query, template='analytics.top_organizations')
 
-    def _get_spending_trends(self):
+    def _cube_year_params(self, from_year, to_year):
+        """Query parameters for the spending cube year range (NULL = type default)"""
+        return [
+            scalar_param('from_year', 'INT64', from_year),
+            scalar_param('to_year', 'INT64', to_year)
+        ]
+
+    def _get_spending_trends(self, from_year=None, to_year=None):
         """Get yearly spending trends by government type
 
-        FIXED: Now correctly uses EMPLR_NAML (who paid) instead of FIRM_NAME (lobbying firm)
-        and filters to latest amendments only to avoid double-counting.
-        Uses JOIN instead of IN subquery for multi-column filtering.
+        Reads the pipeline-built spending_cube (latest amendments only, employer
+        classified by GOVT_TYPE). Defaults to 2015 through the current year.
         """
-        query = """
-        WITH latest_amendments AS (
-            SELECT FILING_ID, MAX(AMEND_ID) as max_amend_id
-            FROM `ca-lobby.ca_lobby.cvr_lobby_disclosure_cd`
-            GROUP BY FILING_ID
-        ),
-        yearly_spending AS (
-            SELECT
-                EXTRACT(YEAR FROM p.RPT_DATE_DATE) as year,
-                pay.EMPLR_NAML as employer_name,
-                CAST(pay.PER_TOTAL AS FLOAT64) as amount,
-                CASE
-                    WHEN UPPER(pay.EMPLR_NAML) LIKE '%CITY OF%'
-                         OR UPPER(pay.EMPLR_NAML) LIKE '%LEAGUE%CITIES%'
-                    THEN 'city'
-                    WHEN UPPER(pay.EMPLR_NAML) LIKE '%COUNTY%'
-                         OR UPPER(pay.EMPLR_NAML) LIKE '%CSAC%'
-                         OR UPPER(pay.EMPLR_NAML) LIKE '%ASSOCIATION OF COUNTIES%'
-                    THEN 'county'
-                    ELSE 'other'
-                END as govt_type
-            FROM `ca-lobby.ca_lobby.cvr_lobby_disclosure_cd` p
-            INNER JOIN latest_amendments la
-                ON p.FILING_ID = la.FILING_ID
-                AND p.AMEND_ID = la.max_amend_id
-            INNER JOIN `ca-lobby.ca_lobby.lpay_cd` pay
-                ON p.FILING_ID = pay.FILING_ID
-                AND p.AMEND_ID = pay.AMEND_ID
-            WHERE p.RPT_DATE_DATE IS NOT NULL
-              AND p.RPT_DATE_DATE <= CURRENT_DATE()
-              AND EXTRACT(YEAR FROM p.RPT_DATE_DATE) >= 2015
-              AND EXTRACT(YEAR FROM p.RPT_DATE_DATE) <= EXTRACT(YEAR FROM CURRENT_DATE())
-              AND pay.PER_TOTAL IS NOT NULL
-              AND CAST(pay.PER_TOTAL AS FLOAT64) > 0
-        )
+        query = f"""
         SELECT
             year,
-            SUM(amount) as total_spending,
-            SUM(CASE WHEN govt_type = 'city' THEN amount ELSE 0 END) as city_spending,
-            SUM(CASE WHEN govt_type = 'county' THEN amount ELSE 0 END) as county_spending,
+            SUM(total_amount) as total_spending,
+            SUM(CASE WHEN govt_type = 'city' THEN total_amount ELSE 0 END) as city_spending,
+            SUM(CASE WHEN govt_type = 'county' THEN total_amount ELSE 0 END) as county_spending,
             COUNT(DISTINCT CASE WHEN govt_type = 'city' THEN employer_name END) as city_count,
             COUNT(DISTINCT CASE WHEN govt_type = 'county' THEN employer_name END) as county_count
-        FROM yearly_spending
+        FROM `{SPENDING_CUBE_TABLE}`
+        WHERE year BETWEEN COALESCE(@from_year, 2015)
+                       AND COALESCE(@to_year, EXTRACT(YEAR FROM CURRENT_DATE()))
         GROUP BY year
         ORDER BY year ASC
         """
 
-        client = BigQueryClient()
-        return client.execute_query(query)
+        client = get_query_backend()
+        return client.execute_query(
+            query, self._cube_year_params(from_year, to_year), template='analytics.spending'
+        )
 
-    def _get_spending_breakdown(self):
-        """Get spending breakdown by government type for most recent year with data
+    def _get_spending_breakdown(self, from_year=None, to_year=None):
+        """Get spending breakdown by government type for the selected years
 
         Classification logic:
-        - govt_type: Based on EMPLR_NAML (the city/county paying)
+        - govt_type: lpay_latest.GOVT_TYPE, classified from EMPLR_NAML (the city/county
+          paying) by the pipeline
 
-        Uses most recent year with data (handles the case where current year has no data yet)
+        Defaults to the most recent year in the spending cube (handles the case where
+        the current year has no data yet).
         Returns simplified data - just city and county totals (membership breakdown removed
         as it requires more complex data mapping)
         """
-        query = """
-        WITH latest_amendments AS (
-            SELECT FILING_ID, MAX(AMEND_ID) as max_amend_id
-            FROM `ca-lobby.ca_lobby.cvr_lobby_disclosure_cd`
-            GROUP BY FILING_ID
-        ),
-        spending_data AS (
-            SELECT
-                pay.EMPLR_NAML as employer_name,
-                CAST(pay.PER_TOTAL AS FLOAT64) as amount
-            FROM `ca-lobby.ca_lobby.cvr_lobby_disclosure_cd` p
-            INNER JOIN latest_amendments la
-                ON p.FILING_ID = la.FILING_ID
-                AND p.AMEND_ID = la.max_amend_id
-            INNER JOIN `ca-lobby.ca_lobby.lpay_cd` pay
-                ON p.FILING_ID = pay.FILING_ID
-                AND p.AMEND_ID = pay.AMEND_ID
-            WHERE p.RPT_DATE_DATE IS NOT NULL
-              AND EXTRACT(YEAR FROM p.RPT_DATE_DATE) = 2025
-              AND pay.PER_TOTAL IS NOT NULL
-              AND CAST(pay.PER_TOTAL AS FLOAT64) > 0
-              AND (
-                UPPER(pay.EMPLR_NAML) LIKE '%CITY OF%'
-                OR UPPER(pay.EMPLR_NAML) LIKE '%COUNTY%'
-                OR UPPER(pay.EMPLR_NAML) LIKE '%LEAGUE%CITIES%'
-                OR UPPER(pay.EMPLR_NAML) LIKE '%CSAC%'
-                OR UPPER(pay.EMPLR_NAML) LIKE '%ASSOCIATION OF COUNTIES%'
-              )
-        )
+        query = f"""
         SELECT
-            CASE
-                WHEN UPPER(employer_name) LIKE '%LEAGUE%CITIES%'
-                     OR UPPER(employer_name) LIKE '%CITY OF%'
-                THEN 'city'
-                WHEN UPPER(employer_name) LIKE '%COUNTY%'
-                     OR UPPER(employer_name) LIKE '%CSAC%'
-                     OR UPPER(employer_name) LIKE '%ASSOCIATION OF COUNTIES%'
-                THEN 'county'
-                ELSE 'other'
-            END as govt_type,
+            govt_type,
             'other_lobbying' as spending_category,
-            SUM(amount) as total_amount,
+            SUM(total_amount) as total_amount,
             COUNT(DISTINCT employer_name) as filer_count
-        FROM spending_data
+        FROM `{SPENDING_CUBE_TABLE}`
+        WHERE govt_type IN ('city', 'county')
+          AND year BETWEEN COALESCE(@from_year, @to_year, {LATEST_CUBE_YEAR})
+                       AND COALESCE(@to_year, {LATEST_CUBE_YEAR})
         GROUP BY govt_type
         HAVING total_amount > 0
         ORDER BY govt_type
         """
 
-        try:
-            client = BigQueryClient()
-            result = client.execute_query(query)
-
-            # Return empty array if no results
-            if not result:
-                return [
-                    {'govt_type': 'city', 'spending_category': 'membership', 'total_amount': 0, 'filer_count': 0},
-                    {'govt_type': 'city', 'spending_category': 'other_lobbying', 'total_amount': 0, 'filer_count': 0},
-                    {'govt_type': 'county', 'spending_category': 'membership', 'total_amount': 0, 'filer_count': 0},
-                    {'govt_type': 'county', 'spending_category': 'other_lobbying', 'total_amount': 0, 'filer_count': 0}
-                ]
-            return result
-        except Exception as e:
-            print(f"ERROR: _get_spending_breakdown failed: {e}")
-            # Return default structure on error
-            return [
-                {'govt_type': 'city', 'spending_category': 'membership', 'total_amount': 0, 'filer_count': 0},
-                {'govt_type': 'city', 'spending_category': 'other_lobbying', 'total_amount': 0, 'filer_count': 0},
-                {'govt_type': 'county', 'spending_category': 'membership', 'total_amount': 0, 'filer_count': 0},
-                {'govt_type': 'county', 'spending_category': 'other_lobbying', 'total_amount': 0, 'filer_count': 0}
-            ]
-
-    def _get_org_spending_by_govt(self):
+        client = get_query_backend()
+        result = client.execute_query(
+            query, self._cube_year_params(from_year, to_year), template='analytics.spending_breakdown'
+        )
+
+        # Return zero-filled structure if no results
+        return result if result else EMPTY_SPENDING_BREAKDOWN
+
+    def _get_org_spending_by_govt(self, from_year=None, to_year=None):
         """Get top 10 lobbying firms by payments from city vs county entities
 
-        FIXED: Now correctly shows lobbying firms (PAYEE_NAML) and classifies by
-        employer type (EMPLR_NAML). Filters to latest amendments only.
-        Uses JOIN instead of IN subquery for multi-column filtering.
+        Shows lobbying firms (payee) and classifies by employer type. Reads the
+        spending cube (latest amendments only); defaults to the most recent year.
 
         Returns lobbying firms that received payments from city or county entities,
         with separate amounts for city and county spending per firm.
         Used for stacked bar chart visualization.
         """
-        query = """
-        WITH latest_amendments AS (
-            SELECT FILING_ID, MAX(AMEND_ID) as max_amend_id
-            FROM `ca-lobby.ca_lobby.cvr_lobby_disclosure_cd`
-            GROUP BY FILING_ID
-        ),
-        org_spending AS (
-            SELECT
-                pay.PAYEE_NAML as organization_name,
-                CASE
-                    WHEN UPPER(pay.EMPLR_NAML) LIKE '%CITY OF%'
-                         OR UPPER(pay.EMPLR_NAML) LIKE '%LEAGUE%CITIES%'
-                    THEN 'city'
-                    WHEN UPPER(pay.EMPLR_NAML) LIKE '%COUNTY%'
-                         OR UPPER(pay.EMPLR_NAML) LIKE '%CSAC%'
-                         OR UPPER(pay.EMPLR_NAML) LIKE '%ASSOCIATION OF COUNTIES%'
-                    THEN 'county'
-                    ELSE 'other'
-                END as govt_type,
-                CAST(pay.PER_TOTAL AS FLOAT64) as amount
-            FROM `ca-lobby.ca_lobby.cvr_lobby_disclosure_cd` p
-            INNER JOIN latest_amendments la
-                ON p.FILING_ID = la.FILING_ID
-                AND p.AMEND_ID = la.max_amend_id
-            INNER JOIN `ca-lobby.ca_lobby.lpay_cd` pay
-                ON p.FILING_ID = pay.FILING_ID
-                AND p.AMEND_ID = pay.AMEND_ID
-            WHERE p.RPT_DATE_DATE IS NOT NULL
-              AND EXTRACT(YEAR FROM p.RPT_DATE_DATE) = 2025
-              AND pay.PER_TOTAL IS NOT NULL
-              AND CAST(pay.PER_TOTAL AS FLOAT64) > 0
-              AND (
-                UPPER(pay.EMPLR_NAML) LIKE '%CITY OF%'
-                OR UPPER(pay.EMPLR_NAML) LIKE '%COUNTY%'
-                OR UPPER(pay.EMPLR_NAML) LIKE '%LEAGUE%CITIES%'
-                OR UPPER(pay.EMPLR_NAML) LIKE '%CSAC%'
-                OR UPPER(pay.EMPLR_NAML) LIKE '%ASSOCIATION OF COUNTIES%'
-              )
-        ),
-        aggregated AS (
+        query = f"""
+        WITH aggregated AS (
             SELECT
-                organization_name,
-                SUM(CASE WHEN govt_type = 'city' THEN amount ELSE 0 END) as city_spending,
-                SUM(CASE WHEN govt_type = 'county' THEN amount ELSE 0 END) as county_spending,
-                SUM(amount) as total_spending
-            FROM org_spending
+                payee_name as organization_name,
+                SUM(CASE WHEN govt_type = 'city' THEN total_amount ELSE 0 END) as city_spending,
+                SUM(CASE WHEN govt_type = 'county' THEN total_amount ELSE 0 END) as county_spending,
+                SUM(total_amount) as total_spending
+            FROM `{SPENDING_CUBE_TABLE}`
             WHERE govt_type IN ('city', 'county')
+              AND year BETWEEN COALESCE(@from_year, @to_year, {LATEST_CUBE_YEAR})
+                           AND COALESCE(@to_year, {LATEST_CUBE_YEAR})
             GROUP BY organization_name
             HAVING total_spending > 0
         )
@@ -489,78 +458,52 @@ class handler(BaseHTTPRequestHandler):
         LIMIT 10
         """
 
-        try:
-            client = BigQueryClient()
-            result = client.execute_query(query)
-            return result if result else []
-        except Exception as e:
-            print(f"ERROR: _get_org_spending_by_govt failed: {e}")
-            return []
+        client = get_query_backend()
+        result = client.execute_query(
+            query, self._cube_year_params(from_year, to_year), template='analytics.org_spending_by_govt'
+        )
+        return result if result else []
 
-    def _get_top_city_recipients(self):
+    def _get_top_city_recipients(self, from_year=None, to_year=None):
         """Get top 10 cities by lobbying spending
 
         Shows which cities spend the most on lobbying activities.
-        Uses EMPLR_NAML which is the entity that PAID for lobbying.
+        Uses the employer (EMPLR_NAML), which is the entity that PAID for lobbying.
+        Reads the spending cube; defaults to all years.
         """
-        query = """
-        SELECT
-            EMPLR_NAML as recipient_name,
-            CAST(ROUND(SUM(CAST(PER_TOTAL AS FLOAT64))) AS INT64) as total_amount
-        FROM `ca-lobby.ca_lobby.lpay_cd`
-        WHERE EMPLR_NAML IS NOT NULL
-          AND EMPLR_NAML != ''
-          AND PER_TOTAL IS NOT NULL
-          AND CAST(PER_TOTAL AS FLOAT64) > 0
-          AND (
-            UPPER(EMPLR_NAML) LIKE '%CITY OF%'
-            OR UPPER(EMPLR_NAML) LIKE '%LEAGUE%CITIES%'
-          )
-        GROUP BY EMPLR_NAML
-        ORDER BY total_amount DESC
-        LIMIT 10
-        """
-
-        try:
-            client = BigQueryClient()
-            result = client.execute_query(query)
-            return result if result else []
-        except Exception as e:
-            print(f"ERROR: _get_top_city_recipients failed: {e}")
-            return []
+        return self._get_top_recipients('city', from_year, to_year)
 
-    def _get_top_county_recipients(self):
+    def _get_top_county_recipients(self, from_year=None, to_year=None):
         """Get top 10 counties by lobbying spending
 
         Shows which counties spend the most on lobbying activities.
-        Uses EMPLR_NAML which is the entity that PAID for lobbying.
+        Uses the employer (EMPLR_NAML), which is the entity that PAID for lobbying.
+        Reads the spending cube; defaults to all years.
         """
-        query = """
+        return self._get_top_recipients('county', from_year, to_year)
+
+    def _get_top_recipients(self, govt_type, from_year, to_year):
+        """Top 10 employers of one government type by total spending"""
+        query = f"""
         SELECT
-            EMPLR_NAML as recipient_name,
-            CAST(ROUND(SUM(CAST(PER_TOTAL AS FLOAT64))) AS INT64) as total_amount
-        FROM `ca-lobby.ca_lobby.lpay_cd`
-        WHERE EMPLR_NAML IS NOT NULL
-          AND EMPLR_NAML != ''
-          AND PER_TOTAL IS NOT NULL
-          AND CAST(PER_TOTAL AS FLOAT64) > 0
-          AND (
-            UPPER(EMPLR_NAML) LIKE '%COUNTY%'
-            OR UPPER(EMPLR_NAML) LIKE '%CSAC%'
-            OR UPPER(EMPLR_NAML) LIKE '%ASSOCIATION OF COUNTIES%'
-          )
-        GROUP BY EMPLR_NAML
+            employer_name as recipient_name,
+            CAST(ROUND(SUM(total_amount)) AS INT64) as total_amount
+        FROM `{SPENDING_CUBE_TABLE}`
+        WHERE govt_type = @govt_type
+          AND employer_name != ''
+          AND (@from_year IS NULL OR year >= @from_year)
+          AND (@to_year IS NULL OR year <= @to_year)
+        GROUP BY employer_name
         ORDER BY total_amount DESC
         LIMIT 10
         """
 
-        try:
-            client = BigQueryClient()
-            result = client.execute_query(query)
-            return result if result else []
-        except Exception as e:
-            print(f"ERROR: _get_top_county_recipients failed: {e}")
-            return []
+        params = self._cube_year_params(from_year, to_year) + [
+            scalar_param('govt_type', 'STRING', govt_type)
+        ]
+        client = get_query_backend()
+        result = client.execute_query(query, params, template=f'analytics.top_{govt_type}_recipients')
+        return result if result else []
 
     def do_OPTIONS(self):
         """Handle CORS preflight requests"""
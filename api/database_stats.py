@@ -1,133 +1,22 @@
 """
 Database Statistics Endpoint
 Provides comprehensive database statistics for admin dashboard
-Self-contained file for Vercel serverless deployment
+Vercel serverless function (shared BigQuery client in api/utils)
 """
 
 import os
-import json
+import sys
 from http.server import BaseHTTPRequestHandler
 from urllib.parse import parse_qs, urlparse
-from datetime import datetime
-from google.cloud import bigquery
-from google.oauth2 import service_account
 
+# Shared utilities live in api/utils
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-# ============================================================================
-# BIGQUERY CLIENT (inline utility)
-# ============================================================================
-
-class BigQueryClient:
-    """Singleton BigQuery client for serverless functions"""
-
-    _instance = None
-    _client = None
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(BigQueryClient, cls).__new__(cls)
-            cls._instance._initialize_client()
-        return cls._instance
-
-    def _initialize_client(self):
-        """Initialize BigQuery client with service account credentials"""
-        try:
-            # Get credentials from environment variable
-            credentials_json = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS_JSON')
-
-            if not credentials_json:
-                # Try file-based credentials for local development
-                credentials_file = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS')
-                if credentials_file:
-                    credentials = service_account.Credentials.from_service_account_file(credentials_file)
-                    project_id = os.environ.get('BIGQUERY_PROJECT_ID')
-                else:
-                    raise ValueError("No credentials found")
-            else:
-                # Parse JSON credentials for Vercel deployment
-                credentials_info = json.loads(credentials_json)
-                credentials = service_account.Credentials.from_service_account_info(credentials_info)
-                project_id = os.environ.get('BIGQUERY_PROJECT_ID') or credentials_info['project_id']
-
-            # Initialize BigQuery client
-            self._client = bigquery.Client(
-                credentials=credentials,
-                project=project_id
-            )
-
-            print(f"✅ BigQuery client initialized for project: {project_id}")
-
-        except Exception as e:
-            print(f"❌ Failed to initialize BigQuery client: {e}")
-            raise
-
-    def execute_query(self, query, params=None):
-        """Execute a BigQuery query and return results"""
-        try:
-            job_config = bigquery.QueryJobConfig()
-            if params:
-                job_config.query_parameters = params
-
-            query_job = self._client.query(query, job_config=job_config)
-            results = query_job.result()
-
-            # Convert to list of dicts
-            return [dict(row) for row in results]
-
-        except Exception as e:
-            print(f"Query execution failed: {e}")
-            raise
-
-
-# ============================================================================
-# RESPONSE UTILITIES (inline utility)
-# ============================================================================
-
-def success_response(data, status_code=200):
-    """Create a successful JSON response"""
-    response = {
-        "success": True,
-        "data": data,
-        "timestamp": datetime.utcnow().isoformat() + "Z"
-    }
-
-    headers = {
-        "Content-Type": "application/json",
-        "Access-Control-Allow-Origin": "https://ca-lobbymono.vercel.app",
-        "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
-        "Access-Control-Allow-Headers": "Content-Type"
-    }
-
-    return (
-        json.dumps(response, default=str),
-        status_code,
-        headers
-    )
-
-
-def error_response(message, status_code=500, error_type="ServerError"):
-    """Create an error JSON response"""
-    response = {
-        "success": False,
-        "error": {
-            "type": error_type,
-            "message": message
-        },
-        "timestamp": datetime.utcnow().isoformat() + "Z"
-    }
-
-    headers = {
-        "Content-Type": "application/json",
-        "Access-Control-Allow-Origin": "https://ca-lobbymono.vercel.app",
-        "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
-        "Access-Control-Allow-Headers": "Content-Type"
-    }
-
-    return (
-        json.dumps(response),
-        status_code,
-        headers
-    )
+from utils.query_backend import get_query_backend
+from utils.cache import cached_response, response_etag
+from utils.response import send_success, error_response, etag_matches, not_modified_response
+from utils.rate_limit import enforce_rate_limit, request_cost
+from utils.timing import begin_request
 
 
 # ============================================================================
@@ -139,18 +28,23 @@ class handler(BaseHTTPRequestHandler):
 
     def do_GET(self):
         """Handle GET request for database statistics"""
+        begin_request(self)
+
         try:
+            # Revalidation: skip every query if the client's copy is current
+            etag = response_etag('database_stats', {})
+            if self._send_if_not_modified(etag):
+                return
+
+            # Six full-table aggregates: the most expensive request we serve
+            if not enforce_rate_limit(self, request_cost('database_stats')):
+                return
+
             # Get comprehensive database statistics
-            stats = self._get_database_statistics()
+            stats, cache_hit = cached_response('database_stats', {}, self._get_database_statistics)
 
             # Return success response
-            body, status, headers = success_response(stats)
-
-            self.send_response(status)
-            for key, value in headers.items():
-                self.send_header(key, value)
-            self.end_headers()
-            self.wfile.write(body.encode())
+            send_success(self, stats, etag=etag, headers={'X-Cache': 'HIT' if cache_hit else 'MISS'})
 
         except Exception as e:
             # Return error response
@@ -167,9 +61,25 @@ class handler(BaseHTTPRequestHandler):
             self.end_headers()
             self.wfile.write(body.encode())
 
+    def _send_if_not_modified(self, etag):
+        """Answer with 304 Not Modified if the client's cached copy is current
+
+        Returns:
+            bool: True if a 304 was sent
+        """
+        if not etag_matches(self.headers.get('If-None-Match'), etag):
+            return False
+
+        body, status, headers = not_modified_response(etag)
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        return True
+
     def _get_database_statistics(self):
         """Get comprehensive database statistics"""
-        client = BigQueryClient()
+        client = get_query_backend()
 
         # Get overall summary
         summary_query = """
@@ -186,25 +96,15 @@ class handler(BaseHTTPRequestHandler):
         """
 
         # Get payment statistics
-        # FIXED: Now filters to latest amendments only to avoid counting duplicate payments
+        # lpay_latest holds only payments from each filing's latest amendment
         payment_query = """
-        WITH latest_payments AS (
-            SELECT
-                FILING_ID,
-                AMEND_ID,
-                PER_TOTAL,
-                LINE_ITEM,
-                ROW_NUMBER() OVER (PARTITION BY FILING_ID, LINE_ITEM ORDER BY AMEND_ID DESC) as rn
-            FROM `ca-lobby.ca_lobby.lpay_cd`
-            WHERE PER_TOTAL IS NOT NULL
-              AND CAST(PER_TOTAL AS FLOAT64) > 0
-        )
         SELECT
             COUNT(*) as total_payments,
             SUM(CAST(PER_TOTAL AS FLOAT64)) as total_amount,
             AVG(CAST(PER_TOTAL AS FLOAT64)) as avg_payment
-        FROM latest_payments
-        WHERE rn = 1
+        FROM `ca-lobby.ca_lobby.lpay_latest`
+        WHERE PER_TOTAL IS NOT NULL
+          AND CAST(PER_TOTAL AS FLOAT64) > 0
         """
 
         # Get organization view statistics
@@ -221,46 +121,33 @@ class handler(BaseHTTPRequestHandler):
         """
 
         # Get yearly breakdown
-        # FIXED: Now filters to latest amendments only to avoid counting amendments as separate filings
+        # cvr_lobby_disclosure_latest holds one row per filing (latest amendment)
         yearly_query = """
-        WITH latest_filings AS (
-            SELECT
-                RPT_DATE_DATE,
-                FILER_ID,
-                ROW_NUMBER() OVER (PARTITION BY FILING_ID ORDER BY AMEND_ID DESC) as rn
-            FROM `ca-lobby.ca_lobby.cvr_lobby_disclosure_cd`
-            WHERE RPT_DATE_DATE IS NOT NULL
-              AND EXTRACT(YEAR FROM RPT_DATE_DATE) >= 2015
-              AND EXTRACT(YEAR FROM RPT_DATE_DATE) <= EXTRACT(YEAR FROM CURRENT_DATE())
-        )
         SELECT
             EXTRACT(YEAR FROM RPT_DATE_DATE) as year,
             COUNT(DISTINCT FILER_ID) as orgs_count,
             COUNT(*) as filings_count
-        FROM latest_filings
-        WHERE rn = 1
+        FROM `ca-lobby.ca_lobby.cvr_lobby_disclosure_latest`
+        WHERE RPT_DATE_DATE IS NOT NULL
+          AND RPT_DATE_DATE >= '2015-01-01'
+          AND EXTRACT(YEAR FROM RPT_DATE_DATE) <= EXTRACT(YEAR FROM CURRENT_DATE())
         GROUP BY year
         ORDER BY year DESC
         LIMIT 10
         """
 
-        # Get government type breakdown
+        # Get government type breakdown (organization names are classified by
+        # the pipeline with the same rules as payment employers)
         govt_type_query = """
         SELECT
-            CASE
-                WHEN UPPER(organization_name) LIKE '%CITY%'
-                     OR UPPER(organization_name) LIKE '%LEAGUE%CITIES%'
-                THEN 'city'
-                WHEN UPPER(organization_name) LIKE '%COUNTY%'
-                     OR UPPER(organization_name) LIKE '%CSAC%'
-                THEN 'county'
-                ELSE 'other'
-            END as govt_type,
+            COALESCE(g.govt_type, 'other') as govt_type,
             COUNT(*) as org_count,
-            SUM(total_spending) as total_spending
-        FROM `ca-lobby.ca_lobby.v_organization_summary`
-        WHERE organization_name IS NOT NULL
-          AND total_spending > 0
+            SUM(o.total_spending) as total_spending
+        FROM `ca-lobby.ca_lobby.v_organization_summary` o
+        LEFT JOIN `ca-lobby.ca_lobby.org_govt_type` g
+            ON g.organization_name = o.organization_name
+        WHERE o.organization_name IS NOT NULL
+          AND o.total_spending > 0
         GROUP BY govt_type
         """
 
@@ -279,13 +166,22 @@ class handler(BaseHTTPRequestHandler):
         LIMIT 10
         """
 
-        # Execute all queries
-        summary = client.execute_query(summary_query)[0] if client.execute_query(summary_query) else {}
-        payments = client.execute_query(payment_query)[0] if client.execute_query(payment_query) else {}
-        org_view = client.execute_query(org_view_query)[0] if client.execute_query(org_view_query) else {}
-        yearly = client.execute_query(yearly_query)
-        govt_types = client.execute_query(govt_type_query)
-        top_orgs = client.execute_query(top_orgs_query)
+        # Execute all queries concurrently (each one exactly once)
+        results = client.execute_queries({
+            'summary': summary_query,
+            'payments': payment_query,
+            'org_view': org_view_query,
+            'yearly': yearly_query,
+            'govt_types': govt_type_query,
+            'top_orgs': top_orgs_query
+        }, template='database_stats')
+
+        summary = results['summary'][0] if results['summary'] else {}
+        payments = results['payments'][0] if results['payments'] else {}
+        org_view = results['org_view'][0] if results['org_view'] else {}
+        yearly = results['yearly']
+        govt_types = results['govt_types']
+        top_orgs = results['top_orgs']
 
         # Compile comprehensive statistics
         return {
@@ -1,128 +1,23 @@
 """
 Health Check Endpoint
 Verifies API is running and BigQuery connection is working
-Self-contained file for Vercel serverless deployment
+(cached probe; '?deep=1' forces a live check)
+Vercel serverless function (shared BigQuery client in api/utils)
 """
 
 import os
-import json
+import sys
 from http.server import BaseHTTPRequestHandler
-from datetime import datetime
-from google.cloud import bigquery
-from google.oauth2 import service_account
+from urllib.parse import parse_qs, urlparse
 
+# Shared utilities live in api/utils
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-# ============================================================================
-# BIGQUERY CLIENT (inline utility)
-# ============================================================================
-
-class BigQueryClient:
-    """Singleton BigQuery client for serverless functions"""
-
-    _instance = None
-    _client = None
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(BigQueryClient, cls).__new__(cls)
-            cls._instance._initialize_client()
-        return cls._instance
-
-    def _initialize_client(self):
-        """Initialize BigQuery client with service account credentials"""
-        try:
-            # Get credentials from environment variable
-            credentials_json = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS_JSON')
-
-            if not credentials_json:
-                # Try file-based credentials for local development
-                credentials_file = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS')
-                if credentials_file:
-                    credentials = service_account.Credentials.from_service_account_file(credentials_file)
-                    project_id = os.environ.get('BIGQUERY_PROJECT_ID')
-                else:
-                    raise ValueError("No credentials found")
-            else:
-                # Parse JSON credentials for Vercel deployment
-                credentials_info = json.loads(credentials_json)
-                credentials = service_account.Credentials.from_service_account_info(credentials_info)
-                project_id = os.environ.get('BIGQUERY_PROJECT_ID') or credentials_info['project_id']
-
-            # Initialize BigQuery client
-            self._client = bigquery.Client(
-                credentials=credentials,
-                project=project_id
-            )
-
-            print(f"✅ BigQuery client initialized for project: {project_id}")
-
-        except Exception as e:
-            print(f"❌ Failed to initialize BigQuery client: {e}")
-            raise
-
-    def test_connection(self):
-        """Test BigQuery connection"""
-        try:
-            query = "SELECT 1 as test"
-            query_job = self._client.query(query)
-            results = query_job.result()
-            for row in results:
-                return row['test'] == 1
-            return False
-        except Exception as e:
-            print(f"Connection test failed: {e}")
-            return False
-
-
-# ============================================================================
-# RESPONSE UTILITIES (inline utility)
-# ============================================================================
-
-def success_response(data, status_code=200):
-    """Create a successful JSON response"""
-    response = {
-        "success": True,
-        "data": data,
-        "timestamp": datetime.utcnow().isoformat() + "Z"
-    }
-
-    headers = {
-        "Content-Type": "application/json",
-        "Access-Control-Allow-Origin": "https://ca-lobbymono.vercel.app",
-        "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
-        "Access-Control-Allow-Headers": "Content-Type"
-    }
-
-    return (
-        json.dumps(response, default=str),
-        status_code,
-        headers
-    )
-
-
-def error_response(message, status_code=500):
-    """Create an error JSON response"""
-    response = {
-        "success": False,
-        "error": {
-            "type": "ServerError",
-            "message": message
-        },
-        "timestamp": datetime.utcnow().isoformat() + "Z"
-    }
-
-    headers = {
-        "Content-Type": "application/json",
-        "Access-Control-Allow-Origin": "https://ca-lobbymono.vercel.app",
-        "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
-        "Access-Control-Allow-Headers": "Content-Type"
-    }
-
-    return (
-        json.dumps(response),
-        status_code,
-        headers
-    )
+from utils.health_probe import get_health_probe
+from utils.query_backend import QUERY_BACKEND
+from utils.response import success_response, error_response
+from utils.rate_limit import enforce_rate_limit, request_cost
+from utils.timing import begin_request
 
 
 # ============================================================================
@@ -134,16 +29,31 @@ class handler(BaseHTTPRequestHandler):
 
     def do_GET(self):
         """Handle GET request for health check"""
+        begin_request(self)
+
         try:
-            # Test BigQuery connection
-            client = BigQueryClient()
-            db_connected = client.test_connection()
+            params = parse_qs(urlparse(self.path).query)
+            deep = params.get('deep', [''])[0].lower() in ('1', 'true', 'yes')
+
+            if not enforce_rate_limit(self, request_cost('health', 'deep' if deep else None)):
+                return
+
+            # Cached backend connectivity (live probe when stale or on '?deep=1')
+            probe = get_health_probe().status(deep=deep)
+            db_connected = probe['connected']
 
             # Prepare response data
             health_data = {
                 "status": "healthy" if db_connected else "degraded",
                 "api": "online",
                 "database": "connected" if db_connected else "disconnected",
+                "database_probe": {
+                    "backend": QUERY_BACKEND,
+                    "mode": probe['probe'],
+                    "age_seconds": probe['probe_age_seconds'],
+                    "latency_ms": probe['probe_latency_ms'],
+                    "checked_at": probe['checked_at']
+                },
                 "service": "ca-lobby-api",
                 "version": "1.0.0"
             }
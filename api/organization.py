@@ -0,0 +1,244 @@
+"""
+Organization Profile Endpoint
+One payload for an organization's profile page: filings, payment totals by
+year, top lobbying firms and related organizations, keyed by filer ID
+Vercel serverless function (shared BigQuery client in api/utils)
+"""
+
+import os
+import re
+import sys
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, unquote, urlparse
+
+# Shared utilities live in api/utils
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.query_backend import get_query_backend, scalar_param
+from utils.cache import cached_response, response_etag
+from utils.response import send_success, error_response, etag_matches, not_modified_response
+from utils.rate_limit import enforce_rate_limit, request_cost
+from utils.timing import begin_request
+
+# CAL-ACCESS filer IDs are short alphanumeric codes (e.g. '1234567', 'C00123')
+FILER_ID_PATTERN = re.compile(r'^[A-Za-z0-9-]{1,20}$')
+
+# Rows returned for the ranked sections
+TOP_FIRMS_LIMIT = 10
+RELATED_ORGS_LIMIT = 10
+
+
+# ============================================================================
+# VERCEL SERVERLESS FUNCTION HANDLER
+# ============================================================================
+
+class handler(BaseHTTPRequestHandler):
+    """Vercel serverless function handler for organization profiles"""
+
+    def do_GET(self):
+        """Handle GET /api/organization/{filer_id} (or ?filer_id=)"""
+        begin_request(self)
+
+        try:
+            filer_id = self._parse_filer_id()
+            if not FILER_ID_PATTERN.match(filer_id):
+                self._send_error("Invalid or missing filer ID", 400, "ValidationError")
+                return
+
+            cache_params = {'filer_id': [filer_id]}
+
+            # Revalidation: skip every query if the client's copy is current
+            etag = response_etag('organization', cache_params)
+            if self._send_if_not_modified(etag):
+                return
+
+            if not enforce_rate_limit(self, request_cost('organization')):
+                return
+
+            profile, cache_hit = cached_response(
+                'organization',
+                cache_params,
+                lambda: self._get_organization_profile(filer_id)
+            )
+
+            # Unknown filer IDs are cached too, so repeated misses stay cheap
+            if not profile['filings'] and not profile['payments_by_year']:
+                self._send_error(f"No organization found for filer ID {filer_id}", 404, "NotFoundError")
+                return
+
+            send_success(self, profile, etag=etag, headers={'X-Cache': 'HIT' if cache_hit else 'MISS'})
+
+        except Exception as e:
+            # Return error response
+            print(f"ERROR: Organization profile request failed: {str(e)}")
+            self._send_error("Organization profile request failed. Please try again.", 500, "OrganizationError")
+
+    def _parse_filer_id(self):
+        """Filer ID from '?filer_id=' (the vercel.json rewrite) or the last path segment"""
+        parsed_url = urlparse(self.path)
+        filer_id = parse_qs(parsed_url.query).get('filer_id', [''])[0]
+        if not filer_id:
+            segment = unquote(parsed_url.path.rstrip('/').rpartition('/')[2])
+            filer_id = '' if segment == 'organization' else segment
+        return filer_id.strip()
+
+    def _send_if_not_modified(self, etag):
+        """Answer with 304 Not Modified if the client's cached copy is current
+
+        Returns:
+            bool: True if a 304 was sent
+        """
+        if not etag_matches(self.headers.get('If-None-Match'), etag):
+            return False
+
+        body, status, headers = not_modified_response(etag)
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        return True
+
+    def _send_error(self, message, status_code, error_type):
+        """Send an error response"""
+        body, status, headers = error_response(
+            message=message,
+            status_code=status_code,
+            error_type=error_type
+        )
+
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def _get_organization_profile(self, filer_id):
+        """Get an organization's profile
+
+        Reads the tables the pipeline rebuilds after each load, so amendments
+        are never double counted: cvr_lobby_disclosure_latest (clustered by
+        FILER_ID), lpay_latest (clustered by FILER_ID) and
+        firm_clients (one row per firm and paying filer, clustered by
+        PAYEE_NAML). The four queries run concurrently: latency is that of the
+        slowest one.
+        """
+        params = [scalar_param('filer_id', 'STRING', filer_id)]
+
+        # Every filing, newest first
+        filings_query = """
+        SELECT
+            FILING_ID as filing_id,
+            FILER_NAML as organization_name,
+            FORMAT_DATE('%Y-%m-%d', RPT_DATE_DATE) as filing_date,
+            FORMAT_DATE('%Y-%m-%d', FROM_DATE_DATE) as period_start,
+            FORMAT_DATE('%Y-%m-%d', THRU_DATE_DATE) as period_end,
+            EXTRACT(YEAR FROM RPT_DATE_DATE) as year,
+            CONCAT(
+                'Q',
+                CAST(EXTRACT(QUARTER FROM RPT_DATE_DATE) AS STRING),
+                ' ',
+                CAST(EXTRACT(YEAR FROM RPT_DATE_DATE) AS STRING)
+            ) as period
+        FROM `ca-lobby.ca_lobby.cvr_lobby_disclosure_latest`
+        WHERE FILER_ID = @filer_id
+          AND RPT_DATE_DATE IS NOT NULL
+        ORDER BY RPT_DATE_DATE DESC, FILING_ID DESC
+        """
+
+        # Payment totals by year
+        yearly_query = """
+        SELECT
+            EXTRACT(YEAR FROM RPT_DATE_DATE) as year,
+            ROUND(SUM(CAST(PER_TOTAL AS FLOAT64)), 2) as total_amount,
+            COUNT(*) as payment_count
+        FROM `ca-lobby.ca_lobby.lpay_latest`
+        WHERE FILER_ID = @filer_id
+          AND RPT_DATE_DATE IS NOT NULL
+          AND PER_TOTAL IS NOT NULL
+          AND CAST(PER_TOTAL AS FLOAT64) > 0
+        GROUP BY year
+        ORDER BY year ASC
+        """
+
+        # Lobbying firms paid the most
+        top_firms_query = f"""
+        SELECT
+            PAYEE_NAML as firm_name,
+            ROUND(SUM(CAST(PER_TOTAL AS FLOAT64)), 2) as total_amount,
+            COUNT(*) as payment_count,
+            EXTRACT(YEAR FROM MIN(RPT_DATE_DATE)) as first_year,
+            EXTRACT(YEAR FROM MAX(RPT_DATE_DATE)) as latest_year
+        FROM `ca-lobby.ca_lobby.lpay_latest`
+        WHERE FILER_ID = @filer_id
+          AND PAYEE_NAML IS NOT NULL
+          AND TRIM(PAYEE_NAML) != ''
+          AND PER_TOTAL IS NOT NULL
+          AND CAST(PER_TOTAL AS FLOAT64) > 0
+        GROUP BY firm_name
+        ORDER BY total_amount DESC
+        LIMIT {TOP_FIRMS_LIMIT}
+        """
+
+        # Other organizations that paid the same lobbying firms; firm_clients
+        # already holds one row per (firm, filer) pair and each filer's name
+        related_query = f"""
+        SELECT
+            c.FILER_ID as filer_id,
+            ANY_VALUE(c.FILER_NAML) as organization_name,
+            COUNT(DISTINCT c.PAYEE_NAML) as shared_firms,
+            ROUND(SUM(c.total_amount), 2) as shared_firm_spending
+        FROM `ca-lobby.ca_lobby.firm_clients` c
+        WHERE c.PAYEE_NAML IN (
+            SELECT PAYEE_NAML
+            FROM `ca-lobby.ca_lobby.firm_clients`
+            WHERE FILER_ID = @filer_id
+        )
+          AND c.FILER_ID != @filer_id
+        GROUP BY c.FILER_ID
+        ORDER BY shared_firms DESC, shared_firm_spending DESC
+        LIMIT {RELATED_ORGS_LIMIT}
+        """
+
+        client = get_query_backend()
+        results = client.execute_queries({
+            'filings': (filings_query, params),
+            'payments_by_year': (yearly_query, params),
+            'top_firms': (top_firms_query, params),
+            'related': (related_query, params)
+        }, template='organization')
+
+        return self._build_profile(filer_id, results)
+
+    def _build_profile(self, filer_id, results):
+        """Assemble the profile payload from the sub-query results"""
+        filings = results['filings']
+        payments_by_year = results['payments_by_year']
+
+        # Filings are newest first
+        latest = filings[0] if filings else {}
+        earliest = filings[-1] if filings else {}
+
+        return {
+            "filer_id": filer_id,
+            "organization_name": latest.get('organization_name'),
+            "summary": {
+                "filing_count": len(filings),
+                "first_filing_date": earliest.get('filing_date'),
+                "latest_filing_date": latest.get('filing_date'),
+                "total_payments": sum(row['payment_count'] for row in payments_by_year),
+                "total_amount": round(sum(row['total_amount'] or 0 for row in payments_by_year), 2),
+                "active_years": len({row['year'] for row in filings} | {row['year'] for row in payments_by_year})
+            },
+            "filings": filings,
+            "payments_by_year": payments_by_year,
+            "top_firms": results['top_firms'],
+            "related_organizations": results['related']
+        }
+
+    def do_OPTIONS(self):
+        """Handle CORS preflight requests"""
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', 'https://ca-lobbymono.vercel.app')
+        self.send_header('Access-Control-Allow-Methods', 'GET, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
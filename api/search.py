@@ -1,176 +1,68 @@
 """
 Search Endpoint
 Searches California lobbying data with filters
-Self-contained file for Vercel serverless deployment
+Vercel serverless function (shared BigQuery client in api/utils)
 """
 
 import os
-import json
+import sys
 from http.server import BaseHTTPRequestHandler
 from urllib.parse import parse_qs, urlparse
-from datetime import datetime
-from google.cloud import bigquery
-from google.oauth2 import service_account
 
+# Shared utilities live in api/utils
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-# ============================================================================
-# BIGQUERY CLIENT (inline utility)
-# ============================================================================
-
-class BigQueryClient:
-    """Singleton BigQuery client for serverless functions"""
-
-    _instance = None
-    _client = None
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(BigQueryClient, cls).__new__(cls)
-            cls._instance._initialize_client()
-        return cls._instance
-
-    def _initialize_client(self):
-        """Initialize BigQuery client with service account credentials"""
-        try:
-            # Get credentials from environment variable
-            credentials_json = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS_JSON')
-
-            if not credentials_json:
-                # Try file-based credentials for local development
-                credentials_file = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS')
-                if credentials_file:
-                    credentials = service_account.Credentials.from_service_account_file(credentials_file)
-                    project_id = os.environ.get('BIGQUERY_PROJECT_ID')
-                else:
-                    raise ValueError("No credentials found")
-            else:
-                # Parse JSON credentials for Vercel deployment
-                credentials_info = json.loads(credentials_json)
-                credentials = service_account.Credentials.from_service_account_info(credentials_info)
-                project_id = os.environ.get('BIGQUERY_PROJECT_ID') or credentials_info['project_id']
-
-            # Initialize BigQuery client
-            self._client = bigquery.Client(
-                credentials=credentials,
-                project=project_id
-            )
-
-            print(f"✅ BigQuery client initialized for project: {project_id}")
-
-        except Exception as e:
-            print(f"❌ Failed to initialize BigQuery client: {e}")
-            raise
-
-    def execute_query(self, query, params=None):
-        """Execute a BigQuery query and return results"""
-        try:
-            job_config = bigquery.QueryJobConfig()
-            if params:
-                job_config.query_parameters = params
-
-            query_job = self._client.query(query, job_config=job_config)
-            results = query_job.result()
-
-            # Convert to list of dicts
-            return [dict(row) for row in results]
-
-        except Exception as e:
-            print(f"Query execution failed: {e}")
-            raise
+from utils.query_backend import get_query_backend, scalar_param, array_param
+from utils.cache import cached_response, response_etag
+from utils.response import (
+    send_success, send_paginated, error_response, etag_matches, not_modified_response
+)
+from utils.name_index import get_name_index
+from utils.cursor import encode_cursor, decode_cursor
+from utils.rate_limit import enforce_rate_limit, request_cost
+from utils.query_budget import QueryBudgetExceeded
+from utils.timing import begin_request
 
 
 # ============================================================================
-# RESPONSE UTILITIES (inline utility)
+# VERCEL SERVERLESS FUNCTION HANDLER
 # ============================================================================
 
-def success_response(data, status_code=200):
-    """Create a successful JSON response"""
-    response = {
-        "success": True,
-        "data": data,
-        "timestamp": datetime.utcnow().isoformat() + "Z"
-    }
-
-    headers = {
-        "Content-Type": "application/json",
-        "Access-Control-Allow-Origin": "https://ca-lobbymono.vercel.app",
-        "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
-        "Access-Control-Allow-Headers": "Content-Type"
-    }
-
-    return (
-        json.dumps(response, default=str),
-        status_code,
-        headers
-    )
-
-
-def error_response(message, status_code=500, error_type="ServerError"):
-    """Create an error JSON response"""
-    response = {
-        "success": False,
-        "error": {
-            "type": error_type,
-            "message": message
-        },
-        "timestamp": datetime.utcnow().isoformat() + "Z"
-    }
-
-    headers = {
-        "Content-Type": "application/json",
-        "Access-Control-Allow-Origin": "https://ca-lobbymono.vercel.app",
-        "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
-        "Access-Control-Allow-Headers": "Content-Type"
-    }
+class handler(BaseHTTPRequestHandler):
+    """Vercel serverless function handler for search"""
 
-    return (
-        json.dumps(response),
-        status_code,
-        headers
-    )
-
-
-def paginated_response(data, page, limit, total_count):
-    """Create a paginated JSON response"""
-    total_pages = (total_count + limit - 1) // limit  # Ceiling division
-
-    response = {
-        "success": True,
-        "data": data,
-        "pagination": {
-            "page": page,
-            "limit": limit,
-            "total_count": total_count,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_previous": page > 1
-        },
-        "timestamp": datetime.utcnow().isoformat() + "Z"
+    # Organization-name predicates: full LIKE scan (fallback)...
+    LIKE_FILTERS = {
+        'view': "(@search_term IS NULL OR UPPER(v.organization_name) LIKE UPPER(@search_term))",
+        'raw': "(@search_term IS NULL OR UPPER(FILER_NAML) LIKE UPPER(@search_term))"
     }
 
-    headers = {
-        "Content-Type": "application/json",
-        "Access-Control-Allow-Origin": "https://ca-lobbymono.vercel.app",
-        "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
-        "Access-Control-Allow-Headers": "Content-Type"
+    # ...or exact candidates resolved locally by the in-memory name index
+    INDEX_FILTERS = {
+        'view': "v.organization_name IN UNNEST(@candidate_names)",
+        'raw': "FILER_ID IN UNNEST(@candidate_filer_ids) AND FILER_NAML IN UNNEST(@candidate_names)"
     }
 
-    return (
-        json.dumps(response, default=str),
-        200,
-        headers
-    )
-
+    # Keyset seek past the last row of the previous page, matching the ORDER BY
+    # (latest_filing_date DESC, filer_id DESC, organization_name DESC)
+    SEEK_FILTER = """(
+            COALESCE(latest_filing_date, '') < @cursor_date
+            OR (COALESCE(latest_filing_date, '') = @cursor_date AND filer_id < @cursor_filer_id)
+            OR (COALESCE(latest_filing_date, '') = @cursor_date AND filer_id = @cursor_filer_id
+                AND COALESCE(organization_name, '') < @cursor_name)
+        )"""
 
-# ============================================================================
-# VERCEL SERVERLESS FUNCTION HANDLER
-# ============================================================================
+    # Types of the cursor's values: the sort key, bound as the STRING @cursor_*
+    # parameters, then the total count carried forward from the first page
+    CURSOR_TYPES = (str, str, str, int)
 
-class handler(BaseHTTPRequestHandler):
-    """Vercel serverless function handler for search"""
+    # Above this many candidates the array parameters outweigh the LIKE scan
+    MAX_INDEX_CANDIDATES = 5000
 
     def do_GET(self):
         """Handle GET request for search"""
+        begin_request(self)
+
         try:
             # Parse query parameters
             parsed_url = urlparse(self.path)
@@ -198,45 +90,60 @@ class handler(BaseHTTPRequestHandler):
             except (ValueError, TypeError):
                 limit = 25
 
-            # Build SQL query
-            sql_query = self._build_search_query()
+            # Cursor mode: '?cursor=<token>', or '?pagination=cursor' for the first page
+            cursor_token = params.get('cursor', [''])[0]
+            cursor_mode = bool(cursor_token) or params.get('pagination', [''])[0] == 'cursor'
+            try:
+                cursor = decode_cursor(cursor_token, self.CURSOR_TYPES) if cursor_token else None
+            except ValueError:
+                self._send_validation_error("Invalid cursor")
+                return
 
-            # Build query parameters (prevents SQL injection)
-            query_params = []
+            # '?count=approx' estimates the total from the name index (broad terms)
+            approximate = params.get('count', [''])[0] == 'approx'
 
-            # Add search term parameter
-            if query_text:
-                query_params.append(
-                    bigquery.ScalarQueryParameter('search_term', 'STRING', f'%{query_text}%')
-                )
+            cache_params = {
+                'q': [query_text], 'page': [str(page)], 'limit': [str(limit)],
+                'cursor': [cursor_token], 'mode': ['cursor' if cursor_mode else 'offset'],
+                'count': ['approx' if approximate else 'exact']
+            }
 
-            # Add pagination parameters
-            offset = (page - 1) * limit
-            query_params.append(bigquery.ScalarQueryParameter('limit', 'INT64', limit))
-            query_params.append(bigquery.ScalarQueryParameter('offset', 'INT64', offset))
+            # Revalidation: skip the query entirely if the client's copy is current
+            etag = response_etag('search', cache_params)
+            if self._send_if_not_modified(etag):
+                return
 
-            # Execute query
-            client = BigQueryClient()
-            results = client.execute_query(sql_query, query_params)
+            # Charge the client's rate limit budget by the search's historical cost
+            if not enforce_rate_limit(self, request_cost('search', 'results')):
+                return
 
-            # Get total count (for pagination)
-            count_query = self._build_count_query()
-            count_result = client.execute_query(count_query, query_params[:1])  # Only search param
-            total_count = count_result[0]['total'] if count_result else 0
+            # Serve from the response cache while the data version is unchanged
+            search_results, cache_hit = cached_response(
+                'search',
+                cache_params,
+                lambda: self._run_search(query_text, page, limit, cursor_mode, cursor, approximate)
+            )
+            results = search_results['results']
+            total_count = search_results['total_count']
 
-            # Return paginated response
-            body, status, headers = paginated_response(
+            # Stream the paginated response
+            send_paginated(
+                self,
                 data=results,
                 page=page,
                 limit=limit,
-                total_count=total_count
+                total_count=total_count,
+                next_cursor=search_results.get('next_cursor'),
+                cursor_mode=cursor_mode,
+                approximate=search_results.get('total_count_approximate', False),
+                etag=etag,
+                headers={'X-Cache': 'HIT' if cache_hit else 'MISS'}
             )
 
-            self.send_response(status)
-            for key, value in headers.items():
-                self.send_header(key, value)
-            self.end_headers()
-            self.wfile.write(body.encode())
+        except QueryBudgetExceeded as e:
+            # Broad terms that fall back to a full LIKE scan can exceed the budget
+            print(f"WARNING: Search rejected by byte budget: {str(e)}")
+            self._send_validation_error("Search term is too broad. Please use a more specific term.")
 
         except Exception as e:
             # Return error response
@@ -253,30 +160,154 @@ class handler(BaseHTTPRequestHandler):
             self.end_headers()
             self.wfile.write(body.encode())
 
+    def _run_search(self, query_text, page, limit, cursor_mode=False, cursor=None, approximate=False):
+        """Execute the search for one page of results and its total count
+
+        The total comes from a window count in the same job as the page. With
+        approximate=True it is estimated from the name index instead, which drops
+        the window for very broad terms.
+
+        In cursor mode the page starts after the decoded cursor (or at the top when
+        cursor is None) and 'next_cursor' encodes the last row returned. Only the
+        first cursor page counts the result set; the cursor carries that total to
+        later pages, so they never recount the whole union.
+        """
+        # Build query parameters (prevents SQL injection)
+        query_params = []
+        name_filters = self.LIKE_FILTERS
+        estimated_total = None
+
+        # Resolve candidates locally when the name index is available
+        index = get_name_index() if (query_text or approximate) else None
+
+        if query_text:
+            names, filer_ids = index.lookup(query_text) if index is not None else (None, None)
+
+            if names is not None and not names:
+                # No organization contains the term: skip BigQuery entirely
+                return {'results': [], 'total_count': 0, 'total_count_approximate': False, 'next_cursor': None}
+
+            if names is not None and len(names) <= self.MAX_INDEX_CANDIDATES:
+                name_filters = self.INDEX_FILTERS
+                query_params.append(array_param('candidate_names', 'STRING', names))
+                query_params.append(array_param('candidate_filer_ids', 'STRING', filer_ids))
+            else:
+                # Add search term parameter
+                query_params.append(
+                    scalar_param('search_term', 'STRING', f'%{query_text}%')
+                )
+
+            if approximate and names is not None:
+                estimated_total = len(names)
+        else:
+            # No term: a NULL search term makes the LIKE predicates match every name
+            query_params.append(scalar_param('search_term', 'STRING', None))
+            if approximate and index is not None:
+                estimated_total = len(index)
+
+        # Build SQL query
+        sql_query = self._build_search_query(
+            name_filters,
+            seek=cursor is not None,
+            use_offset=not cursor_mode,
+            with_total=estimated_total is None and cursor is None
+        )
+        filter_params = list(query_params)
+
+        # Add pagination parameters
+        if cursor_mode:
+            if cursor is not None:
+                cursor_date, cursor_filer_id, cursor_name, _ = cursor
+                query_params.append(scalar_param('cursor_date', 'STRING', cursor_date))
+                query_params.append(scalar_param('cursor_filer_id', 'STRING', cursor_filer_id))
+                query_params.append(scalar_param('cursor_name', 'STRING', cursor_name))
+
+            # Fetch one extra row to learn whether another page exists
+            query_params.append(scalar_param('limit', 'INT64', limit + 1))
+        else:
+            offset = (page - 1) * limit
+            query_params.append(scalar_param('limit', 'INT64', limit))
+            query_params.append(scalar_param('offset', 'INT64', offset))
+
+        # Execute query (page rows and total count in one job)
+        client = get_query_backend()
+        results = client.execute_query(sql_query, query_params, template='search.results')
+
+        if estimated_total is not None:
+            total_count = estimated_total
+        elif cursor is not None:
+            total_count = cursor[3]
+        elif results:
+            total_count = results[0]['window_total']
+            for row in results:
+                del row['window_total']
+        elif page > 1:
+            # Empty page past the end: the window had no rows to report on
+            count_result = client.execute_query(
+                self._build_count_query(name_filters), filter_params, template='search.results.count'
+            )
+            total_count = count_result[0]['total'] if count_result else 0
+        else:
+            total_count = 0
+
+        next_cursor = None
+        if cursor_mode and len(results) > limit:
+            results = results[:limit]
+            last = results[-1]
+            next_cursor = encode_cursor([
+                last['latest_filing_date'] or '', last['filer_id'], last['organization_name'] or '',
+                total_count
+            ])
+
+        return {
+            'results': results,
+            'total_count': total_count,
+            'total_count_approximate': estimated_total is not None,
+            'next_cursor': next_cursor
+        }
+
+    def _send_if_not_modified(self, etag):
+        """Answer with 304 Not Modified if the client's cached copy is current
+
+        Returns:
+            bool: True if a 304 was sent
+        """
+        if not etag_matches(self.headers.get('If-None-Match'), etag):
+            return False
+
+        body, status, headers = not_modified_response(etag)
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        return True
+
+    def _send_validation_error(self, message):
+        """Send a 400 response for invalid request parameters"""
+        body, status, headers = error_response(
+            message=message,
+            status_code=400,
+            error_type="ValidationError"
+        )
+
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body.encode())
+
     def _handle_organization_filings(self, org_name):
-        """Get all filings for a specific organization - uses partitioned table for 76% cost reduction
+        """Get all filings for a specific organization - uses cvr_lobby_disclosure_latest
 
-        FIXED: Now filters to latest amendments only (per user request) to show only
-        the most recent version of each filing, not all amendment history.
+        Reads the latest-amendment table built by the pipeline (one row per filing,
+        partitioned by RPT_DATE_DATE and clustered by FILER_ID), so only the most
+        recent version of each filing is shown, not all amendment history.
 
         Uses case-insensitive LIKE matching to handle variations in organization names.
         """
         try:
 
             query = """
-            WITH latest_filings AS (
-                SELECT
-                    FILING_ID,
-                    FILER_ID,
-                    FILER_NAML,
-                    RPT_DATE_DATE,
-                    ROW_NUMBER() OVER (PARTITION BY FILING_ID ORDER BY AMEND_ID DESC) as rn
-                FROM `ca-lobby.ca_lobby.cvr_lobby_disclosure_cd_partitioned`
-                WHERE UPPER(FILER_NAML) LIKE UPPER(@org_name)
-                  AND FROM_DATE_DATE >= '2020-01-01'
-                  AND RPT_DATE_DATE IS NOT NULL
-                  AND EXTRACT(YEAR FROM RPT_DATE_DATE) BETWEEN 2000 AND 2025
-            )
             SELECT
                 FILING_ID as filing_id,
                 FILER_ID as filer_id,
@@ -289,27 +320,34 @@ class handler(BaseHTTPRequestHandler):
                     ' ',
                     CAST(EXTRACT(YEAR FROM RPT_DATE_DATE) AS STRING)
                 ) as period
-            FROM latest_filings
-            WHERE rn = 1
+            FROM `ca-lobby.ca_lobby.cvr_lobby_disclosure_latest`
+            WHERE UPPER(FILER_NAML) LIKE UPPER(@org_name)
+              AND FROM_DATE_DATE >= '2020-01-01'
+              AND RPT_DATE_DATE BETWEEN '2000-01-01' AND '2025-12-31'
             ORDER BY RPT_DATE_DATE DESC
             """
 
-            client = BigQueryClient()
             # Add wildcards for LIKE matching to handle exact and partial matches
             search_pattern = f"%{org_name}%"
             query_params = [
-                bigquery.ScalarQueryParameter('org_name', 'STRING', search_pattern)
+                scalar_param('org_name', 'STRING', search_pattern)
             ]
-            results = client.execute_query(query, query_params)
+            cache_params = {'organization': [org_name]}
+            etag = response_etag('search.organization', cache_params)
+            if self._send_if_not_modified(etag):
+                return
 
-            # Return success response
-            body, status, headers = success_response(results)
+            if not enforce_rate_limit(self, request_cost('search', 'organization')):
+                return
 
-            self.send_response(status)
-            for key, value in headers.items():
-                self.send_header(key, value)
-            self.end_headers()
-            self.wfile.write(body.encode())
+            results, cache_hit = cached_response(
+                'search.organization',
+                cache_params,
+                lambda: get_query_backend().execute_query(query, query_params, template='search.organization')
+            )
+
+            # Stream the filings (can be thousands of rows)
+            send_success(self, results, etag=etag, headers={'X-Cache': 'HIT' if cache_hit else 'MISS'})
 
         except Exception as e:
             # Return error response
@@ -326,7 +364,7 @@ class handler(BaseHTTPRequestHandler):
             self.end_headers()
             self.wfile.write(body.encode())
 
-    def _build_search_query(self):
+    def _build_search_query(self, name_filters=None, seek=False, use_offset=True, with_total=True):
         """Build the main search SQL query - uses v_organization_summary view + fallback to raw table
 
         Primary: v_organization_summary (37K orgs with payments) - 116x faster
@@ -335,11 +373,38 @@ class handler(BaseHTTPRequestHandler):
         This ensures ALL registered organizations are searchable, not just those with payments.
 
         FIXED: organization_filer_id from view was NULL, now we JOIN with raw table to get actual FILER_ID
-        FIXED: Added multiple join conditions to handle name variations:
+        FIXED: Name variations are matched through org_name_canonical (built by the pipeline):
                - "SANTA MONICA, CITY OF" vs "CITY OF SANTA MONICA"
                - Case differences (mixed case vs uppercase)
+               Single equality join on raw name instead of four OR'ed REGEXP conditions
+
+        name_filters selects the organization-name predicates (LIKE_FILTERS by default)
+        seek=True starts after the @cursor_* sort key (cursor mode); cursor mode
+        pages never use OFFSET
+        with_total=True adds a window_total column holding the full result count
+        """
+        return f"""{self._search_ctes(name_filters, with_total)}
+        SELECT * FROM combined
+        WHERE {self.SEEK_FILTER if seek else 'TRUE'}
+        ORDER BY COALESCE(latest_filing_date, '') DESC, filer_id DESC, COALESCE(organization_name, '') DESC
+        LIMIT @limit
+        {'OFFSET @offset' if use_offset else ''}
+        """
+
+    def _build_count_query(self, name_filters=None):
+        """Build count query for pagination - counts the main query's deduplicated set
+
+        Only used when the fused window_total is unavailable (an empty page past the end).
+        Shares the main query's CTEs, so total_count is the same on every page.
+        """
+        return f"""{self._search_ctes(name_filters, with_total=False)}
+        SELECT COUNT(*) as total FROM combined
         """
-        return """
+
+    def _search_ctes(self, name_filters=None, with_total=True):
+        """WITH clause ending in 'combined': the deduplicated view rows plus raw-table fallbacks"""
+        name_filters = name_filters or self.LIKE_FILTERS
+        return f"""
         WITH view_results AS (
             SELECT
                 v.organization_name,
@@ -351,24 +416,11 @@ class handler(BaseHTTPRequestHandler):
                 v.total_spending,
                 v.total_lobbying_firms
             FROM `ca-lobby.ca_lobby.v_organization_summary` v
-            WHERE (@search_term IS NULL OR UPPER(v.organization_name) LIKE UPPER(@search_term))
-        ),
-        filer_ids AS (
-            SELECT
-                FILER_NAML as organization_name,
-                -- Normalize: "CITY OF X" -> "X" for matching
-                REGEXP_REPLACE(UPPER(FILER_NAML), r'^CITY OF\s+', '') as normalized_name,
-                -- Keep as STRING since many FILER_IDs are alphanumeric (e.g., "C00417")
-                MAX(FILER_ID) as filer_id
-            FROM `ca-lobby.ca_lobby.cvr_lobby_disclosure_cd_partitioned`
-            WHERE FROM_DATE_DATE >= '2020-01-01'
-              AND FILER_ID IS NOT NULL
-              AND TRIM(FILER_ID) != ''
-            GROUP BY FILER_NAML
+            WHERE {name_filters['view']}
         ),
         view_with_filer_id_all AS (
             SELECT
-                COALESCE(f.filer_id, '') as filer_id,
+                COALESCE(c.filer_id, '') as filer_id,
                 vr.organization_name,
                 vr.filing_count,
                 vr.first_filing_date,
@@ -379,20 +431,14 @@ class handler(BaseHTTPRequestHandler):
                 vr.total_lobbying_firms,
                 -- Rank by spending to keep best record per filer_id
                 ROW_NUMBER() OVER (
-                    PARTITION BY COALESCE(f.filer_id, vr.organization_name)
+                    PARTITION BY COALESCE(NULLIF(c.filer_id, ''), vr.organization_name)
                     ORDER BY vr.total_spending DESC NULLS LAST
                 ) as rn
             FROM view_results vr
-            LEFT JOIN filer_ids f ON
-                -- Exact match (case-insensitive)
-                UPPER(vr.organization_name) = UPPER(f.organization_name)
-                -- Handle "X, CITY OF" (view) vs "CITY OF X" (raw)
-                OR REGEXP_REPLACE(UPPER(vr.organization_name), r'[,;]?\s*CITY OF\s*$', '') = f.normalized_name
-                -- Handle "COUNTY OF X" (view) vs "X; COUNTY OF" or "X, COUNTY OF" (raw)
-                OR REGEXP_REPLACE(UPPER(vr.organization_name), r'^COUNTY OF\s+', '') =
-                   REGEXP_REPLACE(UPPER(f.organization_name), r'[,;]?\s*COUNTY OF\s*$', '')
-                -- Handle CHARTER vs CHAPTER typo in source data (Santa Ana)
-                OR REPLACE(UPPER(vr.organization_name), 'CHARTER', 'CHAPTER') = UPPER(f.organization_name)
+            -- Name variants ("X, CITY OF" vs "CITY OF X", case, CHARTER/CHAPTER) are
+            -- resolved at load time by the pipeline's canonical name table
+            LEFT JOIN `ca-lobby.ca_lobby.org_name_canonical` c
+                ON c.raw_name = vr.organization_name
         ),
         view_with_filer_id AS (
             -- Deduplicate: keep only highest-spending record per filer_id
@@ -413,7 +459,7 @@ class handler(BaseHTTPRequestHandler):
                 CAST(0 AS FLOAT64) as total_spending,
                 CAST(NULL AS INT64) as total_lobbying_firms
             FROM `ca-lobby.ca_lobby.cvr_lobby_disclosure_cd_partitioned`
-            WHERE (@search_term IS NULL OR UPPER(FILER_NAML) LIKE UPPER(@search_term))
+            WHERE {name_filters['raw']}
               AND FROM_DATE_DATE >= '2020-01-01'
               AND FILER_ID IS NOT NULL
               AND TRIM(FILER_ID) != ''
@@ -422,62 +468,15 @@ class handler(BaseHTTPRequestHandler):
                 SELECT filer_id FROM view_with_filer_id WHERE filer_id != ''
               )
             GROUP BY FILER_ID, FILER_NAML
-        )
-        SELECT * FROM view_with_filer_id
-        UNION ALL
-        SELECT * FROM raw_results
-        ORDER BY latest_filing_date DESC
-        LIMIT @limit
-        OFFSET @offset
-        """
-
-    def _build_count_query(self):
-        """Build count query for pagination - counts from both view and raw table
-
-        Includes ALL organizations (with payments + without payments)
-        Deduplicates by filer_id to avoid counting same org multiple times
-        """
-        return """
-        WITH view_results AS (
-            SELECT organization_name
-            FROM `ca-lobby.ca_lobby.v_organization_summary`
-            WHERE (@search_term IS NULL OR UPPER(organization_name) LIKE UPPER(@search_term))
         ),
-        filer_ids AS (
-            SELECT
-                FILER_NAML as organization_name,
-                REGEXP_REPLACE(UPPER(FILER_NAML), r'^CITY OF\s+', '') as normalized_name,
-                MAX(FILER_ID) as filer_id
-            FROM `ca-lobby.ca_lobby.cvr_lobby_disclosure_cd_partitioned`
-            WHERE FROM_DATE_DATE >= '2020-01-01'
-              AND FILER_ID IS NOT NULL
-              AND TRIM(FILER_ID) != ''
-            GROUP BY FILER_NAML
-        ),
-        view_filer_ids AS (
-            SELECT DISTINCT COALESCE(f.filer_id, '') as filer_id
-            FROM view_results vr
-            LEFT JOIN filer_ids f ON
-                UPPER(vr.organization_name) = UPPER(f.organization_name)
-                OR REGEXP_REPLACE(UPPER(vr.organization_name), r'[,;]?\s*CITY OF\s*$', '') = f.normalized_name
-                OR REGEXP_REPLACE(UPPER(vr.organization_name), r'^COUNTY OF\s+', '') =
-                   REGEXP_REPLACE(UPPER(f.organization_name), r'[,;]?\s*COUNTY OF\s*$', '')
-                OR REPLACE(UPPER(vr.organization_name), 'CHARTER', 'CHAPTER') = UPPER(f.organization_name)
-            WHERE f.filer_id IS NOT NULL AND f.filer_id != ''
-        ),
-        raw_results AS (
-            SELECT DISTINCT FILER_ID as filer_id
-            FROM `ca-lobby.ca_lobby.cvr_lobby_disclosure_cd_partitioned`
-            WHERE (@search_term IS NULL OR UPPER(FILER_NAML) LIKE UPPER(@search_term))
-              AND FROM_DATE_DATE >= '2020-01-01'
-              AND FILER_ID IS NOT NULL
-              AND TRIM(FILER_ID) != ''
-              AND FILER_ID NOT IN (SELECT filer_id FROM view_filer_ids)
-        )
-        SELECT COUNT(*) as total FROM (
-            SELECT organization_name FROM view_results
-            UNION ALL
-            SELECT filer_id as organization_name FROM raw_results
+        combined AS (
+            -- Total over the deduplicated set, computed before seek/LIMIT (same job as the page)
+            SELECT *{', COUNT(*) OVER () as window_total' if with_total else ''}
+            FROM (
+                SELECT * FROM view_with_filer_id
+                UNION ALL
+                SELECT * FROM raw_results
+            )
         )
         """
 
@@ -0,0 +1,50 @@
+"""
+Rate limiter micro-benchmark
+
+Measures the cost of one check_rate_limit call as the number of tracked IPs
+grows, and during a single-IP burst. Not collected by pytest; run directly:
+
+    python api/tests/bench_rate_limit.py
+"""
+
+import sys
+import os
+import timeit
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import rate_limit
+from utils.rate_limit import check_rate_limit, request_counts
+
+CALLS = 10000
+REPEAT = 5
+
+
+def fill(tracked):
+    """Track the given number of distinct IPs"""
+    request_counts.clear()
+    for i in range(tracked):
+        check_rate_limit(f'172.{i // 65536}.{i // 256 % 256}.{i % 256}')
+
+
+def best_ns(fn):
+    return min(timeit.repeat(fn, number=CALLS, repeat=REPEAT)) / CALLS * 1e9
+
+
+def main():
+    print(f"check_rate_limit, best of {REPEAT} x {CALLS} calls, cap {rate_limit.MAX_TRACKED_KEYS} IPs")
+
+    for tracked in (1000, 10000, 100000):
+        fill(tracked)
+        repeat_ip = best_ns(lambda: check_rate_limit('198.51.100.1'))
+
+        counter = iter(range(10 ** 9))
+        new_ip = best_ns(lambda: check_rate_limit(f'new-{next(counter)}'))
+
+        print(f"  {tracked:>7} IPs tracked: repeat IP {repeat_ip:7.0f} ns/call, "
+              f"new IP {new_ip:7.0f} ns/call ({len(request_counts)} tracked after)")
+
+
+if __name__ == '__main__':
+    main()
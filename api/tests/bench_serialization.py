@@ -0,0 +1,74 @@
+"""
+Serialization micro-benchmark
+
+Compares the previous json.dumps(default=str) path with the typed row encoder
+on 10K BigQuery-shaped rows. Not collected by pytest; run directly:
+
+    python api/tests/bench_serialization.py
+"""
+
+import sys
+import os
+import json
+import timeit
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import serialization
+from utils.serialization import encode_rows
+from utils.response import iter_json_chunks
+
+ROW_COUNT = 10000
+REPEAT = 5
+
+
+def make_rows(count=ROW_COUNT, with_timestamp=False):
+    """Rows shaped like search/organization results (DATE and NUMERIC columns)"""
+    start = date(2020, 1, 1)
+    rows = [
+        {
+            'filing_id': 2500000 + i,
+            'filer_id': f'C{i % 5000:05d}',
+            'organization_name': f'ORGANIZATION {i % 5000}',
+            'filing_date': start + timedelta(days=i % 1800),
+            'total_spending': Decimal(f'{i * 13.37:.2f}'),
+            'payment_count': i % 97,
+            'notes': None
+        }
+        for i in range(count)
+    ]
+    if with_timestamp:
+        for i, row in enumerate(rows):
+            row['loaded_at'] = datetime(2025, 1, 1) + timedelta(minutes=i)
+    return rows
+
+
+def best_ms(fn):
+    return min(timeit.repeat(fn, number=1, repeat=REPEAT)) * 1000
+
+
+def run(label, rows):
+    payload = {'success': True, 'data': rows, 'timestamp': 'now'}
+
+    baseline = best_ms(lambda: json.dumps(payload, default=str))
+    typed = best_ms(lambda: encode_rows(rows))
+    streamed = best_ms(lambda: sum(len(chunk) for chunk in iter_json_chunks(payload)))
+
+    print(f"{label}:")
+    print(f"  json.dumps(default=str):  {baseline:8.2f} ms")
+    print(f"  RowEncoder.encode_rows:   {typed:8.2f} ms  ({baseline / typed:.1f}x)")
+    print(f"  iter_json_chunks:         {streamed:8.2f} ms  ({baseline / streamed:.1f}x)")
+
+
+def main():
+    backend = 'orjson' if serialization.orjson is not None else 'json (stdlib)'
+    print(f"{ROW_COUNT} rows, best of {REPEAT}, backend: {backend}")
+    run("DATE + NUMERIC columns", make_rows())
+    run("DATE + NUMERIC + TIMESTAMP columns", make_rows(with_timestamp=True))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Cold-start benchmark
+
+Measures import-to-first-byte for each handler in api/: a fresh interpreter
+imports the endpoint module and serves one request that needs no database
+(a CORS preflight) over a socket pair. Not collected by
+pytest; run directly:
+
+    python api/tests/bench_startup.py
+"""
+
+import sys
+import os
+import json
+import subprocess
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Endpoint module -> requests to time (none of them touch BigQuery)
+ENDPOINTS = {
+    'analytics': ['OPTIONS'],
+    'search': ['OPTIONS'],
+    'database_stats': ['OPTIONS'],
+    'organization': ['OPTIONS'],
+    'health': ['OPTIONS'],
+}
+
+# Top-level packages that must stay off the cold-start path
+HEAVY_MODULES = ('google', 'pyarrow', 'pandas', 'duckdb')
+
+REPEAT = 5
+
+PROBE = r'''
+import json, os, socket, sys, time
+
+started = time.perf_counter()
+sys.path.insert(0, {api_dir!r})
+module = __import__({module!r})
+imported = time.perf_counter()
+
+client, server = socket.socketpair()
+client.sendall({request!r})
+module.handler(server, ('127.0.0.1', 0), None)
+server.shutdown(socket.SHUT_WR)
+first = client.recv(1)
+first_byte = time.perf_counter()
+
+response = first
+while True:
+    chunk = client.recv(65536)
+    if not chunk:
+        break
+    response += chunk
+
+print(json.dumps({{
+    'import_ms': (imported - started) * 1000,
+    'first_byte_ms': (first_byte - started) * 1000,
+    'status': int(response.split(b' ', 2)[1]),
+    'heavy_modules': sorted({{name.split('.')[0] for name in sys.modules}} & set({heavy!r}))
+}}))
+'''
+
+
+def measure_startup(module, method='OPTIONS'):
+    """
+    Start a fresh interpreter, import one endpoint and serve one request
+
+    Args:
+        module: Endpoint module name in api/, e.g. 'analytics'
+        method: 'OPTIONS' (preflight) or 'GET'
+
+    Returns:
+        dict: import_ms, first_byte_ms (both from before the import),
+            status and heavy_modules (heavy packages that got imported)
+    """
+    request = f"{method} /api/{module} HTTP/1.0\r\nHost: localhost\r\n\r\n".encode()
+    code = PROBE.format(api_dir=API_DIR, module=module, request=request, heavy=HEAVY_MODULES)
+    env = {**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'}
+
+    result = subprocess.run(
+        [sys.executable, '-c', code], capture_output=True, text=True, timeout=60, env=env
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{module} {method} failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    print(f"Import-to-first-byte per handler, best of {REPEAT} fresh interpreters")
+    for module, methods in ENDPOINTS.items():
+        for method in methods:
+            runs = [measure_startup(module, method) for _ in range(REPEAT)]
+            best = min(runs, key=lambda run: run['first_byte_ms'])
+            heavy = ', '.join(best['heavy_modules']) or 'none'
+            print(f"  {module:>15} {method:<8} import {best['import_ms']:7.1f} ms   "
+                  f"first byte {best['first_byte_ms']:7.1f} ms   heavy modules: {heavy}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Tests for analytics request validation
+"""
+
+import pytest
+import sys
+import os
+import io
+import json
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analytics
+from utils import cache, rate_limit
+from utils.cache import ResponseCache
+
+
+class FakeHandler(analytics.handler):
+    """Analytics handler that records the response instead of using a socket"""
+
+    def __init__(self, path):
+        self.path = path
+        self.headers = {}
+        self.client_address = ('127.0.0.1', 50000)
+        self.request_version = 'HTTP/1.0'
+        self.wfile = io.BytesIO()
+        self.status = None
+
+    def send_response(self, status):
+        self.status = status
+
+    def send_header(self, key, value):
+        pass
+
+    def end_headers(self):
+        pass
+
+    def json(self):
+        return json.loads(self.wfile.getvalue())
+
+
+class TestAnalyticsTypes:
+    """Test cases for the '?type=' parameter"""
+
+    def setup_method(self):
+        """Fresh response cache, data version and rate limits for each test"""
+        cache._response_cache = ResponseCache()
+        os.environ['DATA_VERSION'] = '1'
+        rate_limit.request_counts.clear()
+
+    def teardown_method(self):
+        os.environ.pop('DATA_VERSION', None)
+        cache._response_cache = None
+
+    def test_unknown_single_type_is_a_validation_error(self):
+        """Test an unknown type is a 400 listing the valid types, before any query"""
+        handler = FakeHandler('/api/analytics?type=bogus')
+        handler.do_GET()
+
+        error = handler.json()['error']
+        assert handler.status == 400
+        assert error['type'] == 'ValidationError'
+        assert all(name in error['message'] for name in analytics.handler.ANALYTICS_TYPES)
+
+    def test_unknown_type_in_batch_is_reported_per_type(self):
+        """Test a batch still reports unknown types under metadata.errors"""
+        handler = FakeHandler('/api/analytics?types=bogus')
+        handler.do_GET()
+
+        assert handler.status == 200
+        assert 'bogus' in handler.json()['metadata']['errors']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,111 @@
+"""
+Tests for the BigQuery client's streaming query path
+"""
+
+import pytest
+import sys
+import os
+import json
+from datetime import datetime
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import query_budget, timing
+from utils.bigquery_client import BigQueryClient
+
+
+class StandInJob:
+    """Finished query job whose results arrive in pages"""
+
+    created = started = datetime(2025, 1, 1, 12, 0, 0)
+    slot_millis = 40
+    total_bytes_processed = total_bytes_billed = 10 ** 6
+    cache_hit = False
+
+    def __init__(self, pages, error=None):
+        self.page_list = pages
+        self.error = error
+        self.fetched = 0
+        self.page_size = None
+
+    def result(self, page_size=None):
+        if self.error is not None:
+            raise self.error
+        self.page_size = page_size
+        return self
+
+    @property
+    def pages(self):
+        for page in self.page_list:
+            self.fetched += 1
+            yield page  # dict rows expose items() like bigquery.Row
+
+
+def stand_in_client(job, monkeypatch):
+    """BigQueryClient whose jobs are the given stand-in (no credentials, no dry run)"""
+    monkeypatch.setattr(query_budget, 'DRY_RUN_ENABLED', False)
+    client = object.__new__(BigQueryClient)
+    client._job_config = lambda params=None, template=None, dry_run=False: None
+    client._client = type('StandInBigQuery', (), {
+        'query': lambda self, query, job_config=None: job
+    })()
+    return client
+
+
+def logged_lines(capsys):
+    """Metrics lines written to stdout, decoded"""
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines() if line.startswith('{')]
+
+
+class TestIterQuery:
+    """Test page-by-page iteration and its metrics"""
+
+    def setup_method(self):
+        """Start each test outside any request"""
+        timing._current.set(None)
+
+    def test_yields_rows_page_by_page(self, monkeypatch):
+        """Test a page is fetched only once the previous page's rows are consumed"""
+        job = StandInJob([[{'id': 1}, {'id': 2}], [{'id': 3}]])
+        client = stand_in_client(job, monkeypatch)
+
+        rows = client.iter_query('SELECT id', page_size=2, template='search.results')
+
+        assert next(rows) == {'id': 1}
+        assert job.fetched == 1
+        assert next(rows) == {'id': 2}
+        assert job.fetched == 1
+        assert next(rows) == {'id': 3}
+        assert job.fetched == 2
+        assert list(rows) == []
+        assert job.page_size == 2
+
+    def test_records_job_metrics_after_last_page(self, monkeypatch, capsys):
+        """Test one metrics line with the total row count once iteration ends"""
+        job = StandInJob([[{'id': 1}, {'id': 2}], [{'id': 3}], []])
+        client = stand_in_client(job, monkeypatch)
+
+        rows = client.iter_query('SELECT id', template='search.results')
+        next(rows)
+        assert logged_lines(capsys) == []
+
+        list(rows)
+        line, = logged_lines(capsys)
+        assert line['status'] == 'ok'
+        assert line['template'] == 'search.results'
+        assert line['rows'] == 3
+        assert line['bytes_processed'] == 10 ** 6
+
+    def test_records_failed_query(self, monkeypatch, capsys):
+        """Test a failing job logs an error line and re-raises"""
+        client = stand_in_client(StandInJob([], error=RuntimeError('boom')), monkeypatch)
+
+        with pytest.raises(RuntimeError):
+            list(client.iter_query('SELECT id', template='search.results'))
+
+        assert [line['status'] for line in logged_lines(capsys)] == ['error']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
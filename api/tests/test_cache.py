@@ -0,0 +1,170 @@
+"""
+Tests for response cache utility
+"""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import cache
+from utils.cache import (
+    LRUCache, ResponseCache, SQLiteCacheBackend,
+    make_cache_key, normalize_params, cached_response, response_etag
+)
+
+
+class TestLRUCache:
+    """Test cases for the in-process LRU cache"""
+
+    def test_get_missing_key(self):
+        """Test that a missing key is reported as a miss"""
+        assert LRUCache(2).get('missing') == (False, None)
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest untouched entry is evicted when full"""
+        lru = LRUCache(2)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.get('a')  # 'b' is now least recently used
+        lru.set('c', 3)
+
+        assert lru.get('a') == (True, 1)
+        assert lru.get('b') == (False, None)
+        assert lru.get('c') == (True, 3)
+        assert len(lru) == 2
+
+    def test_caches_falsy_values(self):
+        """Test that empty results are cached as hits"""
+        lru = LRUCache(2)
+        lru.set('empty', [])
+
+        assert lru.get('empty') == (True, [])
+
+
+class TestSQLiteBackend:
+    """Test cases for the shared SQLite backend"""
+
+    def test_round_trip(self, tmp_path):
+        """Test that values survive a round trip through the backend"""
+        backend = SQLiteCacheBackend(str(tmp_path / 'cache.sqlite3'))
+        backend.set('key', {'rows': [1, 2, 3]})
+
+        assert backend.get('key') == (True, {'rows': [1, 2, 3]})
+        assert backend.get('other') == (False, None)
+
+    def test_shared_between_instances(self, tmp_path):
+        """Test that a second cache instance sees entries via the backend"""
+        path = str(tmp_path / 'cache.sqlite3')
+        ResponseCache(backend=SQLiteCacheBackend(path)).set('key', 'value')
+
+        # New process-local LRU, same shared file
+        second = ResponseCache(backend=SQLiteCacheBackend(path))
+
+        assert second.get('key') == (True, 'value')
+        assert second.local.get('key') == (True, 'value')
+
+
+class TestCacheKey:
+    """Test cases for cache key normalization"""
+
+    def test_param_order_does_not_matter(self):
+        """Test that parameter order produces the same key"""
+        a = make_cache_key('search', {'q': ['water'], 'page': ['1']}, 1)
+        b = make_cache_key('search', {'page': ['1'], 'q': ['water']}, 1)
+
+        assert a == b
+
+    def test_empty_params_are_dropped(self):
+        """Test that empty and whitespace values are ignored"""
+        assert normalize_params({'q': [' water '], 'page': [''], 'x': []}) == [('q', ['water'])]
+
+    def test_version_changes_key(self):
+        """Test that a new data version produces a new key"""
+        a = make_cache_key('analytics', {'type': ['summary']}, 1)
+        b = make_cache_key('analytics', {'type': ['summary']}, 2)
+
+        assert a != b
+
+    def test_endpoint_changes_key(self):
+        """Test that identical params on different endpoints do not collide"""
+        assert make_cache_key('search', {}, 1) != make_cache_key('analytics', {}, 1)
+
+
+class TestCachedResponse:
+    """Test cases for cached_response"""
+
+    def setup_method(self):
+        """Use a fresh cache and a fixed data version for each test"""
+        cache._response_cache = ResponseCache()
+        os.environ['DATA_VERSION'] = '1'
+
+    def teardown_method(self):
+        os.environ.pop('DATA_VERSION', None)
+        cache._response_cache = None
+
+    def test_second_call_is_a_hit(self):
+        """Test that repeat requests are served without recomputing"""
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {'total': 5}
+
+        assert cached_response('analytics', {'type': ['summary']}, compute) == ({'total': 5}, False)
+        assert cached_response('analytics', {'type': ['summary']}, compute) == ({'total': 5}, True)
+        assert len(calls) == 1
+
+    def test_version_bump_invalidates(self):
+        """Test that a new data version forces a recompute"""
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return len(calls)
+
+        cached_response('analytics', {}, compute)
+        os.environ['DATA_VERSION'] = '2'
+        value, hit = cached_response('analytics', {}, compute)
+
+        assert (value, hit) == (2, False)
+
+    def test_failures_are_not_cached(self):
+        """Test that exceptions propagate and are not stored"""
+        def fail():
+            raise RuntimeError('query failed')
+
+        with pytest.raises(RuntimeError):
+            cached_response('analytics', {}, fail)
+
+        assert cached_response('analytics', {}, lambda: 'ok') == ('ok', False)
+
+
+class TestResponseEtag:
+    """Test cases for response_etag"""
+
+    def setup_method(self):
+        os.environ['DATA_VERSION'] = '1'
+
+    def teardown_method(self):
+        os.environ.pop('DATA_VERSION', None)
+
+    def test_stable_for_equivalent_requests(self):
+        """Test that param order and empty params do not change the ETag"""
+        etag = response_etag('search', {'q': ['acme'], 'page': ['1']})
+
+        assert etag == response_etag('search', {'page': ['1'], 'q': ['acme'], 'cursor': ['']})
+        assert etag.startswith('W/"') and etag.endswith('"')
+
+    def test_changes_with_data_version(self):
+        """Test that a pipeline load invalidates client copies"""
+        etag = response_etag('search', {'q': ['acme']})
+        os.environ['DATA_VERSION'] = '2'
+
+        assert response_etag('search', {'q': ['acme']}) != etag
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
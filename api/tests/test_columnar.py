@@ -0,0 +1,71 @@
+"""
+Tests for columnar response formats
+"""
+
+import pytest
+import sys
+import os
+from decimal import Decimal
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.columnar import to_columnar, to_arrow_ipc, arrow_available
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:
+    pyarrow = None
+
+
+ROWS = [
+    {'year': 2024, 'govt_type': 'city', 'total_amount': Decimal('1500.25')},
+    {'year': 2025, 'govt_type': 'county', 'total_amount': Decimal('300.00')},
+]
+
+
+class TestToColumnar:
+    """Test row to column-array conversion"""
+
+    def test_columns_follow_first_row_order(self):
+        """Test column order matches the query's SELECT order"""
+        result = to_columnar(ROWS)
+        assert result['columns'] == ['year', 'govt_type', 'total_amount']
+
+    def test_values_per_column(self):
+        """Test each column holds its values in row order"""
+        result = to_columnar(ROWS)
+        assert result['data']['year'] == [2024, 2025]
+        assert result['data']['govt_type'] == ['city', 'county']
+
+    def test_missing_key_becomes_none(self):
+        """Test a key absent from a later row is filled with None"""
+        result = to_columnar([{'a': 1, 'b': 2}, {'a': 3}])
+        assert result['data']['b'] == [2, None]
+
+    def test_empty_rows(self):
+        """Test an empty result has no columns"""
+        assert to_columnar([]) == {'columns': [], 'data': {}}
+
+
+class TestToArrow:
+    """Test Arrow IPC encoding"""
+
+    def test_unavailable_without_pyarrow(self):
+        """Test encoding fails loudly when pyarrow is missing"""
+        if arrow_available():
+            pytest.skip("pyarrow is installed")
+        with pytest.raises(RuntimeError):
+            to_arrow_ipc(ROWS)
+
+    @pytest.mark.skipif(pyarrow is None, reason="pyarrow not installed")
+    def test_round_trip(self):
+        """Test the IPC stream decodes to the same columns"""
+        table = pyarrow.ipc.open_stream(to_arrow_ipc(ROWS)).read_all()
+        assert table.column_names == ['year', 'govt_type', 'total_amount']
+        assert table.column('year').to_pylist() == [2024, 2025]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,75 @@
+"""
+Tests for concurrency utility
+"""
+
+import pytest
+import sys
+import os
+import threading
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.concurrency import run_parallel
+
+
+class TestRunParallel:
+    """Test cases for run_parallel"""
+
+    def test_returns_results_by_name(self):
+        """Test that each result is keyed by its call name"""
+        results = run_parallel({
+            'a': lambda: 1,
+            'b': lambda: 2,
+            'c': lambda: 3
+        })
+
+        assert results == {'a': 1, 'b': 2, 'c': 3}
+        assert list(results) == ['a', 'b', 'c']
+
+    def test_empty_calls(self):
+        """Test that no calls returns an empty dict"""
+        assert run_parallel({}) == {}
+
+    def test_calls_run_concurrently(self):
+        """Test that all calls are in flight at the same time"""
+        barrier = threading.Barrier(4, timeout=5)
+
+        def wait_for_others():
+            barrier.wait()
+            return True
+
+        results = run_parallel({str(i): wait_for_others for i in range(4)})
+
+        assert all(results.values())
+
+    def test_raises_first_failure_by_default(self):
+        """Test that a failing call propagates its exception"""
+        def fail():
+            raise RuntimeError('query failed')
+
+        with pytest.raises(RuntimeError):
+            run_parallel({'ok': lambda: 1, 'bad': fail})
+
+    def test_return_exceptions(self):
+        """Test that failures are reported per key when requested"""
+        def fail():
+            raise RuntimeError('query failed')
+
+        results = run_parallel({'ok': lambda: 1, 'bad': fail}, return_exceptions=True)
+
+        assert results['ok'] == 1
+        assert isinstance(results['bad'], RuntimeError)
+
+    def test_single_call_return_exceptions(self):
+        """Test per-key failure reporting for a single call"""
+        def fail():
+            raise ValueError('bad')
+
+        results = run_parallel({'only': fail}, return_exceptions=True)
+
+        assert isinstance(results['only'], ValueError)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,94 @@
+"""
+Tests for keyset pagination cursors
+"""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.cursor import encode_cursor, decode_cursor
+from tests.test_query_backend import backend  # noqa: F401 (DuckDB snapshot fixture)
+
+SEEK_TYPES = (str, str, str)
+
+
+class TestCursor:
+    """Test cases for cursor encoding"""
+
+    def test_round_trip(self):
+        """Test that a sort key survives encoding and decoding"""
+        key = ['2025-03-31', 'C00417', 'SANTA MONICA, CITY OF']
+
+        assert decode_cursor(encode_cursor(key), SEEK_TYPES) == key
+
+    def test_token_is_url_safe(self):
+        """Test that tokens need no URL escaping"""
+        token = encode_cursor(['2025-03-31', '', 'A/B+C?D=E&F'])
+
+        assert all(c.isalnum() or c in '-_' for c in token)
+
+    def test_rejects_garbage(self):
+        """Test that malformed tokens raise ValueError"""
+        with pytest.raises(ValueError):
+            decode_cursor('not-a-cursor!!', SEEK_TYPES)
+
+    def test_rejects_wrong_size(self):
+        """Test that a cursor with the wrong number of values is rejected"""
+        with pytest.raises(ValueError):
+            decode_cursor(encode_cursor(['2025-03-31', 'C00417']), SEEK_TYPES)
+
+    @pytest.mark.parametrize('key', [
+        ['2025-03-31', 417, 'ACME'],
+        ['2025-03-31', None, 'ACME'],
+        ['2025-03-31', 'C00417', ['ACME']],
+        [True, 'C00417', 'ACME'],
+    ])
+    def test_rejects_wrong_types(self, key):
+        """Test that values of the wrong type never reach the typed query parameters"""
+        with pytest.raises(ValueError):
+            decode_cursor(encode_cursor(key), SEEK_TYPES)
+
+    def test_accepts_int_where_expected(self):
+        """Test that integer sort key values pass when the column is numeric"""
+        assert decode_cursor(encode_cursor([2025, 'C00417']), (int, str)) == [2025, 'C00417']
+        with pytest.raises(ValueError):
+            decode_cursor(encode_cursor([True, 'C00417']), (int, str))
+
+
+class TestCursorPagination:
+    """Test keyset pages against the DuckDB snapshot used by test_query_backend"""
+
+    def walk_pages(self, handler, term, limit):
+        """Follow next_cursor from the first cursor page to the last"""
+        import search
+
+        pages, cursor = [], None
+        while True:
+            result = handler._run_search(term, 1, limit, cursor_mode=True, cursor=cursor)
+            pages.append(result)
+            if result['next_cursor'] is None:
+                return pages
+            cursor = decode_cursor(result['next_cursor'], search.handler.CURSOR_TYPES)
+
+    @pytest.mark.parametrize('limit', [1, 3])
+    def test_pages_cover_result_set_once(self, backend, limit, monkeypatch):  # noqa: F811
+        """Test that following next_cursor returns every row once, in offset order"""
+        import search
+
+        monkeypatch.setattr(search, 'get_name_index', lambda: None)
+        handler = search.handler.__new__(search.handler)
+        expected = handler._run_search('', page=1, limit=10)
+
+        pages = self.walk_pages(handler, '', limit)
+        rows = [row for page in pages for row in page['results']]
+
+        assert len(pages) == -(-expected['total_count'] // limit)
+        assert rows == expected['results']
+        assert all(page['total_count'] == expected['total_count'] for page in pages)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,118 @@
+"""
+Tests for the cached health probe
+"""
+
+import pytest
+import sys
+import os
+import time
+import threading
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.health_probe import HealthProbe
+
+
+class CountingProbe:
+    """Stand-in connectivity check that counts calls"""
+
+    def __init__(self, result=True, delay=0.0):
+        self.result = result
+        self.delay = delay
+        self.calls = 0
+        self.called = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        self.called.set()
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+class TestHealthProbe:
+    """Test cached connectivity status"""
+
+    def test_first_status_is_live(self):
+        """Test the first request runs the probe synchronously"""
+        probe = CountingProbe()
+        status = HealthProbe(probe, ttl=30).status()
+
+        assert status['connected'] is True
+        assert status['probe'] == 'live'
+        assert probe.calls == 1
+
+    def test_fresh_status_is_cached(self):
+        """Test requests within the TTL do not run the probe"""
+        probe = CountingProbe()
+        health = HealthProbe(probe, ttl=30)
+        health.status()
+
+        for _ in range(5):
+            status = health.status()
+
+        assert status['probe'] == 'cached'
+        assert probe.calls == 1
+
+    def test_reports_age_and_latency(self):
+        """Test the response reports probe age and last probe latency"""
+        health = HealthProbe(CountingProbe(delay=0.02), ttl=30)
+        health.status()
+        health.checked_at -= 5
+
+        status = health.status()
+
+        assert status['probe_age_seconds'] == pytest.approx(5, abs=0.5)
+        assert status['probe_latency_ms'] >= 20
+        assert status['checked_at'].endswith('Z')
+
+    def test_stale_status_refreshes_in_background(self):
+        """Test a stale result is served while one background refresh runs"""
+        probe = CountingProbe()
+        health = HealthProbe(probe, ttl=30)
+        health.status()
+        probe.called.clear()
+        health.checked_at -= 60
+
+        status = health.status()
+
+        assert status['probe'] == 'cached'
+        assert status['probe_age_seconds'] >= 60
+        assert probe.called.wait(2)
+        for _ in range(100):
+            if not health._refreshing:
+                break
+            time.sleep(0.01)
+        assert health.status()['probe_age_seconds'] < 5
+        assert probe.calls == 2
+
+    def test_very_old_status_is_refreshed_inline(self):
+        """Test a result older than max_age is never served"""
+        probe = CountingProbe()
+        health = HealthProbe(probe, ttl=30, max_age=300)
+        health.status()
+        health.checked_at -= 600
+
+        assert health.status()['probe'] == 'live'
+        assert probe.calls == 2
+
+    def test_deep_forces_live_probe(self):
+        """Test deep=True always probes"""
+        probe = CountingProbe()
+        health = HealthProbe(probe, ttl=30)
+        health.status()
+
+        assert health.status(deep=True)['probe'] == 'live'
+        assert probe.calls == 2
+
+    def test_probe_exception_reports_disconnected(self):
+        """Test a failing probe is reported as disconnected, not raised"""
+        health = HealthProbe(CountingProbe(result=RuntimeError("timeout")), ttl=30)
+
+        assert health.status()['connected'] is False
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
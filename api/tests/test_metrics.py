@@ -0,0 +1,97 @@
+"""
+Tests for query metrics
+"""
+
+import pytest
+import sys
+import os
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import metrics, timing
+from utils.timing import begin_request
+
+
+def logged_lines(capsys):
+    """Metrics lines written to stdout, decoded"""
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+class TestQueryMetrics:
+    """Test the per-query metrics log line"""
+
+    def setup_method(self):
+        """Start each test outside any request"""
+        timing._current.set(None)
+
+    def test_records_per_template(self, capsys):
+        """Test statistics are tagged by template and endpoint, one line per query"""
+        metrics.record_query('analytics.summary', wall_ms=120, rows=1, bytes_processed=5000)
+        metrics.record_query('analytics.summary', wall_ms=80, rows=1, cache_hit=True)
+
+        first, second = logged_lines(capsys)
+        assert first['event'] == 'query'
+        assert first['status'] == 'ok'
+        assert first['template'] == 'analytics.summary'
+        assert first['endpoint'] == 'analytics'
+        assert first['bytes_processed'] == 5000
+        assert second['cache_hit'] is True
+        assert second['bytes_processed'] is None  # cache hit reported no bytes
+
+    def test_records_errors_and_coalesced_calls(self, capsys):
+        """Test failed queries and coalesced calls get their own status"""
+        metrics.record_query_error('search.results')
+        metrics.record_coalesced('analytics.spending')
+
+        assert [line['status'] for line in logged_lines(capsys)] == ['error', 'coalesced']
+
+    def test_untagged_queries(self, capsys):
+        """Test queries without a template are grouped together"""
+        metrics.record_query(None, wall_ms=1, rows=0)
+
+        assert logged_lines(capsys)[0]['template'] == metrics.UNTAGGED
+
+    def test_carries_request_id(self, capsys):
+        """Test lines can be joined to the request that ran the query"""
+        class Handler:
+            headers = {'X-Request-Id': 'req-123'}
+
+        begin_request(Handler())
+        metrics.record_query('health', wall_ms=3, rows=1)
+
+        assert logged_lines(capsys)[0]['request_id'] == 'req-123'
+
+    def test_record_job_reads_job_statistics(self, capsys):
+        """Test job statistics are read from a finished query job"""
+        created = datetime(2025, 1, 1, 12, 0, 0)
+        job = SimpleNamespace(
+            created=created,
+            started=created + timedelta(milliseconds=250),
+            slot_millis=4000,
+            total_bytes_processed=10 ** 9,
+            total_bytes_billed=10 ** 9,
+            cache_hit=False
+        )
+
+        metrics.record_job('database_stats.payments', job, wall_ms=900, rows=1)
+
+        line = logged_lines(capsys)[0]
+        assert line['queue_ms'] == pytest.approx(250)
+        assert line['slot_ms'] == 4000
+        assert line['bytes_billed'] == 10 ** 9
+
+    def test_disabled(self, capsys, monkeypatch):
+        """Test QUERY_METRICS_LOG=0 silences the log lines"""
+        monkeypatch.setattr(metrics, 'METRICS_LOG_ENABLED', False)
+
+        metrics.record_query('analytics.summary', wall_ms=1, rows=1)
+
+        assert capsys.readouterr().out == ''
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
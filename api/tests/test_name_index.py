@@ -0,0 +1,168 @@
+"""
+Tests for organization name index
+"""
+
+import pytest
+import sys
+import os
+import random
+import string
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+
+from utils import name_index, query_backend
+from utils.name_index import NameIndex, get_name_index, normalize_name
+
+
+def generated_rows(count=60000, seed=42):
+    """Random multi-word names at production scale, one filer ID each"""
+    rng = random.Random(seed)
+    words = [''.join(rng.choices(string.ascii_uppercase, k=rng.randint(3, 9))) for _ in range(3000)]
+    return [(' '.join(rng.choices(words, k=4)), f'F{i}') for i in range(count)]
+
+
+ROWS = [
+    ('CITY OF SANTA MONICA', 'C001'),
+    ('SANTA MONICA, CITY OF', ''),
+    ('County of Los Angeles', 'C002'),
+    ('LOS ANGELES COUNTY METROPOLITAN TRANSPORTATION AUTHORITY', 'C003'),
+    ('Pacific Gas and Electric Company', 'C004'),
+    ('Pacific Gas and Electric Company', 'C005'),
+    ('LEAGUE OF CALIFORNIA CITIES', ''),
+]
+
+
+def naive_search(rows, term):
+    """Reference implementation: UPPER(name) LIKE UPPER('%term%')"""
+    seen = []
+    for name, _ in rows:
+        if term.upper() in name.upper() and name not in seen:
+            seen.append(name)
+    return seen
+
+
+class TestNameIndex:
+    """Test cases for NameIndex"""
+
+    def setup_method(self):
+        self.index = NameIndex(ROWS)
+
+    def test_deduplicates_names(self):
+        """Test that each distinct name is stored once"""
+        assert len(self.index) == 6
+
+    @pytest.mark.parametrize('term', [
+        'santa monica', 'CITY', 'los angeles', 'gas and', 'Company', 'OF', 'a', 'zzz', 'TRANSPORTATION AUTHORITY'
+    ])
+    def test_matches_like_semantics(self, term):
+        """Test that results equal a case-insensitive substring scan"""
+        names, _ = self.index.lookup(term)
+
+        assert names == naive_search(ROWS, term)
+
+    def test_collects_filer_ids(self):
+        """Test that every filer ID under a matching name is returned"""
+        _, filer_ids = self.index.lookup('pacific gas')
+
+        assert filer_ids == ['C004', 'C005']
+
+    def test_view_only_names_have_no_filer_ids(self):
+        """Test that names without a filer ID still match"""
+        names, filer_ids = self.index.lookup('league of california')
+
+        assert names == ['LEAGUE OF CALIFORNIA CITIES']
+        assert filer_ids == []
+
+    def test_no_match(self):
+        """Test that an unknown term returns nothing"""
+        assert self.index.lookup('nonexistent organization') == ([], [])
+
+    def test_skips_empty_names(self):
+        """Test that empty names are ignored"""
+        assert len(NameIndex([('', 'X'), (None, 'Y')])) == 0
+
+
+class BlockingBackend:
+    """Backend whose name index query waits until released"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.templates = []
+
+    def iter_query(self, query, params=None, template=None):
+        self.templates.append(template)
+        self.release.wait(2)
+        return iter([{'name': name, 'filer_id': filer_id} for name, filer_id in ROWS])
+
+
+class TestSharedIndex:
+    """Test the process-wide index is built off the request path"""
+
+    def setup_method(self):
+        """Start without an index"""
+        name_index._index.update(value=None, version=None, building=None)
+        os.environ['DATA_VERSION'] = '1'
+
+    def teardown_method(self):
+        name_index._index.update(value=None, version=None, building=None)
+        os.environ.pop('DATA_VERSION', None)
+
+    def wait_until_built(self):
+        for _ in range(500):
+            if name_index._index['building'] is None:
+                return
+            time.sleep(0.002)
+        raise AssertionError("index never built")
+
+    def test_build_does_not_block_searches(self, monkeypatch):
+        """Test callers get None (SQL LIKE fallback) while one background build runs"""
+        backend = BlockingBackend()
+        monkeypatch.setattr(query_backend, 'get_query_backend', lambda: backend)
+
+        assert get_name_index() is None
+        assert get_name_index() is None  # joins the running build
+
+        backend.release.set()
+        self.wait_until_built()
+
+        assert len(get_name_index()) == 6
+        assert backend.templates == ['search.name_index']
+
+    def test_rebuilds_for_new_data_version(self, monkeypatch):
+        """Test a data version bump stops serving the old index until rebuilt"""
+        backend = BlockingBackend()
+        backend.release.set()
+        monkeypatch.setattr(query_backend, 'get_query_backend', lambda: backend)
+
+        get_name_index()
+        self.wait_until_built()
+        assert get_name_index() is not None
+
+        os.environ['DATA_VERSION'] = '2'
+        assert get_name_index() is None
+        self.wait_until_built()
+        assert name_index._index['version'] == '2'
+
+
+class TestNameIndexScale:
+    """Candidate narrowing at production scale (~60K names)"""
+
+    def test_trigrams_narrow_candidates(self):
+        """Test that a typical term substring-checks a small fraction of the names"""
+        rows = generated_rows()
+        index = NameIndex(rows)
+        rng = random.Random(7)
+
+        for name, _ in rng.sample(rows, 50):
+            term = name.split()[0][:5]
+            candidates = index._candidates(normalize_name(term))
+            assert len(candidates) < len(index) // 20
+            assert set(index.search(term)) <= set(candidates)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,161 @@
+"""
+Tests for the organization profile endpoint
+"""
+
+import pytest
+import sys
+import os
+import io
+import json
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import organization
+from utils import cache, rate_limit
+from utils.cache import ResponseCache
+from utils.query_backend import QueryBackend
+
+PROFILE_ROWS = {
+    'organization.filings': [
+        {'filing_id': 2, 'organization_name': 'ACME CORP', 'filing_date': '2024-06-30', 'year': 2024},
+        {'filing_id': 1, 'organization_name': 'ACME CORPORATION', 'filing_date': '2022-03-31', 'year': 2022}
+    ],
+    'organization.payments_by_year': [
+        {'year': 2022, 'total_amount': 1000.25, 'payment_count': 2},
+        {'year': 2023, 'total_amount': 500.5, 'payment_count': 1}
+    ],
+    'organization.top_firms': [{'firm_name': 'FIRM A', 'total_amount': 1500.75, 'payment_count': 3}],
+    'organization.related': [{'filer_id': 'F2', 'organization_name': 'BETA LLC', 'shared_firms': 1}]
+}
+
+
+class StandInBackend(QueryBackend):
+    """Backend answering each sub-query from PROFILE_ROWS, recording calls"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def iter_query(self, query, params=None, page_size=None, template=None):
+        self.calls.append((template, params))
+        return iter([dict(row) for row in self.rows.get(template, [])])
+
+
+class FakeHandler(organization.handler):
+    """Organization handler that records the response instead of using a socket"""
+
+    def __init__(self, path, headers=None):
+        self.path = path
+        self.headers = headers or {}
+        self.client_address = ('127.0.0.1', 50000)
+        self.request_version = 'HTTP/1.0'
+        self.wfile = io.BytesIO()
+        self.status = None
+        self.sent_headers = {}
+
+    def send_response(self, status):
+        self.status = status
+
+    def send_header(self, key, value):
+        self.sent_headers[key] = value
+
+    def end_headers(self):
+        pass
+
+    def json(self):
+        return json.loads(self.wfile.getvalue())
+
+
+class TestOrganizationProfile:
+    """Test cases for GET /api/organization/{filer_id}"""
+
+    def setup_method(self):
+        """Fresh response cache, data version and rate limits for each test"""
+        cache._response_cache = ResponseCache()
+        os.environ['DATA_VERSION'] = '1'
+        rate_limit.request_counts.clear()
+
+    def teardown_method(self):
+        """Restore the shared cache state"""
+        os.environ.pop('DATA_VERSION', None)
+        cache._response_cache = None
+
+    def get(self, path, monkeypatch, rows=PROFILE_ROWS, headers=None):
+        """Run one request against a stand-in backend"""
+        backend = StandInBackend(rows)
+        monkeypatch.setattr(organization, 'get_query_backend', lambda: backend)
+        handler = FakeHandler(path, headers)
+        handler.do_GET()
+        return handler, backend
+
+    def test_runs_all_sections_in_one_request(self, monkeypatch):
+        """Test the four sub-queries run once each, keyed by filer ID"""
+        handler, backend = self.get('/api/organization?filer_id=F1', monkeypatch)
+
+        assert handler.status == 200
+        assert sorted(template for template, _ in backend.calls) == sorted(PROFILE_ROWS)
+        assert all(params[0].value == 'F1' for _, params in backend.calls)
+
+        data = handler.json()['data']
+        assert data['organization_name'] == 'ACME CORP'
+        assert data['top_firms'] == PROFILE_ROWS['organization.top_firms']
+        assert data['related_organizations'] == PROFILE_ROWS['organization.related']
+
+    def test_summary(self, monkeypatch):
+        """Test the summary is derived from the filings and yearly payments"""
+        handler, _ = self.get('/api/organization?filer_id=F1', monkeypatch)
+
+        assert handler.json()['data']['summary'] == {
+            'filing_count': 2,
+            'first_filing_date': '2022-03-31',
+            'latest_filing_date': '2024-06-30',
+            'total_payments': 3,
+            'total_amount': 1500.75,
+            'active_years': 3
+        }
+
+    def test_path_segment(self, monkeypatch):
+        """Test the filer ID is read from the path when not rewritten to a query"""
+        handler, backend = self.get('/api/organization/C00123', monkeypatch)
+
+        assert handler.status == 200
+        assert backend.calls[0][1][0].value == 'C00123'
+
+    def test_cached_and_revalidated(self, monkeypatch):
+        """Test repeat requests hit the cache and a matching ETag skips all queries"""
+        first, _ = self.get('/api/organization?filer_id=F1', monkeypatch)
+        second, backend = self.get('/api/organization?filer_id=F1', monkeypatch)
+        assert second.sent_headers['X-Cache'] == 'HIT'
+        assert backend.calls == []
+
+        etag = first.sent_headers['ETag']
+        revalidated, backend = self.get(
+            '/api/organization?filer_id=F1', monkeypatch, headers={'If-None-Match': etag}
+        )
+        assert revalidated.status == 304
+        assert backend.calls == []
+
+    @pytest.mark.parametrize('path', [
+        '/api/organization',
+        '/api/organization?filer_id=1%27%20OR%201%3D1',
+        '/api/organization?filer_id=' + 'X' * 21
+    ])
+    def test_invalid_filer_id(self, path, monkeypatch):
+        """Test missing or malformed filer IDs are rejected before any query"""
+        handler, backend = self.get(path, monkeypatch)
+
+        assert handler.status == 400
+        assert handler.json()['error']['type'] == 'ValidationError'
+        assert backend.calls == []
+
+    def test_unknown_filer_id(self, monkeypatch):
+        """Test a filer with no filings or payments is a 404"""
+        handler, _ = self.get('/api/organization?filer_id=F404', monkeypatch, rows={})
+
+        assert handler.status == 404
+        assert handler.json()['error']['type'] == 'NotFoundError'
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,403 @@
+"""
+Tests for the pluggable query backend and the DuckDB/Parquet implementation
+"""
+
+import pytest
+import sys
+import os
+import threading
+import time
+from datetime import date
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import query_backend
+from utils.query_backend import QueryBackend, get_query_backend, scalar_param, array_param
+from utils import duckdb_backend
+from utils.bigquery_client import BigQueryClient
+from utils.duckdb_backend import translate_sql, duckdb_params, snapshot_tables
+
+
+class StandInBackend(QueryBackend):
+    """Backend answering every query with its template name"""
+
+    name = 'stand-in'
+
+    def iter_query(self, query, params=None, page_size=None, template=None):
+        yield {'template': template, 'test': 1}
+
+
+class TestQueryParameters:
+    """Test backend-neutral query parameters"""
+
+    def test_scalar_param(self):
+        """Test a scalar parameter keeps its name, type and value"""
+        param = scalar_param('from_year', 'INT64', 2020)
+        assert (param.name, param.type_, param.value, param.array) == ('from_year', 'INT64', 2020, False)
+
+    def test_array_param(self):
+        """Test an array parameter copies its values into a list"""
+        param = array_param('candidate_names', 'STRING', ('ACME', 'BETA'))
+        assert param.value == ['ACME', 'BETA']
+        assert param.array is True
+
+    def test_repr_identifies_value(self):
+        """Test parameters with different values repr differently (cache and coalescing keys)"""
+        assert repr(scalar_param('limit', 'INT64', 10)) != repr(scalar_param('limit', 'INT64', 20))
+
+
+class TestQueryBackend:
+    """Test the shared backend behaviour"""
+
+    def test_execute_queries_tags_templates(self):
+        """Test each concurrent query runs as '<template>.<name>'"""
+        results = StandInBackend().execute_queries(
+            {'summary': 'SELECT 1', 'payments': ('SELECT 2', [])}, template='database_stats'
+        )
+
+        assert results['summary'][0]['template'] == 'database_stats.summary'
+        assert results['payments'][0]['template'] == 'database_stats.payments'
+
+    def test_test_connection(self):
+        """Test the connectivity check runs a trivial query"""
+        assert StandInBackend().test_connection() is True
+
+    def test_unknown_backend(self):
+        """Test an unknown backend name is rejected"""
+        with pytest.raises(ValueError):
+            get_query_backend('postgres')
+
+
+@pytest.mark.parametrize('backend_class, init_method', [
+    (BigQueryClient, '_initialize_client'),
+    (duckdb_backend.DuckDBBackend, '_initialize')
+])
+class TestSingletonInit:
+    """Test the backend singletons on a cold instance"""
+
+    def test_parallel_callers_wait_for_init(self, backend_class, init_method, monkeypatch):
+        """Test concurrent first calls share one fully initialized instance"""
+        calls = []
+
+        def slow_init(self, *args):
+            calls.append(True)
+            time.sleep(0.05)
+            self.ready = True
+
+        monkeypatch.setattr(backend_class, '_instance', None)
+        monkeypatch.setattr(backend_class, init_method, slow_init)
+
+        barrier = threading.Barrier(4, timeout=5)
+        instances = []
+
+        def first_call():
+            barrier.wait()
+            instance = backend_class()
+            instances.append((instance, getattr(instance, 'ready', False)))
+
+        threads = [threading.Thread(target=first_call) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert len({id(instance) for instance, _ in instances}) == 1
+        assert all(ready for _, ready in instances)  # none got a half-built instance
+
+    def test_failed_init_is_retried(self, backend_class, init_method, monkeypatch):
+        """Test a failed init publishes no instance, so the next call tries again"""
+        def failing_init(self, *args):
+            raise ValueError("No credentials found")
+
+        monkeypatch.setattr(backend_class, '_instance', None)
+        monkeypatch.setattr(backend_class, init_method, failing_init)
+
+        with pytest.raises(ValueError):
+            backend_class()
+        assert backend_class._instance is None
+
+
+class TestTranslateSql:
+    """Test BigQuery to DuckDB SQL translation"""
+
+    def test_table_references_become_views(self):
+        """Test backticked table ids are reduced to the table name"""
+        sql = "SELECT * FROM `ca-lobby.ca_lobby.lpay_latest` p JOIN `ca-lobby.ca_lobby.spending_cube` c"
+        assert translate_sql(sql) == 'SELECT * FROM "lpay_latest" p JOIN "spending_cube" c'
+
+    def test_named_parameters(self):
+        """Test @params become $params"""
+        assert translate_sql("WHERE year >= @from_year LIMIT @limit") == "WHERE year >= $from_year LIMIT $limit"
+
+    def test_in_unnest(self):
+        """Test IN UNNEST(array) becomes a list subquery"""
+        sql = translate_sql("v.organization_name IN UNNEST(@candidate_names)")
+        assert sql == "v.organization_name IN (SELECT UNNEST($candidate_names))"
+
+    def test_format_date(self):
+        """Test FORMAT_DATE swaps to strftime with nested arguments intact"""
+        sql = translate_sql("FORMAT_DATE('%Y-%m-%d', MIN(RPT_DATE_DATE)) as first_filing_date")
+        assert sql == "strftime(MIN(RPT_DATE_DATE), '%Y-%m-%d') as first_filing_date"
+
+    def test_types_and_functions(self):
+        """Test BigQuery type names, SAFE_CAST and CURRENT_DATE()"""
+        sql = translate_sql(
+            "CAST(ROUND(x) AS INT64), CAST(y AS FLOAT64), CAST(z AS STRING), "
+            "SAFE_CAST(w AS INT64), EXTRACT(YEAR FROM CURRENT_DATE())"
+        )
+        assert sql == (
+            "CAST(ROUND(x) AS BIGINT), CAST(y AS DOUBLE), CAST(z AS VARCHAR), "
+            "TRY_CAST(w AS BIGINT), EXTRACT(YEAR FROM CURRENT_DATE)"
+        )
+
+    def test_only_referenced_params_are_passed(self):
+        """Test parameters the statement does not use are dropped"""
+        sql = translate_sql("SELECT * FROM t WHERE year >= @from_year")
+        params = [scalar_param('from_year', 'INT64', 2020), scalar_param('to_year', 'INT64', None)]
+
+        assert duckdb_params(sql, params) == {'from_year': 2020}
+        assert duckdb_params(sql, None) == {}
+
+
+class TestSnapshotTables:
+    """Test snapshot directory discovery"""
+
+    def test_files_and_directories(self, tmp_path):
+        """Test single files and directories of Parquet parts are both tables"""
+        (tmp_path / 'spending_cube.parquet').write_bytes(b'')
+        (tmp_path / 'lpay_latest').mkdir()
+        (tmp_path / 'README.txt').write_text('not a table')
+
+        tables = snapshot_tables(str(tmp_path))
+
+        assert tables == {
+            'lpay_latest': os.path.join(str(tmp_path), 'lpay_latest', '*.parquet'),
+            'spending_cube': os.path.join(str(tmp_path), 'spending_cube.parquet')
+        }
+
+
+# Snapshot tables for the DuckDB tests: table name -> SELECT producing its rows
+SNAPSHOT_ROWS = {
+    'spending_cube': """
+        SELECT * FROM (VALUES
+            (2023, 'city', 'CITY OF X', 'FIRM A', 500.0::DOUBLE),
+            (2024, 'county', 'COUNTY OF Y', 'FIRM B', 700.0::DOUBLE)
+        ) t(year, govt_type, employer_name, payee_name, total_amount)
+    """,
+    'cvr_lobby_disclosure_latest': """
+        SELECT * FROM (VALUES
+            (100, 'F1', 'ACME CORP', DATE '2023-03-31', DATE '2023-01-01', DATE '2023-03-31'),
+            (101, 'F9', 'ACME HOLDINGS', DATE '2024-06-30', DATE '2024-04-01', DATE '2024-06-30')
+        ) t(FILING_ID, FILER_ID, FILER_NAML, RPT_DATE_DATE, FROM_DATE_DATE, THRU_DATE_DATE)
+    """,
+    'cvr_lobby_disclosure_cd': """
+        SELECT * FROM (VALUES
+            ('F1', DATE '2024-06-30'),
+            ('F1', DATE '2024-06-30'),
+            ('F9', DATE '2023-03-31'),
+            ('F9', DATE '2023-06-30'),
+            ('F0', DATE '1999-12-31')
+        ) t(FILER_ID, RPT_DATE_DATE)
+    """,
+    'cvr_lobby_disclosure_cd_partitioned': """
+        SELECT * FROM (VALUES
+            (10, 'F1', 'ACME CORP', DATE '2024-06-30', DATE '2024-04-01'),
+            (11, 'F9', 'ACME HOLDINGS', DATE '2023-03-31', DATE '2023-01-01'),
+            (12, 'F9', 'ACME HOLDINGS', DATE '2023-06-30', DATE '2023-04-01')
+        ) t(FILING_ID, FILER_ID, FILER_NAML, RPT_DATE_DATE, FROM_DATE_DATE)
+    """,
+    'v_organization_summary': """
+        SELECT * FROM (VALUES
+            ('ACME CORP', 1500.0::DOUBLE, 3, DATE '2022-01-15', DATE '2024-06-30', 4, 2),
+            ('CITY OF SANTA MONICA', 900.0::DOUBLE, 2, DATE '2021-03-01', DATE '2023-09-30', 2, 1),
+            ('COUNTY OF MARIN', 0.0::DOUBLE, 0, DATE '2020-05-01', DATE '2020-05-01', 1, 0)
+        ) t(organization_name, total_spending, total_payment_line_items, first_activity_date,
+            last_activity_date, total_filings, total_lobbying_firms)
+    """,
+    'org_name_canonical': """
+        SELECT * FROM (VALUES ('ACME CORP', 'F1'), ('CITY OF SANTA MONICA', 'F2')) t(raw_name, filer_id)
+    """,
+    'org_govt_type': """
+        SELECT * FROM (VALUES
+            ('ACME CORP', 'other'), ('CITY OF SANTA MONICA', 'city'), ('COUNTY OF MARIN', 'county')
+        ) t(organization_name, govt_type)
+    """,
+    'lpay_latest': """
+        SELECT * FROM (VALUES
+            ('F1', 'FIRM A', 500.0::DOUBLE, DATE '2023-03-31'),
+            ('F9', 'FIRM A', 700.0::DOUBLE, DATE '2024-06-30'),
+            ('F1', 'FIRM B', 0.0::DOUBLE, DATE '2023-03-31'),
+            ('F2', 'FIRM B', NULL::DOUBLE, DATE '2023-09-30')
+        ) t(FILER_ID, PAYEE_NAML, PER_TOTAL, RPT_DATE_DATE)
+    """,
+    'firm_clients': """
+        SELECT * FROM (VALUES
+            ('FIRM A', 'F1', 'ACME CORP', 500.0::DOUBLE, 1),
+            ('FIRM A', 'F9', 'ACME HOLDINGS', 700.0::DOUBLE, 1),
+            ('FIRM B', 'F1', 'ACME CORP', 0.0::DOUBLE, 1),
+            ('FIRM B', 'F2', 'CITY OF SANTA MONICA', 50.0::DOUBLE, 1),
+            ('FIRM C', 'F3', 'COUNTY OF MARIN', 100.0::DOUBLE, 1)
+        ) t(PAYEE_NAML, FILER_ID, FILER_NAML, total_amount, payment_count)
+    """,
+}
+
+
+class StandInNameIndex:
+    """Name index resolving every term to fixed candidates"""
+
+    def __init__(self, names, filer_ids):
+        self.names = names
+        self.filer_ids = filer_ids
+
+    def lookup(self, term):
+        return self.names, self.filer_ids
+
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    """DuckDB backend over a small snapshot of every table the templates below read"""
+    duckdb = pytest.importorskip('duckdb')
+
+    connection = duckdb.connect()
+    for table, rows in SNAPSHOT_ROWS.items():
+        connection.execute(f"COPY ({rows}) TO '{tmp_path / table}.parquet' (FORMAT PARQUET)")
+    connection.close()
+
+    monkeypatch.setattr(duckdb_backend, 'LOCAL_SNAPSHOT_DIR', str(tmp_path))
+    monkeypatch.setattr(duckdb_backend.DuckDBBackend, '_instance', None)
+    monkeypatch.setattr(query_backend, 'QUERY_BACKEND', 'duckdb')
+    return get_query_backend()
+
+
+class TestDuckDBBackend:
+    """Test the API's templates against a local Parquet snapshot"""
+
+    def test_runs_analytics_template(self, backend):
+        """Test an endpoint template runs unchanged through the local backend"""
+        import analytics
+
+        handler = analytics.handler.__new__(analytics.handler)
+        assert handler._get_top_recipients('county', None, None) == [
+            {'recipient_name': 'COUNTY OF Y', 'total_amount': 700}
+        ]
+
+    def test_parameters_and_dates(self, backend):
+        """Test named parameters, IN UNNEST, SAFE_CAST and FORMAT_DATE through a real query"""
+        rows = backend.execute_query(
+            """
+            SELECT FORMAT_DATE('%Y-%m-%d', RPT_DATE_DATE) as filing_date,
+                   SAFE_CAST(FILER_NAML AS INT64) as not_a_number
+            FROM `ca-lobby.ca_lobby.cvr_lobby_disclosure_latest`
+            WHERE FILER_ID IN UNNEST(@filer_ids) AND FILING_ID > @min_id
+            """,
+            [array_param('filer_ids', 'STRING', ['F1']), scalar_param('min_id', 'INT64', 1)]
+        )
+
+        assert rows == [{'filing_date': '2023-03-31', 'not_a_number': None}]
+
+    def test_connection_check(self, backend):
+        """Test the health probe's connectivity check passes locally"""
+        assert backend.test_connection() is True
+
+    def test_database_stats_templates(self, backend):
+        """Test all six database_stats queries (CURRENT_DATE, casts, the govt join)"""
+        import database_stats
+
+        handler = database_stats.handler.__new__(database_stats.handler)
+        stats = handler._get_database_statistics()
+
+        assert stats['summary'] == {
+            'total_organizations': 2,
+            'total_filings': 4,
+            'earliest_filing': date(2023, 3, 31),
+            'latest_filing': date(2024, 6, 30),
+            'years_covered': 2
+        }
+        assert stats['payments'] == {'total_payments': 2, 'total_amount': 1200.0, 'avg_payment': 600.0}
+        assert stats['organization_view'] == {
+            'total_orgs_in_view': 3,
+            'orgs_with_spending': 2,
+            'total_spending_all': 2400.0,
+            'avg_spending_per_org': 800.0,
+            'max_org_spending': 1500.0,
+            'total_payment_items': 5
+        }
+        assert stats['yearly_breakdown'] == [
+            {'year': 2024, 'orgs_count': 1, 'filings_count': 1},
+            {'year': 2023, 'orgs_count': 1, 'filings_count': 1}
+        ]
+        assert sorted(stats['government_types'], key=lambda row: row['govt_type']) == [
+            {'govt_type': 'city', 'org_count': 1, 'total_spending': 900.0},
+            {'govt_type': 'other', 'org_count': 1, 'total_spending': 1500.0}
+        ]
+        assert stats['top_organizations'] == [
+            {'organization_name': 'ACME CORP', 'total_spending': 1500,
+             'total_payment_line_items': 3, 'last_active_year': 2024},
+            {'organization_name': 'CITY OF SANTA MONICA', 'total_spending': 900,
+             'total_payment_line_items': 2, 'last_active_year': 2023}
+        ]
+
+    def test_organization_profile_templates(self, backend):
+        """Test the profile queries, with related organizations from firm_clients"""
+        import organization
+
+        handler = organization.handler.__new__(organization.handler)
+        profile = handler._get_organization_profile('F1')
+
+        assert profile['organization_name'] == 'ACME CORP'
+        assert profile['filings'][0]['period'] == 'Q1 2023'
+        assert profile['payments_by_year'] == [{'year': 2023, 'total_amount': 500.0, 'payment_count': 1}]
+        assert [firm['firm_name'] for firm in profile['top_firms']] == ['FIRM A']
+        assert profile['related_organizations'] == [
+            {'filer_id': 'F9', 'organization_name': 'ACME HOLDINGS', 'shared_firms': 1,
+             'shared_firm_spending': 700.0},
+            {'filer_id': 'F2', 'organization_name': 'CITY OF SANTA MONICA', 'shared_firms': 1,
+             'shared_firm_spending': 50.0}
+        ]
+
+    @pytest.mark.parametrize('index', [
+        None,
+        StandInNameIndex(['ACME CORP', 'ACME HOLDINGS'], ['F1', 'F9'])
+    ], ids=['like', 'name-index'])
+    def test_search_template(self, backend, index, monkeypatch):
+        """Test the search query, with LIKE filters and with IN UNNEST candidates"""
+        import search
+
+        monkeypatch.setattr(search, 'get_name_index', lambda: index)
+        handler = search.handler.__new__(search.handler)
+        result = handler._run_search('acme', page=1, limit=10)
+
+        assert result['total_count'] == 2
+        assert [(row['filer_id'], row['organization_name'], row['latest_filing_date'])
+                for row in result['results']] == [
+            ('F1', 'ACME CORP', '2024-06-30'),
+            ('F9', 'ACME HOLDINGS', '2023-06-30')
+        ]
+
+    def test_search_without_term(self, backend, monkeypatch):
+        """Test an empty term binds @search_term as NULL and matches every organization"""
+        import search
+
+        monkeypatch.setattr(search, 'get_name_index', lambda: None)
+        handler = search.handler.__new__(search.handler)
+        result = handler._run_search('', page=1, limit=10)
+
+        assert result['total_count'] == 4
+        assert {row['filer_id'] for row in result['results']} == {'F1', 'F2', 'F9', ''}
+
+    def test_search_count_past_the_end(self, backend, monkeypatch):
+        """Test the fallback count query runs and counts the deduplicated set"""
+        import search
+
+        monkeypatch.setattr(search, 'get_name_index', lambda: None)
+        handler = search.handler.__new__(search.handler)
+        result = handler._run_search('acme', page=3, limit=1)
+
+        assert result['results'] == []
+        assert result['total_count'] == 2
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,227 @@
+"""
+Tests for query byte budgets and the dry-run cost gate
+"""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import query_budget
+from utils.query_budget import (
+    QueryBudgetExceeded, budget_for, job_labels, check_query_budget, clear_estimates,
+    billing_limit_error, GIB
+)
+from utils.bigquery_client import BigQueryClient
+from utils.query_backend import scalar_param
+
+
+class BillingLimitError(Exception):
+    """Stand-in for the BadRequest BigQuery raises at maximum_bytes_billed"""
+
+    def __init__(self, message, reason='bytesBilledLimitExceeded'):
+        super().__init__(message)
+        self.errors = [{'reason': reason, 'message': message}]
+
+
+class StandInJob:
+    """Query job whose result() raises the given error"""
+
+    def __init__(self, error):
+        self.error = error
+
+    def result(self, page_size=None):
+        raise self.error
+
+
+class StandInClient:
+    """Local stand-in for the BigQuery client's dry run: fixed estimates, no network"""
+
+    def __init__(self, estimates):
+        self.estimates = estimates  # SQL text -> estimated bytes
+        self.dry_runs = 0
+
+    def dry_run(self, query, params=None, template=None):
+        self.dry_runs += 1
+        return self.estimates[query]
+
+    def check(self, query, params=None, template=None):
+        """Run the budget gate the way BigQueryClient._submit does"""
+        return check_query_budget(query, params, template, lambda: self.dry_run(query, params, template))
+
+
+class TestBudgetFor:
+    """Test per-template byte budgets"""
+
+    def test_most_specific_entry_wins(self, monkeypatch):
+        """Test a template's own entry takes precedence over its prefix"""
+        monkeypatch.setitem(query_budget.TEMPLATE_BYTE_BUDGETS, 'search.organization', 5)
+
+        assert budget_for('search.organization') == 5
+        assert budget_for('search.results') == query_budget.TEMPLATE_BYTE_BUDGETS['search']
+
+    def test_nested_template_uses_prefix(self):
+        """Test 'search.results.count' falls back to the 'search' budget"""
+        assert budget_for('search.results.count') == query_budget.TEMPLATE_BYTE_BUDGETS['search']
+
+    def test_untagged_query_uses_default(self):
+        """Test queries without a template get the default budget"""
+        assert budget_for(None) == query_budget.DEFAULT_MAX_BYTES_BILLED
+        assert budget_for('unknown.template') == query_budget.DEFAULT_MAX_BYTES_BILLED
+
+    def test_observed_budget_wins(self, monkeypatch):
+        """Test a budget derived from observed jobs overrides the fallback table"""
+        monkeypatch.setattr(query_budget, 'OBSERVED_BYTE_BUDGETS', {'search_results_count': 7 * GIB})
+
+        assert budget_for('search.results.count') == 7 * GIB
+        assert budget_for('search.results') == query_budget.TEMPLATE_BYTE_BUDGETS['search']
+
+    @pytest.mark.parametrize('raw, expected', [
+        ('{"search_results": 1048576}', {'search_results': 1048576}),
+        ('not json', {}),
+        ('[1, 2]', {}),
+        ('', {}),
+    ])
+    def test_observed_budgets_from_environment(self, raw, expected, monkeypatch):
+        """Test QUERY_BYTE_BUDGETS is parsed, and ignored when malformed"""
+        monkeypatch.setenv('QUERY_BYTE_BUDGETS', raw)
+
+        assert query_budget._load_observed_budgets() == expected
+
+
+class TestJobLabels:
+    """Test BigQuery job labels"""
+
+    def test_labels_per_endpoint_and_template(self):
+        """Test labels name the endpoint and the sanitized template"""
+        labels = job_labels('analytics.top_city_recipients')
+
+        assert labels['app'] == query_budget.JOB_LABEL_APP
+        assert labels['endpoint'] == 'analytics'
+        assert labels['query_template'] == 'analytics_top_city_recipients'
+
+    def test_untagged_query_has_app_label_only(self):
+        """Test untagged queries are still attributable to the API"""
+        assert job_labels(None) == {'app': query_budget.JOB_LABEL_APP}
+
+
+class TestDryRunGate:
+    """Test the dry-run cost gate"""
+
+    def setup_method(self):
+        """Clear cached estimates before each test"""
+        clear_estimates()
+
+    def test_disabled_by_default(self, monkeypatch):
+        """Test no dry run is issued while the gate is off"""
+        monkeypatch.setattr(query_budget, 'DRY_RUN_ENABLED', False)
+        client = StandInClient({'SELECT 1': 1})
+
+        assert client.check('SELECT 1', template='health') is None
+        assert client.dry_runs == 0
+
+    def test_allows_query_within_budget(self, monkeypatch):
+        """Test a query estimated under its budget passes with its estimate"""
+        monkeypatch.setattr(query_budget, 'DRY_RUN_ENABLED', True)
+        client = StandInClient({'SELECT small': GIB // 2})
+
+        assert client.check('SELECT small', template='search.results') == GIB // 2
+
+    def test_rejects_query_over_budget(self, monkeypatch):
+        """Test a query estimated over its budget raises before running"""
+        monkeypatch.setattr(query_budget, 'DRY_RUN_ENABLED', True)
+        client = StandInClient({'SELECT everything': 50 * GIB})
+
+        with pytest.raises(QueryBudgetExceeded) as excinfo:
+            client.check('SELECT everything', template='search.results')
+
+        assert excinfo.value.template == 'search.results'
+        assert excinfo.value.budget == budget_for('search.results')
+
+    def test_estimates_are_cached(self, monkeypatch):
+        """Test repeated identical queries reuse the cached estimate"""
+        monkeypatch.setattr(query_budget, 'DRY_RUN_ENABLED', True)
+        client = StandInClient({'SELECT 1': 10})
+
+        for _ in range(3):
+            client.check('SELECT 1', params=['a'], template='health')
+
+        assert client.dry_runs == 1
+
+    def test_parameters_are_part_of_the_key(self, monkeypatch):
+        """Test different parameter values are estimated separately"""
+        monkeypatch.setattr(query_budget, 'DRY_RUN_ENABLED', True)
+        client = StandInClient({'SELECT 1': 10})
+
+        client.check('SELECT 1', params=['a'], template='health')
+        client.check('SELECT 1', params=['b'], template='health')
+
+        assert client.dry_runs == 2
+
+    def test_expired_estimates_are_refreshed(self, monkeypatch):
+        """Test an estimate older than the TTL is dry-run again"""
+        monkeypatch.setattr(query_budget, 'DRY_RUN_ENABLED', True)
+        monkeypatch.setattr(query_budget, 'DRY_RUN_CACHE_TTL', -1)
+        client = StandInClient({'SELECT 1': 10})
+
+        client.check('SELECT 1', template='health')
+        client.check('SELECT 1', template='health')
+
+        assert client.dry_runs == 2
+
+
+class TestBillingLimit:
+    """Test BigQuery's bytes-billed limit surfaces as QueryBudgetExceeded"""
+
+    def test_maps_billing_limit_error(self):
+        """Test the reason is recognized and the required bytes are kept"""
+        error = BillingLimitError(
+            "Query exceeded limit for bytes billed: 1073741824. 2147483648 or higher required."
+        )
+
+        budget_error = billing_limit_error('analytics.summary', error)
+
+        assert isinstance(budget_error, QueryBudgetExceeded)
+        assert budget_error.estimated_bytes == 2147483648
+        assert budget_error.budget == budget_for('analytics.summary')
+
+    def test_other_errors_are_not_mapped(self):
+        """Test unrelated failures keep their own type"""
+        assert billing_limit_error('analytics', BillingLimitError('boom', reason='invalidQuery')) is None
+        assert billing_limit_error('analytics', ValueError('boom')) is None
+
+    def test_iter_query_raises_query_budget_exceeded(self, monkeypatch):
+        """Test a job stopped at maximum_bytes_billed raises the typed error"""
+        monkeypatch.setattr(query_budget, 'DRY_RUN_ENABLED', False)
+        client = object.__new__(BigQueryClient)
+        client._job_config = lambda params=None, template=None, dry_run=False: None
+        client._client = type('StandInBigQuery', (), {
+            'query': lambda self, query, job_config=None: StandInJob(BillingLimitError('over'))
+        })()
+
+        with pytest.raises(QueryBudgetExceeded) as excinfo:
+            list(client.iter_query('SELECT 1', template='search.results'))
+
+        assert excinfo.value.template == 'search.results'
+
+
+class TestJobConfig:
+    """Test the job config BigQueryClient submits"""
+
+    def test_sets_budget_and_labels(self):
+        """Test maximum_bytes_billed, labels and parameters come from the template"""
+        pytest.importorskip('google.cloud.bigquery')
+        client = object.__new__(BigQueryClient)
+
+        job_config = client._job_config([scalar_param('q', 'STRING', 'acme')], 'search.results')
+
+        assert job_config.maximum_bytes_billed == budget_for('search.results')
+        assert job_config.labels == job_labels('search.results')
+        assert job_config.query_parameters[0].name == 'q'
+        assert not job_config.dry_run
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -5,11 +5,14 @@ Tests for rate limiting utility
 import pytest
 import sys
 import os
+import io
+import json
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.rate_limit import check_rate_limit, request_counts, RATE_LIMIT
+from utils import rate_limit
+from utils.rate_limit import check_rate_limit, request_counts, RATE_LIMIT, WINDOW
 
 
 class TestRateLimit:
@@ -92,5 +95,232 @@ class TestRateLimitHeaders:
         assert int(headers['X-RateLimit-Remaining']) == RATE_LIMIT - 5
 
 
+class TestSlidingWindow:
+    """Test cases for the sliding window counter"""
+
+    def setup_method(self):
+        """Clear rate limit state before each test"""
+        request_counts.clear()
+
+    def set_time(self, monkeypatch, now):
+        monkeypatch.setattr(rate_limit.time, 'time', lambda: now)
+
+    def test_previous_window_weighted_by_overlap(self, monkeypatch):
+        """Test the previous window's count decays as the window slides"""
+        ip = '10.0.0.1'
+        start = 1_000_000 * WINDOW
+
+        self.set_time(monkeypatch, start)
+        for _ in range(RATE_LIMIT):
+            check_rate_limit(ip)
+
+        # At the start of the next window the previous count applies in full
+        self.set_time(monkeypatch, start + WINDOW)
+        assert check_rate_limit(ip) == False
+
+        # Halfway through, half of the previous window has slid out
+        self.set_time(monkeypatch, start + WINDOW * 1.5)
+        allowed = sum(check_rate_limit(ip) for _ in range(RATE_LIMIT))
+        assert allowed == RATE_LIMIT // 2
+
+    def test_resets_after_two_windows(self, monkeypatch):
+        """Test an IP idle for two windows starts from zero"""
+        ip = '10.0.0.2'
+        start = 1_000_000 * WINDOW
+
+        self.set_time(monkeypatch, start)
+        for _ in range(RATE_LIMIT):
+            check_rate_limit(ip)
+
+        self.set_time(monkeypatch, start + 2 * WINDOW)
+        assert check_rate_limit(ip) == True
+
+
+class TestBoundedState:
+    """Test cases for bounded per-IP state"""
+
+    def setup_method(self):
+        """Clear rate limit state before each test"""
+        request_counts.clear()
+
+    def test_hard_cap_on_tracked_ips(self, monkeypatch):
+        """Test the least recently seen IPs are dropped beyond the cap"""
+        monkeypatch.setattr(rate_limit, 'MAX_TRACKED_KEYS', 100)
+
+        for i in range(250):
+            check_rate_limit(f'10.1.{i // 256}.{i % 256}')
+
+        assert len(request_counts) == 100
+        assert '10.1.0.0' not in request_counts
+        assert '10.1.0.249' in request_counts
+
+    def test_recently_seen_ip_survives_eviction(self, monkeypatch):
+        """Test a repeat request moves an IP to the most recently seen end"""
+        monkeypatch.setattr(rate_limit, 'MAX_TRACKED_KEYS', 10)
+
+        check_rate_limit('first')
+        for i in range(9):
+            check_rate_limit(f'ip-{i}')
+        check_rate_limit('first')
+        check_rate_limit('ip-new')
+
+        assert 'first' in request_counts
+        assert 'ip-0' not in request_counts
+
+    def test_idle_ips_are_evicted(self, monkeypatch):
+        """Test IPs idle for two windows are dropped as new IPs arrive"""
+        start = 1_000_000 * WINDOW
+        monkeypatch.setattr(rate_limit.time, 'time', lambda: start)
+        for i in range(5):
+            check_rate_limit(f'idle-{i}')
+
+        monkeypatch.setattr(rate_limit.time, 'time', lambda: start + 2 * WINDOW)
+        for i in range(5):
+            check_rate_limit(f'active-{i}')
+
+        assert not any(ip.startswith('idle-') for ip in request_counts)
+
+    def test_headers_do_not_track_unknown_ip(self):
+        """Test reading headers for an unseen IP creates no state"""
+        from utils.rate_limit import get_rate_limit_headers
+
+        headers = get_rate_limit_headers('203.0.113.9')
+
+        assert headers['X-RateLimit-Remaining'] == str(RATE_LIMIT)
+        assert len(request_counts) == 0
+
+    def test_default_cap_bounds_state_at_100k_ips(self):
+        """Test state stays within MAX_TRACKED_KEYS and the oldest IPs go first
+
+        Per-call timing lives in bench_rate_limit.py.
+        """
+        overflow = 1000
+        for i in range(rate_limit.MAX_TRACKED_KEYS + overflow):
+            check_rate_limit(f'172.{i // 65536}.{i // 256 % 256}.{i % 256}')
+
+        assert len(request_counts) <= rate_limit.MAX_TRACKED_KEYS
+        assert '172.0.0.0' not in request_counts
+        assert f'172.0.{(overflow - 1) // 256}.{(overflow - 1) % 256}' not in request_counts
+        assert f'172.0.{overflow // 256}.{overflow % 256}' in request_counts
+
+
+class FakeHandler:
+    """Minimal stand-in for BaseHTTPRequestHandler that records the response"""
+
+    def __init__(self, forwarded_for=None, client_address=('127.0.0.1', 50000)):
+        self.headers = {'X-Forwarded-For': forwarded_for} if forwarded_for else {}
+        self.client_address = client_address
+        self.wfile = io.BytesIO()
+        self.status = None
+        self.sent_headers = {}
+
+    def send_response(self, status):
+        self.status = status
+
+    def send_header(self, key, value):
+        self.sent_headers[key] = value
+
+    def end_headers(self):
+        pass
+
+
+class TestCostWeights:
+    """Test cases for cost-weighted rate limiting"""
+
+    def setup_method(self):
+        """Clear rate limit state and observed template costs before each test"""
+        request_counts.clear()
+        rate_limit.template_bytes.clear()
+
+    def test_costly_requests_drain_budget_faster(self):
+        """Test a request's cost is charged against the limit"""
+        ip = '10.2.0.1'
+
+        for _ in range(RATE_LIMIT // 4):
+            assert check_rate_limit(ip, cost=4) == True
+
+        assert check_rate_limit(ip, cost=4) == False
+        assert check_rate_limit('10.2.0.2', cost=4) == True
+
+    def test_static_weight_before_any_query(self):
+        """Test endpoints are charged their static weight on a cold start"""
+        assert rate_limit.request_cost('health') == rate_limit.ENDPOINT_COSTS['health']
+        assert rate_limit.request_cost('search', 'results') == rate_limit.ENDPOINT_COSTS['search']
+        assert rate_limit.request_cost('unknown') == 1
+
+    def test_scanned_bytes_raise_cost(self):
+        """Test bytes scanned by an endpoint's templates add to its cost"""
+        unit = rate_limit.BYTES_PER_COST_UNIT
+        rate_limit.record_query_bytes('database_stats.payments', 2 * unit)
+        rate_limit.record_query_bytes('database_stats.yearly', unit)
+        rate_limit.record_query_bytes('database_stats_other', 100 * unit)
+
+        expected = rate_limit.ENDPOINT_COSTS['database_stats'] + 3
+        assert rate_limit.request_cost('database_stats') == pytest.approx(expected)
+
+    def test_query_type_only_counts_its_templates(self):
+        """Test a query type is charged for its own templates only"""
+        unit = rate_limit.BYTES_PER_COST_UNIT
+        rate_limit.record_query_bytes('analytics.summary', unit)
+        rate_limit.record_query_bytes('analytics.spending', 0)
+
+        assert rate_limit.request_cost('analytics', 'summary') == pytest.approx(2)
+        assert rate_limit.request_cost('analytics', 'spending') == pytest.approx(1)
+
+    def test_bytes_are_a_moving_average(self):
+        """Test repeated runs move the estimate gradually"""
+        rate_limit.record_query_bytes('search.results', 1000)
+        rate_limit.record_query_bytes('search.results', 2000)
+
+        alpha = rate_limit.BYTES_EWMA_ALPHA
+        assert rate_limit.template_bytes['search.results'] == pytest.approx(1000 + alpha * 1000)
+
+    def test_missing_bytes_are_ignored(self):
+        """Test jobs without byte statistics or a template are not recorded"""
+        rate_limit.record_query_bytes('search.results', None)
+        rate_limit.record_query_bytes(None, 1000)
+
+        assert rate_limit.template_bytes == {}
+
+    def test_cost_is_capped(self):
+        """Test one request never costs more than MAX_REQUEST_COST"""
+        rate_limit.record_query_bytes('search.results', 1000 * rate_limit.BYTES_PER_COST_UNIT)
+
+        assert rate_limit.request_cost('search', 'results') == rate_limit.MAX_REQUEST_COST
+
+
+class TestEnforceRateLimit:
+    """Test cases for the handler-level 429 response"""
+
+    def setup_method(self):
+        """Clear rate limit state before each test"""
+        request_counts.clear()
+
+    def test_allows_and_charges_client(self):
+        """Test an allowed request sends nothing and is charged to the client IP"""
+        handler = FakeHandler(forwarded_for='198.51.100.7, 10.0.0.1')
+
+        assert rate_limit.enforce_rate_limit(handler, cost=2) == True
+        assert handler.status is None
+        assert request_counts['198.51.100.7'].current == 2
+
+    def test_falls_back_to_socket_address(self):
+        """Test the socket address is used without X-Forwarded-For"""
+        assert rate_limit.client_ip(FakeHandler()) == '127.0.0.1'
+
+    def test_sends_429_when_exhausted(self):
+        """Test an exhausted budget answers 429 with retry headers"""
+        handler = FakeHandler(forwarded_for='198.51.100.8')
+        check_rate_limit('198.51.100.8', cost=RATE_LIMIT)
+
+        assert rate_limit.enforce_rate_limit(handler, cost=1) == False
+        body = json.loads(handler.wfile.getvalue())
+
+        assert handler.status == 429
+        assert body['error']['type'] == 'RateLimitError'
+        assert handler.sent_headers['X-RateLimit-Remaining'] == '0'
+        assert int(handler.sent_headers['Retry-After']) >= 1
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,214 @@
+"""
+Tests for response utilities
+"""
+
+import pytest
+import sys
+import os
+import io
+import gzip
+import json
+from datetime import date
+from decimal import Decimal
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import response
+from utils.response import (
+    success_response, error_response, paginated_response,
+    etag_matches, not_modified_response, CACHE_CONTROL,
+    negotiate_encoding, iter_json_chunks, send_success, send_paginated
+)
+
+
+class FakeHandler:
+    """Minimal stand-in for BaseHTTPRequestHandler that records the response"""
+
+    def __init__(self, accept_encoding=None):
+        self.headers = {'Accept-Encoding': accept_encoding} if accept_encoding else {}
+        self.wfile = io.BytesIO()
+        self.status = None
+        self.sent_headers = {}
+
+    def send_response(self, status):
+        self.status = status
+
+    def send_header(self, key, value):
+        self.sent_headers[key] = value
+
+    def end_headers(self):
+        pass
+
+
+class TestSuccessResponse:
+    """Test cases for success_response"""
+
+    def test_body_and_headers(self):
+        """Test the response envelope and JSON content type"""
+        body, status, headers = success_response({'a': 1}, metadata={'types': ['a']})
+        response = json.loads(body)
+
+        assert status == 200
+        assert response['success'] is True
+        assert response['data'] == {'a': 1}
+        assert response['metadata'] == {'types': ['a']}
+        assert headers['Content-Type'] == 'application/json'
+
+    def test_serializes_bigquery_types(self):
+        """Test that dates and decimals are encoded as strings"""
+        body, _, _ = success_response([{'d': date(2025, 1, 2), 'n': Decimal('1.50')}])
+
+        assert json.loads(body)['data'] == [{'d': '2025-01-02', 'n': '1.50'}]
+
+    def test_etag_adds_caching_headers(self):
+        """Test that ETag and Cache-Control are only sent with an ETag"""
+        _, _, headers = success_response({}, etag='"abc"')
+        _, _, plain_headers = success_response({})
+
+        assert headers['ETag'] == '"abc"'
+        assert headers['Cache-Control'] == CACHE_CONTROL
+        assert 'stale-while-revalidate' in CACHE_CONTROL
+        assert 'ETag' not in plain_headers and 'Cache-Control' not in plain_headers
+
+
+class TestErrorResponse:
+    """Test cases for error_response"""
+
+    def test_error_envelope(self):
+        """Test the error type, message and status"""
+        body, status, headers = error_response("Bad input", 400, "ValidationError")
+        response = json.loads(body)
+
+        assert status == 400
+        assert response['success'] is False
+        assert response['error'] == {'type': 'ValidationError', 'message': 'Bad input'}
+        assert 'ETag' not in headers
+
+
+class TestPaginatedResponse:
+    """Test cases for paginated_response"""
+
+    def test_offset_pagination(self):
+        """Test page counters at the top level of the response"""
+        body, _, _ = paginated_response([1, 2], page=2, limit=2, total_count=5)
+        pagination = json.loads(body)['pagination']
+
+        assert pagination == {
+            'page': 2, 'limit': 2, 'total_count': 5, 'total_pages': 3,
+            'has_next': True, 'has_previous': True
+        }
+
+    def test_cursor_pagination(self):
+        """Test that has_next follows the cursor in cursor mode"""
+        body, _, _ = paginated_response([1], page=1, limit=1, total_count=5,
+                                        next_cursor=None, cursor_mode=True, approximate=True)
+        pagination = json.loads(body)['pagination']
+
+        assert pagination['has_next'] is False
+        assert pagination['next_cursor'] is None
+        assert pagination['total_count_approximate'] is True
+
+
+class TestRevalidation:
+    """Test cases for ETag matching and 304 responses"""
+
+    @pytest.mark.parametrize('header, expected', [
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"xyz", "abc"', True),
+        ('*', True),
+        ('"xyz"', False),
+        ('W/"xyz"', False),
+        ('', False),
+        (None, False),
+    ])
+    def test_etag_matches(self, header, expected):
+        """Test If-None-Match weak comparison, lists and wildcard"""
+        assert etag_matches(header, '"abc"') is expected
+
+    def test_not_modified_has_no_body(self):
+        """Test that 304 responses carry the ETag and Vary but no body"""
+        body, status, headers = not_modified_response('W/"abc"')
+
+        assert (body, status) == ('', 304)
+        assert headers['ETag'] == 'W/"abc"'
+        assert headers['Cache-Control'] == CACHE_CONTROL
+        assert headers['Vary'] == 'Accept-Encoding'
+        assert 'Content-Type' not in headers
+
+
+class TestStreamingWriter:
+    """Test cases for the streaming response writer"""
+
+    ROWS = [{'id': i, 'name': f'ORG {i}', 'filed': date(2025, 1, 1)} for i in range(2000)]
+
+    @pytest.mark.parametrize('header, expected', [
+        ('gzip, deflate', 'gzip'),
+        ('GZIP', 'gzip'),
+        ('gzip;q=0, deflate', None),
+        ('identity', None),
+        ('', None),
+        (None, None),
+    ])
+    def test_negotiate_encoding(self, header, expected, monkeypatch):
+        """Test Accept-Encoding negotiation (brotli disabled)"""
+        monkeypatch.setattr(response, 'brotli', None)
+
+        assert negotiate_encoding(header) == expected
+
+    def test_prefers_brotli_when_available(self, monkeypatch):
+        """Test that br wins over gzip when the brotli module is installed"""
+        monkeypatch.setattr(response, 'brotli', object())
+
+        assert negotiate_encoding('gzip, br') == 'br'
+
+    @pytest.mark.parametrize('payload', [
+        {'success': True, 'data': ROWS, 'timestamp': 'now'},
+        {'success': True, 'data': [], 'pagination': {'page': 1}},
+        {'success': True, 'data': {'a': Decimal('1.5')}},
+        {},
+    ])
+    def test_chunks_match_json_dumps(self, payload):
+        """Test that streamed JSON decodes to the same value as json.dumps(default=str)"""
+        chunks = list(iter_json_chunks(payload, chunk_rows=100))
+
+        assert json.loads(''.join(chunks)) == json.loads(json.dumps(payload, default=str))
+
+    def test_large_payload_is_chunked(self):
+        """Test that rows are written in several chunks"""
+        chunks = list(iter_json_chunks({'data': self.ROWS}, chunk_rows=100))
+
+        assert len(chunks) == 21
+
+    def test_gzip(self):
+        """Test a gzip body written close-delimited"""
+        handler = FakeHandler('gzip')
+
+        send_success(handler, self.ROWS, etag='"v1"', headers={'X-Cache': 'MISS'})
+        body = json.loads(gzip.decompress(handler.wfile.getvalue()))
+
+        assert handler.status == 200
+        assert handler.sent_headers['Content-Encoding'] == 'gzip'
+        assert 'Transfer-Encoding' not in handler.sent_headers
+        assert handler.sent_headers['Vary'] == 'Accept-Encoding'
+        assert handler.sent_headers['ETag'] == '"v1"'
+        assert handler.sent_headers['X-Cache'] == 'MISS'
+        assert len(body['data']) == 2000
+        assert body['data'][0]['filed'] == '2025-01-01'
+
+    def test_identity_http10(self):
+        """Test an uncompressed, close-delimited body"""
+        handler = FakeHandler()
+
+        send_paginated(handler, [1, 2], page=1, limit=2, total_count=4)
+        body = json.loads(handler.wfile.getvalue())
+
+        assert 'Content-Encoding' not in handler.sent_headers
+        assert 'Transfer-Encoding' not in handler.sent_headers
+        assert body['pagination']['has_next'] is True
+        assert body['data'] == [1, 2]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
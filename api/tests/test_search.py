@@ -0,0 +1,77 @@
+"""
+Tests for the search query builders
+"""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import search
+from utils.cursor import decode_cursor
+
+
+class RecordingBackend:
+    """Backend returning canned page rows and recording each query's SQL"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def execute_query(self, query, params=None, template=None):
+        self.queries.append(query)
+        with_total = 'window_total' in query
+        return [dict(row, window_total=42) if with_total else dict(row) for row in self.rows]
+
+
+class TestSearchQueries:
+    """Test cases for the page and count SQL"""
+
+    def setup_method(self):
+        self.handler = search.handler.__new__(search.handler)
+
+    @pytest.mark.parametrize('name_filters', [None, search.handler.INDEX_FILTERS])
+    def test_count_uses_page_query_dedup(self, name_filters):
+        """Test the fallback count reads the same deduplicated set as window_total"""
+        ctes = self.handler._search_ctes(name_filters, with_total=False)
+        count_query = self.handler._build_count_query(name_filters)
+
+        assert count_query.startswith(ctes)
+        assert 'SELECT COUNT(*) as total FROM combined' in count_query
+        assert 'WHERE rn = 1' in ctes
+
+    def test_page_query_adds_window_total(self):
+        """Test only the page query carries the window count"""
+        assert 'window_total' in self.handler._build_search_query()
+        assert 'window_total' not in self.handler._build_count_query()
+
+
+class TestCursorTotals:
+    """Test that only the first cursor page counts the result set"""
+
+    ROWS = [
+        {'latest_filing_date': '2025-03-31', 'filer_id': 'F2', 'organization_name': 'BETA'},
+        {'latest_filing_date': '2025-01-15', 'filer_id': 'F1', 'organization_name': 'ACME'},
+    ]
+
+    def test_total_carried_in_cursor(self, monkeypatch):
+        """Test the first page's window count rides in the cursor to later pages"""
+        backend = RecordingBackend(self.ROWS)
+        monkeypatch.setattr(search, 'get_query_backend', lambda: backend)
+        monkeypatch.setattr(search, 'get_name_index', lambda: None)
+        handler = search.handler.__new__(search.handler)
+
+        first = handler._run_search('', 1, 1, cursor_mode=True)
+        cursor = decode_cursor(first['next_cursor'], search.handler.CURSOR_TYPES)
+        second = handler._run_search('', 1, 1, cursor_mode=True, cursor=cursor)
+
+        assert 'window_total' in backend.queries[0]
+        assert 'window_total' not in backend.queries[1]
+        assert first['total_count'] == second['total_count'] == 42
+        assert 'window_total' not in first['results'][0]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,132 @@
+"""
+Tests for JSON serialization utilities
+"""
+
+import pytest
+import sys
+import os
+import json
+import importlib.util
+from datetime import date, datetime, time
+from decimal import Decimal
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import serialization
+from utils.serialization import RowEncoder, dumps, encode_rows, get_row_encoder, is_row_list
+
+
+ROW = {
+    'filer_id': 'C001',
+    'organization_name': 'CITY OF SANTA MONICA',
+    'year': 2025,
+    'total_spending': Decimal('12500.50'),
+    'ratio': 0.25,
+    'active': True,
+    'latest_filing_date': date(2025, 3, 31),
+    'loaded_at': datetime(2025, 4, 1, 12, 30),
+    'notes': None
+}
+
+
+def reference(value):
+    """The previous serialization path"""
+    return json.loads(json.dumps(value, default=str))
+
+
+class TestRowEncoder:
+    """Test cases for RowEncoder"""
+
+    def test_from_rows_selects_converted_columns(self):
+        """Test that only columns whose values need converting are selected"""
+        encoder = RowEncoder.from_rows([ROW])
+
+        assert 'loaded_at' in encoder.converted_columns
+        assert 'filer_id' not in encoder.converted_columns
+        assert 'year' not in encoder.converted_columns
+        assert 'notes' not in encoder.converted_columns
+
+    def test_from_rows_skips_leading_nulls(self):
+        """Test that a column NULL in the first row is typed from later rows"""
+        rows = [{'loaded_at': None}, {'loaded_at': datetime(2025, 1, 1, 8, 0)}]
+
+        assert RowEncoder.from_rows(rows).converted_columns == ('loaded_at',)
+
+    def test_matches_default_str(self):
+        """Test that encoded rows decode to the same values as default=str"""
+        encoder = RowEncoder.from_rows([ROW])
+
+        assert json.loads(encoder.encode_rows([ROW, ROW])) == reference([ROW, ROW])
+
+    def test_does_not_mutate_rows(self):
+        """Test that cached rows keep their original types"""
+        row = dict(ROW)
+        RowEncoder.from_rows([row]).encode_rows([row])
+
+        assert row['total_spending'] == Decimal('12500.50')
+
+    def test_null_in_sample_row_still_encodes(self):
+        """Test that types missing from the sample fall back to str"""
+        rows = [{'d': None}, {'d': date(2025, 1, 1)}, {'d': time(9, 30)}]
+
+        assert json.loads(encode_rows(rows)) == reference(rows)
+
+
+class TestEncodeRows:
+    """Test cases for encode_rows and the encoder cache"""
+
+    def test_encoder_cached_per_query_shape(self):
+        """Test that rows of the same shape reuse one encoder"""
+        assert get_row_encoder([dict(ROW)]) is get_row_encoder([dict(ROW)])
+        assert get_row_encoder([{'a': 1}]) is not get_row_encoder([{'a': 'x'}])
+
+    @pytest.mark.parametrize('value', [[1, 2], {'a': [ROW]}, 'text', None])
+    def test_non_row_values(self, value):
+        """Test that anything other than a list of dicts uses the generic path"""
+        assert not is_row_list(value)
+        assert json.loads(encode_rows(value)) == reference(value)
+
+    def test_empty_list_is_zero_rows(self):
+        """Test that an empty result set counts as rows and encodes as []"""
+        assert is_row_list([])
+        assert get_row_encoder([]).converted_columns == ()
+        assert encode_rows([]) == '[]'
+
+    def test_datetime_keeps_str_format(self):
+        """Test that datetimes keep the 'YYYY-MM-DD HH:MM:SS' form of str()"""
+        rows = [{'loaded_at': datetime(2025, 4, 1, 12, 30)}]
+
+        assert json.loads(encode_rows(rows)) == [{'loaded_at': '2025-04-01 12:30:00'}]
+
+    def test_dumps_handles_nested_values(self):
+        """Test the generic encoder on nested response envelopes"""
+        payload = {'data': {'summary': ROW, 'years': [2024, 2025]}, 'timestamp': 'now'}
+
+        assert json.loads(dumps(payload)) == reference(payload)
+
+
+class TestStdlibFallback:
+    """Test cases for the path used when orjson is not installed"""
+
+    def load_without_orjson(self, monkeypatch):
+        """Load a separate copy of the module with orjson unavailable"""
+        monkeypatch.setitem(sys.modules, 'orjson', None)
+        spec = importlib.util.spec_from_file_location('serialization_stdlib', serialization.__file__)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def test_matches_default_str(self, monkeypatch):
+        """Test that the fallback converts every non-native type"""
+        module = self.load_without_orjson(monkeypatch)
+
+        assert module.orjson is None
+        assert set(module.RowEncoder.from_rows([ROW]).converted_columns) == \
+            {'total_spending', 'latest_filing_date', 'loaded_at'}
+        assert json.loads(module.encode_rows([ROW])) == reference([ROW])
+        assert module.dumps({'row': ROW}) == json.dumps({'row': ROW}, default=str)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
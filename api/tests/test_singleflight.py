@@ -0,0 +1,114 @@
+"""
+Tests for single-flight coalescing
+"""
+
+import pytest
+import sys
+import os
+import time
+import threading
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.singleflight import SingleFlight
+
+
+def wait_for_waiters(flight, key, count):
+    """Block until count callers are waiting on the in-flight call for key"""
+    for _ in range(500):
+        with flight._lock:
+            call = flight._calls.get(key)
+            if call is not None and call[1] >= count:
+                return
+        time.sleep(0.002)
+    raise AssertionError("waiters never joined")
+
+
+class TestSingleFlight:
+    """Test cases for coalescing concurrent identical calls"""
+
+    def test_concurrent_calls_run_once(self):
+        """Test concurrent callers with one key share a single execution"""
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def query():
+            calls.append(1)
+            release.wait(2)
+            return [{'total': 42}]
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(flight.do('spending', query)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+
+        wait_for_waiters(flight, 'spending', 4)
+        release.set()
+        for thread in threads:
+            thread.join(2)
+
+        assert len(calls) == 1
+        assert len(results) == 5
+        assert all(rows == [{'total': 42}] for rows, _ in results)
+        assert all(shared for _, shared in results)
+        assert flight.in_flight() == 0
+
+    def test_lone_call_is_not_shared(self):
+        """Test a call nobody waited on reports shared=False"""
+        flight = SingleFlight()
+
+        assert flight.do('summary', lambda: 1) == (1, False)
+
+    def test_sequential_calls_are_not_cached(self):
+        """Test each call after the previous one finished runs again"""
+        flight = SingleFlight()
+        calls = []
+
+        for _ in range(3):
+            flight.do('summary', lambda: calls.append(1))
+
+        assert len(calls) == 3
+
+    def test_different_keys_run_separately(self):
+        """Test calls with different keys are never coalesced"""
+        flight = SingleFlight()
+
+        assert flight.do(('a', 2024), lambda: 'a')[0] == 'a'
+        assert flight.do(('b', 2024), lambda: 'b')[0] == 'b'
+
+    def test_exception_reaches_every_waiter(self):
+        """Test a failed execution raises to all callers and clears the key"""
+        flight = SingleFlight()
+        release = threading.Event()
+        errors = []
+
+        def failing():
+            release.wait(2)
+            raise RuntimeError("job failed")
+
+        def caller():
+            try:
+                flight.do('search', failing)
+            except RuntimeError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=caller) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+
+        wait_for_waiters(flight, 'search', 2)
+        release.set()
+        for thread in threads:
+            thread.join(2)
+
+        assert len(errors) == 3
+        assert flight.in_flight() == 0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,30 @@
+"""
+Tests for cold-start behaviour of the endpoint handlers
+"""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.bench_startup import ENDPOINTS, measure_startup
+
+CASES = [(module, method) for module, methods in ENDPOINTS.items() for method in methods]
+
+
+class TestColdStart:
+    """Test that handlers start without the heavy client libraries"""
+
+    @pytest.mark.parametrize('module,method', CASES)
+    def test_serves_without_heavy_imports(self, module, method):
+        """Test a request that needs no database imports no heavy package"""
+        result = measure_startup(module, method)
+
+        assert result['status'] == 200
+        assert result['heavy_modules'] == []
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,151 @@
+"""
+Tests for request timing (Server-Timing and request ids)
+"""
+
+import pytest
+import sys
+import os
+import io
+import json
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import timing
+from utils.timing import begin_request, span, timing_headers, current_timing
+from utils.concurrency import run_parallel
+from utils.response import send_success, error_response
+
+
+class FakeHandler:
+    """Minimal stand-in for BaseHTTPRequestHandler that records the response"""
+
+    def __init__(self, headers=None):
+        self.headers = headers or {}
+        self.wfile = io.BytesIO()
+        self.status = None
+        self.sent_headers = {}
+
+    def send_response(self, status):
+        self.status = status
+
+    def send_header(self, key, value):
+        self.sent_headers[key] = value
+
+    def end_headers(self):
+        pass
+
+
+def parse_server_timing(value):
+    """Server-Timing header value -> {name: duration}"""
+    spans = {}
+    for entry in value.split(','):
+        name, _, duration = entry.strip().partition(';dur=')
+        spans[name] = float(duration)
+    return spans
+
+
+class TestRequestTiming:
+    """Test spans and headers for the current request"""
+
+    def setup_method(self):
+        """Start each test outside any request"""
+        timing._current.set(None)
+
+    def test_spans_are_noops_when_disabled(self, monkeypatch):
+        """Test disabled timing hands out the shared no-op context manager"""
+        monkeypatch.setattr(timing, 'TIMING_ENABLED', False)
+        begin_request(FakeHandler())
+
+        assert span('query_submit') is timing._NO_SPAN
+        assert 'Server-Timing' not in timing_headers()
+
+    def test_spans_are_noops_outside_a_request(self):
+        """Test span() works (and records nothing) with no request started"""
+        assert span('query_submit') is timing._NO_SPAN
+        assert timing_headers() == {}
+
+    def test_spans_accumulate_when_enabled(self, monkeypatch):
+        """Test repeated spans add up and appear in Server-Timing with a total"""
+        monkeypatch.setattr(timing, 'TIMING_ENABLED', True)
+        begin_request(FakeHandler())
+
+        for _ in range(2):
+            with span('query_fetch'):
+                time.sleep(0.005)
+
+        spans = parse_server_timing(timing_headers()['Server-Timing'])
+        assert list(spans) == ['query_fetch', 'total']
+        assert spans['query_fetch'] >= 10
+        assert spans['total'] >= spans['query_fetch']
+
+    def test_request_id_generated(self):
+        """Test each request gets a fresh id"""
+        first = begin_request(FakeHandler()).request_id
+        second = begin_request(FakeHandler()).request_id
+
+        assert first != second
+        assert timing_headers()['X-Request-Id'] == second
+
+    def test_incoming_request_id_honoured(self):
+        """Test a well-formed incoming id is reused, a malformed one is not"""
+        assert begin_request(FakeHandler({'X-Request-Id': 'abc-123'})).request_id == 'abc-123'
+        assert begin_request(FakeHandler({'X-Vercel-Id': 'sfo1::xyz'})).request_id == 'sfo1::xyz'
+        assert begin_request(FakeHandler({'X-Request-Id': 'bad\r\nid'})).request_id != 'bad\r\nid'
+
+    def test_parallel_calls_share_the_request(self, monkeypatch):
+        """Test spans closed in run_parallel threads are recorded on the request"""
+        monkeypatch.setattr(timing, 'TIMING_ENABLED', True)
+        request = begin_request(FakeHandler())
+
+        def work():
+            with span('query_wait'):
+                return current_timing()
+
+        results = run_parallel({'a': work, 'b': work})
+
+        assert results['a'] is request and results['b'] is request
+        assert 'query_wait' in request.spans
+
+
+class TestTimingHeaders:
+    """Test timing headers on responses"""
+
+    def setup_method(self):
+        """Start each test outside any request"""
+        timing._current.set(None)
+
+    def test_error_response_carries_request_id(self):
+        """Test error responses include the request id"""
+        request = begin_request(FakeHandler())
+        _, _, headers = error_response("boom")
+
+        assert headers['X-Request-Id'] == request.request_id
+
+    def test_streamed_response_reports_encode_span(self, monkeypatch):
+        """Test the Server-Timing header includes JSON encoding when timing is on"""
+        monkeypatch.setattr(timing, 'TIMING_ENABLED', True)
+        handler = FakeHandler()
+        begin_request(handler)
+
+        send_success(handler, [{'id': i} for i in range(10)])
+
+        assert set(parse_server_timing(handler.sent_headers['Server-Timing'])) == {'encode', 'total'}
+        assert len(json.loads(handler.wfile.getvalue())['data']) == 10
+
+    def test_no_server_timing_when_disabled(self, monkeypatch):
+        """Test only the request id is sent when timing is off"""
+        monkeypatch.setattr(timing, 'TIMING_ENABLED', False)
+        handler = FakeHandler()
+        begin_request(handler)
+
+        send_success(handler, {'ok': True})
+
+        assert 'Server-Timing' not in handler.sent_headers
+        assert 'X-Request-Id' in handler.sent_headers
+        assert json.loads(handler.wfile.getvalue())['data'] == {'ok': True}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -1,44 +1,58 @@
 """
 BigQuery Client Wrapper for Vercel Serverless Functions
 Handles connection, query execution, and error management
+Shared by every endpoint in api/ (one warm client per function instance)
+
+The Google client libraries are imported on first use, not at module load:
+importing them dominates cold start, and requests such as CORS preflights
+or cached responses never touch BigQuery.
 """
 
 import os
 import json
-from google.cloud import bigquery
-from google.oauth2 import service_account
+import threading
+import time
+
+from utils.query_backend import QueryBackend, DEFAULT_PAGE_SIZE
+from utils.rate_limit import record_query_bytes
+from utils.query_budget import budget_for, job_labels, check_query_budget, billing_limit_error
+from utils import metrics
+from utils.timing import span
+from utils.singleflight import SingleFlight
+
+# Coalesce concurrent identical queries into one job (QUERY_SINGLE_FLIGHT=0 disables)
+SINGLE_FLIGHT_ENABLED = os.environ.get('QUERY_SINGLE_FLIGHT', '1').lower() not in ('0', 'false', 'no')
+
 
-class BigQueryClient:
+class BigQueryClient(QueryBackend):
     """Singleton BigQuery client for serverless functions"""
 
+    name = 'bigquery'
     _instance = None
     _client = None
+    _instance_lock = threading.Lock()
+    _in_flight = SingleFlight()
 
     def __new__(cls):
+        # Parallel workers on a cold instance wait for the one initializing;
+        # the instance is published only once its client is ready, so a
+        # failed init is retried by the next call
         if cls._instance is None:
-            cls._instance = super(BigQueryClient, cls).__new__(cls)
-            cls._instance._initialize_client()
+            with cls._instance_lock:
+                if cls._instance is None:
+                    instance = super(BigQueryClient, cls).__new__(cls)
+                    with span('client_init'):
+                        instance._initialize_client()
+                    cls._instance = instance
         return cls._instance
 
     def _initialize_client(self):
         """Initialize BigQuery client with service account credentials"""
         try:
-            # Get credentials from environment variable (Vercel sets this)
-            credentials_json = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS_JSON')
+            from google.cloud import bigquery
 
-            if not credentials_json:
-                raise ValueError("GOOGLE_APPLICATION_CREDENTIALS_JSON not set")
-
-            # Parse JSON credentials
-            credentials_info = json.loads(credentials_json)
-
-            # Create credentials object
-            credentials = service_account.Credentials.from_service_account_info(
-                credentials_info
-            )
-
-            # Get project ID
-            project_id = os.environ.get('BIGQUERY_PROJECT_ID') or credentials_info['project_id']
+            with span('credentials'):
+                credentials, project_id = self._load_credentials()
 
             # Initialize BigQuery client
             self._client = bigquery.Client(
@@ -46,56 +60,172 @@ class BigQueryClient:
                 project=project_id
             )
 
-            print(f" BigQuery client initialized for project: {project_id}")
+            print(f"✅ BigQuery client initialized for project: {project_id}")
+
+        except Exception as e:
+            print(f"❌ Failed to initialize BigQuery client: {e}")
+            raise
+
+    def _load_credentials(self):
+        """Load service account credentials and the project ID
+
+        Returns:
+            tuple: (credentials, project_id)
+        """
+        from google.oauth2 import service_account
+
+        # Get credentials from environment variable (Vercel sets this)
+        credentials_json = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS_JSON')
+
+        if not credentials_json:
+            # Try file-based credentials for local development
+            credentials_file = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS')
+            if not credentials_file:
+                raise ValueError("No credentials found")
+            credentials = service_account.Credentials.from_service_account_file(credentials_file)
+            return credentials, os.environ.get('BIGQUERY_PROJECT_ID') or credentials.project_id
+
+        # Parse JSON credentials for Vercel deployment
+        credentials_info = json.loads(credentials_json)
+        credentials = service_account.Credentials.from_service_account_info(credentials_info)
+        return credentials, os.environ.get('BIGQUERY_PROJECT_ID') or credentials_info['project_id']
+
+    def _job_config(self, params=None, template=None, dry_run=False):
+        """Build the job config: parameters, byte budget and labels for the template"""
+        from google.cloud import bigquery
+
+        job_config = bigquery.QueryJobConfig(
+            maximum_bytes_billed=budget_for(template),
+            labels=job_labels(template)
+        )
+
+        # Add parameters if provided (prevents SQL injection)
+        if params:
+            job_config.query_parameters = [_bigquery_param(param) for param in params]
+
+        if dry_run:
+            job_config.dry_run = True
+            job_config.use_query_cache = False
+
+        return job_config
+
+    def dry_run(self, query, params=None, template=None):
+        """
+        Estimate the bytes a query would process without running it
+
+        Returns:
+            int: Estimated bytes processed
+        """
+        with span('dry_run'):
+            job = self._client.query(query, job_config=self._job_config(params, template, dry_run=True))
+        return job.total_bytes_processed
+
+    def _submit(self, query, params=None, template=None):
+        """Submit a query job and return it without waiting for results
+
+        Raises:
+            QueryBudgetExceeded: If the dry-run gate is on and the estimate is over budget
+        """
+        check_query_budget(query, params, template, lambda: self.dry_run(query, params, template))
+        with span('query_submit'):
+            return self._client.query(query, job_config=self._job_config(params, template))
+
+    def iter_query(self, query, params=None, page_size=DEFAULT_PAGE_SIZE, template=None):
+        """
+        Execute a BigQuery query and yield rows as result pages arrive
+
+        Only one page of results is held in memory at a time, so callers can
+        start serializing before the full result has been downloaded. The
+        endpoints do not stream yet: they go through execute_query and the
+        response cache, which both build the full row list.
+
+        Args:
+            query (str): SQL query to execute
+            params (list): Query parameters (see scalar_param / array_param)
+            page_size (int): Rows requested per results page
+            template (str): Query template name, e.g. 'analytics.summary'; tags
+                the query's metrics and feeds the rate limiter's cost weights
+
+        Yields:
+            dict: One result row keyed by column name
+
+        Raises:
+            QueryBudgetExceeded: If the query is over its template's byte budget
+                (dry-run gate, or BigQuery's maximum_bytes_billed limit)
+        """
+        started = time.perf_counter()
+        try:
+            job = self._submit(query, params, template)
+            with span('query_wait'):
+                results = job.result(page_size=page_size)
+            record_query_bytes(template, job.total_bytes_processed)
+
+            rows = 0
+            pages = iter(results.pages)
+            while True:
+                with span('query_fetch'):
+                    page = next(pages, None)
+                if page is None:
+                    break
+                for row in page:
+                    rows += 1
+                    yield dict(row.items())
+
+            metrics.record_job(template, job, (time.perf_counter() - started) * 1000, rows)
 
         except Exception as e:
-            print(f"L Failed to initialize BigQuery client: {e}")
+            metrics.record_query_error(template)
+            print(f"❌ Query execution failed ({template or 'untagged'}): {e}")
+            budget_error = billing_limit_error(template, e)
+            if budget_error is not None:
+                raise budget_error from e
             raise
 
-    def execute_query(self, query, parameters=None):
+    def execute_query(self, query, params=None, template=None):
         """
         Execute a BigQuery query with optional parameters
 
+        Concurrent calls with the same SQL and parameters share one job; each
+        caller still gets its own row dicts, so callers may modify their rows.
+
         Args:
             query (str): SQL query to execute
-            parameters (list): List of bigquery.ScalarQueryParameter objects
+            params (list): Query parameters (see scalar_param / array_param)
+            template (str): Query template name, e.g. 'analytics.summary'
 
         Returns:
             list: Query results as list of dictionaries
         """
-        try:
-            # Configure query job
-            job_config = bigquery.QueryJobConfig()
+        if not SINGLE_FLIGHT_ENABLED:
+            return list(self.iter_query(query, params, template=template))
+
+        ran_job = []
 
-            # Add parameters if provided (prevents SQL injection)
-            if parameters:
-                job_config.query_parameters = parameters
+        def run():
+            ran_job.append(True)
+            return list(self.iter_query(query, params, template=template))
 
-            # Execute query
-            query_job = self._client.query(query, job_config=job_config)
+        # Parameter objects repr() with their name, type and value
+        key = (template, query, repr(params))
+        rows, shared = self._in_flight.do(key, run)
+        if not shared:
+            return rows
 
-            # Get results
-            results = query_job.result()
+        if not ran_job:
+            metrics.record_coalesced(template)
 
-            # Convert to list of dictionaries
-            rows = []
-            for row in results:
-                rows.append(dict(row))
+        # Several callers hold this result: none may mutate the shared rows
+        return [dict(row) for row in rows]
 
-            return rows
 
-        except Exception as e:
-            print(f"L Query execution failed: {e}")
-            raise
+def _bigquery_param(param):
+    """Convert a QueryParameter to its google.cloud.bigquery form"""
+    from google.cloud import bigquery
+
+    if param.array:
+        return bigquery.ArrayQueryParameter(param.name, param.type_, param.value)
+    return bigquery.ScalarQueryParameter(param.name, param.type_, param.value)
 
-    def test_connection(self):
-        """Test BigQuery connection"""
-        try:
-            query = "SELECT 1 as test"
-            result = self.execute_query(query)
-            return result[0]['test'] == 1
-        except:
-            return False
 
 # Create singleton instance
 def get_bigquery_client():
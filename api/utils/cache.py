@@ -0,0 +1,279 @@
+"""
+Response Cache for API Endpoints
+In-process LRU cache with an optional shared backend, invalidated by the
+data version the upload pipeline bumps after every successful load
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+# Cache configuration
+RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE', '256'))  # entries per instance
+DATA_VERSION_TTL = 300  # seconds between data version lookups
+FALLBACK_VERSION_WINDOW = 3600  # seconds; used when the version table is unreachable
+
+DATA_VERSION_TABLE = 'ca-lobby.ca_lobby.data_version'
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU cache"""
+
+    def __init__(self, max_entries=RESPONSE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return (hit, value) for a key"""
+        with self._lock:
+            if key not in self._entries:
+                return False, None
+            self._entries.move_to_end(key)
+            return True, self._entries[key]
+
+    def set(self, key, value):
+        """Store a value, evicting the least recently used entry if full"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCacheBackend:
+    """
+    Shared cache backend stored in a local SQLite file
+
+    Stand-in for a networked cache: every process that points at the same
+    file shares entries. Values are stored as JSON.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5)
+
+    def get(self, key):
+        """Return (hit, value) for a key"""
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM response_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return False, None
+        return True, json.loads(row[0])
+
+    def set(self, key, value):
+        """Store a JSON-serializable value"""
+        payload = json.dumps(value, default=str)
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO response_cache (key, value, created_at) VALUES (?, ?, ?)",
+                (key, payload, time.time())
+            )
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM response_cache")
+
+
+class ResponseCache:
+    """Two-level response cache: in-process LRU in front of an optional shared backend"""
+
+    def __init__(self, max_entries=RESPONSE_CACHE_SIZE, backend=None):
+        self.local = LRUCache(max_entries)
+        self.backend = backend
+
+    def get(self, key):
+        """Return (hit, value), promoting shared-backend hits into the LRU"""
+        hit, value = self.local.get(key)
+        if hit or self.backend is None:
+            return hit, value
+
+        try:
+            hit, value = self.backend.get(key)
+        except Exception as e:
+            print(f"WARNING: Shared cache read failed: {e}")
+            return False, None
+
+        if hit:
+            self.local.set(key, value)
+        return hit, value
+
+    def set(self, key, value):
+        """Store a value in both levels"""
+        self.local.set(key, value)
+        if self.backend is not None:
+            try:
+                self.backend.set(key, value)
+            except Exception as e:
+                print(f"WARNING: Shared cache write failed: {e}")
+
+    def clear(self):
+        """Remove all entries from both levels"""
+        self.local.clear()
+        if self.backend is not None:
+            self.backend.clear()
+
+
+def normalize_params(params):
+    """
+    Normalize parsed query parameters for use in a cache key
+
+    Keys are sorted, values are stripped and empty values are dropped, so
+    '?b=2&a=1' and '?a=1&b=2&c=' produce the same key.
+    """
+    normalized = []
+    for name in sorted(params or {}):
+        values = params[name]
+        if not isinstance(values, (list, tuple)):
+            values = [values]
+        values = [str(v).strip() for v in values if str(v).strip() != '']
+        if values:
+            normalized.append((name, values))
+    return normalized
+
+
+def make_cache_key(endpoint, params, data_version):
+    """Build a cache key from (endpoint, normalized params, data version)"""
+    raw = json.dumps([endpoint, normalize_params(params), str(data_version)])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+# ============================================================================
+# DATA VERSION
+# ============================================================================
+
+_data_version = {'value': None, 'checked_at': 0.0}
+_data_version_lock = threading.Lock()
+
+
+def _fetch_data_version():
+    """Read the latest load generation written by the upload pipeline"""
+    from utils.query_backend import get_query_backend
+
+    rows = get_query_backend().execute_query(
+        f"SELECT MAX(version) as version FROM `{DATA_VERSION_TABLE}`",
+        template='data_version'
+    )
+    version = rows[0]['version'] if rows else None
+    return None if version is None else str(version)
+
+
+def get_data_version():
+    """
+    Get the current data version stamp
+
+    The DATA_VERSION environment variable overrides the lookup. Otherwise the
+    version table is read at most once per DATA_VERSION_TTL. If it cannot be
+    read, a coarse time bucket is used so cached entries still expire.
+    """
+    override = os.environ.get('DATA_VERSION')
+    if override:
+        return override
+
+    now = time.time()
+    with _data_version_lock:
+        if _data_version['value'] is not None and now - _data_version['checked_at'] < DATA_VERSION_TTL:
+            return _data_version['value']
+
+        try:
+            version = _fetch_data_version()
+        except Exception as e:
+            print(f"WARNING: Data version lookup failed: {e}")
+            version = None
+
+        if version is None:
+            version = f"t{int(now // FALLBACK_VERSION_WINDOW)}"
+
+        _data_version['value'] = version
+        _data_version['checked_at'] = now
+        return version
+
+
+# ============================================================================
+# SHARED INSTANCE
+# ============================================================================
+
+_response_cache = None
+
+
+def get_response_cache():
+    """Get or create the process-wide response cache"""
+    global _response_cache
+    if _response_cache is None:
+        backend = None
+        if os.environ.get('RESPONSE_CACHE_BACKEND', 'memory') == 'sqlite':
+            path = os.environ.get('RESPONSE_CACHE_PATH', '/tmp/ca_lobby_response_cache.sqlite3')
+            try:
+                backend = SQLiteCacheBackend(path)
+            except Exception as e:
+                print(f"WARNING: Shared cache unavailable, using memory only: {e}")
+        _response_cache = ResponseCache(backend=backend)
+    return _response_cache
+
+
+def response_etag(endpoint, params):
+    """
+    Build a weak ETag for a request from the data version and normalized params
+
+    Computed without touching the cached data, so a matching If-None-Match can
+    be answered with 304 before any query runs. The tag is weak because the
+    identity, gzip and br bodies (and their timestamps) differ byte for byte
+    while carrying the same data.
+
+    Args:
+        endpoint: Endpoint name, e.g. 'analytics'
+        params: Parsed query parameters (dict of lists from parse_qs)
+
+    Returns:
+        str: Weak ETag value, W/"..."
+    """
+    return 'W/"' + make_cache_key(endpoint, params, get_data_version())[:32] + '"'
+
+
+def cached_response(endpoint, params, compute):
+    """
+    Return cached data for (endpoint, params) or compute and store it
+
+    Exceptions raised by compute are propagated and never cached.
+
+    Args:
+        endpoint: Endpoint name, e.g. 'analytics'
+        params: Parsed query parameters (dict of lists from parse_qs)
+        compute: Zero-argument callable producing the response data
+
+    Returns:
+        tuple: (data, cache_hit)
+    """
+    cache = get_response_cache()
+    key = make_cache_key(endpoint, params, get_data_version())
+
+    hit, value = cache.get(key)
+    if hit:
+        return value, True
+
+    value = compute()
+    cache.set(key, value)
+    return value, False
@@ -0,0 +1,65 @@
+"""
+Columnar Response Formats
+Converts result rows to column arrays (JSON) or an Arrow IPC stream for charts
+"""
+
+import io
+import importlib.util
+
+from utils.serialization import is_row_list
+
+ARROW_CONTENT_TYPE = 'application/vnd.apache.arrow.stream'
+
+RESPONSE_FORMATS = ('json', 'columnar', 'arrow')
+
+
+def arrow_available():
+    """Whether the optional pyarrow dependency is installed (without importing it)"""
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def to_columnar(rows):
+    """
+    Convert result rows to column arrays
+
+    Column order follows the first row (the query's SELECT order); a key
+    missing from a row becomes None.
+
+    Args:
+        rows: List of dicts
+
+    Returns:
+        dict: {"columns": [...], "data": {column: [values]}}
+    """
+    columns = list(rows[0].keys()) if rows else []
+    return {
+        "columns": columns,
+        "data": {column: [row.get(column) for row in rows] for column in columns}
+    }
+
+
+def to_arrow_ipc(rows):
+    """
+    Encode result rows as an Arrow IPC stream
+
+    Args:
+        rows: List of dicts
+
+    Returns:
+        bytes: Arrow IPC stream (schema + one record batch)
+
+    Raises:
+        RuntimeError: If pyarrow is not installed
+    """
+    # Imported on first use: pyarrow is heavy and only format=arrow needs it
+    try:
+        import pyarrow
+        import pyarrow.ipc
+    except ImportError:
+        raise RuntimeError("pyarrow is not installed")
+
+    table = pyarrow.Table.from_pydict(to_columnar(rows)["data"])
+    sink = io.BytesIO()
+    with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
@@ -0,0 +1,56 @@
+"""
+Concurrency Utility for API Endpoints
+Runs independent calls (usually BigQuery jobs) at the same time
+"""
+
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+# BigQuery work is I/O bound, so threads spend nearly all their time waiting
+MAX_WORKERS = 8
+
+
+def run_parallel(calls, max_workers=MAX_WORKERS, return_exceptions=False):
+    """
+    Run a dictionary of zero-argument callables concurrently.
+
+    Args:
+        calls: Dictionary of name -> callable
+        max_workers: Upper bound on threads used
+        return_exceptions: If True, a failing call's exception is returned in
+            place of its result instead of being raised
+
+    Returns:
+        Dictionary of name -> result, in the same key order as calls
+    """
+    if not calls:
+        return {}
+
+    # A single call gains nothing from a thread hop
+    if len(calls) == 1:
+        name, call = next(iter(calls.items()))
+        try:
+            return {name: call()}
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            return {name: e}
+
+    workers = min(max_workers, len(calls))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Each call runs in a copy of the caller's context (request timing, etc.)
+        futures = {
+            name: executor.submit(contextvars.copy_context().run, call)
+            for name, call in calls.items()
+        }
+
+        results = {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results[name] = e
+
+    return results
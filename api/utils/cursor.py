@@ -0,0 +1,52 @@
+"""
+Cursor Utilities for Keyset Pagination
+Encodes the sort key of the last row on a page as an opaque token
+"""
+
+import json
+import base64
+
+
+def encode_cursor(values):
+    """
+    Encode a sort key as an opaque, URL-safe cursor
+
+    Args:
+        values: List of JSON-serializable sort key values
+
+    Returns:
+        str: Cursor token
+    """
+    raw = json.dumps(list(values), separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token, types):
+    """
+    Decode a cursor produced by encode_cursor
+
+    Args:
+        token: Cursor token from a previous response
+        types: Expected type of each sort key value, e.g. (str, str, str);
+            the values are bound as typed query parameters
+
+    Returns:
+        list: Sort key values
+
+    Raises:
+        ValueError: If the token is malformed or a value has the wrong type
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValueError("Invalid cursor")
+
+    for value, expected in zip(values, types):
+        # bool is an int subclass but never a valid sort key
+        if isinstance(value, bool) or not isinstance(value, expected):
+            raise ValueError("Invalid cursor")
+    return values
@@ -0,0 +1,228 @@
+"""
+DuckDB Query Backend for API Endpoints
+Runs the endpoints' BigQuery SQL templates with an embedded DuckDB engine
+against a local Parquet snapshot of the dataset (QUERY_BACKEND=duckdb)
+
+The snapshot directory holds one <table>.parquet file, or a <table>/
+directory of Parquet files, per BigQuery table or view the templates read;
+backend/pipeline/parquet_snapshot.py exports it. Each becomes a view named
+after the table, and templates are translated from BigQuery SQL on the fly.
+
+duckdb is an optional dependency, imported only when this backend is used.
+"""
+
+import os
+import re
+import threading
+import time
+from functools import lru_cache
+
+from utils.query_backend import QueryBackend, DEFAULT_PAGE_SIZE
+from utils import metrics
+from utils.timing import span
+
+# Directory holding the Parquet snapshot
+LOCAL_SNAPSHOT_DIR = os.environ.get('LOCAL_SNAPSHOT_DIR', 'data/snapshot')
+
+# DuckDB worker threads per query (0 = DuckDB default, one per core)
+DUCKDB_THREADS = int(os.environ.get('DUCKDB_THREADS', '0'))
+
+# BigQuery type names DuckDB spells differently
+_TYPE_NAMES = {'INT64': 'BIGINT', 'FLOAT64': 'DOUBLE', 'STRING': 'VARCHAR', 'BOOL': 'BOOLEAN'}
+
+_TABLE_REFERENCE = re.compile(r'`(?:[\w-]+\.)*(\w+)`')
+_NAMED_PARAMETER = re.compile(r'(?<![\w@$])@(\w+)')
+_DUCKDB_PARAMETER = re.compile(r'\$(\w+)')
+_IN_UNNEST = re.compile(r'\bIN\s+UNNEST\s*\((\$\w+)\)', re.IGNORECASE)
+_CAST_TYPE = re.compile(r'\bAS\s+(INT64|FLOAT64|STRING|BOOL)\b', re.IGNORECASE)
+_SAFE_CAST = re.compile(r'\bSAFE_CAST\s*\(', re.IGNORECASE)
+_CURRENT_DATE = re.compile(r'\bCURRENT_DATE\s*\(\s*\)', re.IGNORECASE)
+_FORMAT_DATE = re.compile(r'\bFORMAT_DATE\s*\(', re.IGNORECASE)
+
+
+def _split_call(sql, open_paren):
+    """
+    Split the arguments of the call whose '(' is at open_paren
+
+    Returns:
+        tuple: (list of argument strings, index just past the closing ')')
+    """
+    args, depth, start, quote = [], 0, open_paren + 1, None
+    for i in range(open_paren, len(sql)):
+        char = sql[i]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in ("'", '"'):
+            quote = char
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                args.append(sql[start:i].strip())
+                return args, i + 1
+        elif char == ',' and depth == 1:
+            args.append(sql[start:i].strip())
+            start = i + 1
+    raise ValueError("Unbalanced parentheses in query")
+
+
+def _rewrite_format_date(sql):
+    """FORMAT_DATE(fmt, date) -> strftime(date, fmt)"""
+    while True:
+        match = _FORMAT_DATE.search(sql)
+        if match is None:
+            return sql
+        (fmt, value), end = _split_call(sql, match.end() - 1)
+        sql = f"{sql[:match.start()]}strftime({value}, {fmt}){sql[end:]}"
+
+
+@lru_cache(maxsize=256)
+def translate_sql(sql):
+    """
+    Translate a BigQuery SQL template to DuckDB SQL
+
+    Covers the dialect the API templates use: backticked table ids become
+    snapshot views, @params become $params, plus IN UNNEST, FORMAT_DATE,
+    CURRENT_DATE(), SAFE_CAST and the BigQuery type names.
+
+    Args:
+        sql (str): BigQuery SQL
+
+    Returns:
+        str: DuckDB SQL
+    """
+    sql = _TABLE_REFERENCE.sub(r'"\1"', sql)
+    sql = _NAMED_PARAMETER.sub(r'$\1', sql)
+    sql = _IN_UNNEST.sub(r'IN (SELECT UNNEST(\1))', sql)
+    sql = _CAST_TYPE.sub(lambda m: f"AS {_TYPE_NAMES[m.group(1).upper()]}", sql)
+    sql = _SAFE_CAST.sub('TRY_CAST(', sql)
+    sql = _CURRENT_DATE.sub('CURRENT_DATE', sql)
+    return _rewrite_format_date(sql)
+
+
+def duckdb_params(sql, params):
+    """
+    Convert query parameters to DuckDB named parameters
+
+    DuckDB rejects parameters the statement does not reference, so only
+    those used in the translated SQL are passed.
+
+    Args:
+        sql (str): Translated DuckDB SQL
+        params (list): QueryParameter objects, or None
+
+    Returns:
+        dict: name -> value
+    """
+    referenced = set(_DUCKDB_PARAMETER.findall(sql))
+    return {param.name: param.value for param in params or () if param.name in referenced}
+
+
+def snapshot_tables(directory):
+    """
+    Find the tables in a Parquet snapshot directory
+
+    Returns:
+        dict: table name -> Parquet path or glob
+    """
+    tables = {}
+    for entry in sorted(os.listdir(directory)):
+        path = os.path.join(directory, entry)
+        if entry.endswith('.parquet') and os.path.isfile(path):
+            tables[entry[:-len('.parquet')]] = path
+        elif os.path.isdir(path):
+            tables[entry] = os.path.join(path, '*.parquet')
+    return tables
+
+
+class DuckDBBackend(QueryBackend):
+    """Singleton embedded DuckDB engine over the local Parquet snapshot"""
+
+    name = 'duckdb'
+    _instance = None
+    _connection = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        # Same one-time, publish-after-init construction as BigQueryClient
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    instance = super(DuckDBBackend, cls).__new__(cls)
+                    with span('client_init'):
+                        instance._initialize(LOCAL_SNAPSHOT_DIR)
+                    cls._instance = instance
+        return cls._instance
+
+    def _initialize(self, directory):
+        """Open an in-memory database with one view per snapshot table"""
+        try:
+            import duckdb
+
+            if not os.path.isdir(directory):
+                raise ValueError(f"Snapshot directory not found: {directory}")
+
+            self._connection = duckdb.connect(':memory:')
+            if DUCKDB_THREADS:
+                self._connection.execute(f"SET threads = {DUCKDB_THREADS}")
+
+            tables = snapshot_tables(directory)
+            for table, path in tables.items():
+                escaped = path.replace("'", "''")
+                self._connection.execute(
+                    f"CREATE VIEW \"{table}\" AS SELECT * FROM read_parquet('{escaped}')"
+                )
+
+            print(f"✅ DuckDB backend initialized with {len(tables)} tables from {directory}")
+
+        except Exception as e:
+            print(f"❌ Failed to initialize DuckDB backend: {e}")
+            raise
+
+    def iter_query(self, query, params=None, page_size=DEFAULT_PAGE_SIZE, template=None):
+        """
+        Execute a BigQuery SQL template locally and yield rows page by page
+
+        Args:
+            query (str): SQL query to execute (BigQuery dialect)
+            params (list): Query parameters (see scalar_param / array_param)
+            page_size (int): Rows fetched per page
+            template (str): Query template name, e.g. 'analytics.summary'
+
+        Yields:
+            dict: One result row keyed by column name
+        """
+        started = time.perf_counter()
+        # One cursor per query: cursors are safe to use from parallel threads
+        cursor = self._connection.cursor()
+        try:
+            sql = translate_sql(query)
+            with span('query_execute'):
+                cursor.execute(sql, duckdb_params(sql, params))
+            columns = [column[0] for column in cursor.description]
+
+            rows = 0
+            while True:
+                with span('query_fetch'):
+                    page = cursor.fetchmany(page_size)
+                if not page:
+                    break
+                for values in page:
+                    rows += 1
+                    yield dict(zip(columns, values))
+
+            metrics.record_query(template, (time.perf_counter() - started) * 1000, rows)
+
+        except Exception as e:
+            metrics.record_query_error(template)
+            print(f"❌ Query execution failed ({template or 'untagged'}): {e}")
+            raise
+        finally:
+            cursor.close()
+
+
+def get_duckdb_backend():
+    """Get or create the DuckDB backend instance"""
+    return DuckDBBackend()
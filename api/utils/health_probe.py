@@ -0,0 +1,105 @@
+"""
+Health Probe for API Endpoints
+Cached BigQuery connectivity status, refreshed in the background once it
+goes stale, so uptime monitors don't pay for (or wait on) a job per ping
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+# Probe configuration
+HEALTH_PROBE_TTL = int(os.environ.get('HEALTH_PROBE_TTL', '30'))  # seconds a result is fresh
+HEALTH_PROBE_MAX_AGE = HEALTH_PROBE_TTL * 10  # older results are refreshed before answering
+
+
+def _test_connection():
+    """Run the live connectivity check through the configured query backend"""
+    from utils.query_backend import get_query_backend
+
+    return get_query_backend().test_connection()
+
+
+class HealthProbe:
+    """
+    Connectivity status with a TTL
+
+    A stale result is served immediately while one background refresh runs;
+    a result older than max_age (e.g. after the instance was frozen) is
+    refreshed before answering.
+    """
+
+    def __init__(self, probe=_test_connection, ttl=HEALTH_PROBE_TTL, max_age=HEALTH_PROBE_MAX_AGE):
+        self.probe = probe
+        self.ttl = ttl
+        self.max_age = max_age
+        self.connected = None
+        self.checked_at = None  # time.time() of the last completed probe
+        self.latency_ms = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Run the probe now and store its result"""
+        started = time.perf_counter()
+        try:
+            connected = bool(self.probe())
+        except Exception as e:
+            print(f"WARNING: Health probe failed: {e}")
+            connected = False
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        with self._lock:
+            self.connected = connected
+            self.latency_ms = latency_ms
+            self.checked_at = time.time()
+            self._refreshing = False
+
+    def _refresh_in_background(self):
+        """Start one background refresh unless one is already running"""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self.refresh, name='health-probe', daemon=True).start()
+
+    def status(self, deep=False):
+        """
+        Get the connectivity status
+
+        Args:
+            deep: Force a live probe instead of serving the cached result
+
+        Returns:
+            dict: connected, probe (live/cached), probe_age_seconds,
+                probe_latency_ms and checked_at
+        """
+        age = None if self.checked_at is None else time.time() - self.checked_at
+        live = deep or age is None or age > self.max_age
+
+        if live:
+            self.refresh()
+        elif age > self.ttl:
+            self._refresh_in_background()
+
+        with self._lock:
+            checked_at = datetime.fromtimestamp(self.checked_at, timezone.utc)
+            return {
+                'connected': self.connected,
+                'probe': 'live' if live else 'cached',
+                'probe_age_seconds': round(time.time() - self.checked_at, 1),
+                'probe_latency_ms': round(self.latency_ms, 1),
+                'checked_at': checked_at.isoformat().replace('+00:00', 'Z')
+            }
+
+
+_health_probe = None
+
+
+def get_health_probe():
+    """Get or create the process-wide health probe"""
+    global _health_probe
+    if _health_probe is None:
+        _health_probe = HealthProbe()
+    return _health_probe
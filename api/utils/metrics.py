@@ -0,0 +1,108 @@
+"""
+Query Metrics for API Endpoints
+One structured log line per query with its job statistics, tagged by query
+template
+
+Each Vercel function runs in its own processes, so in-process counters would
+only ever describe one instance. Log lines from every instance reach the
+same log drain, where latency, bytes and cache hits are aggregated per
+template (e.g. p95 of wall_ms grouped by template).
+
+    {"event": "query", "status": "ok", "template": "analytics.summary", ...}
+"""
+
+import os
+import sys
+
+from utils.serialization import dumps
+from utils.timing import current_timing
+
+# One log line per query (QUERY_METRICS_LOG=0 disables)
+METRICS_LOG_ENABLED = os.environ.get('QUERY_METRICS_LOG', '1').lower() not in ('0', 'false', 'no')
+
+UNTAGGED = 'untagged'
+
+
+def _emit(status, template, **fields):
+    """Write one metrics line to stdout (collected by the platform's log drain)"""
+    if not METRICS_LOG_ENABLED:
+        return
+
+    template = template or UNTAGGED
+    timing = current_timing()
+    line = {
+        'event': 'query',
+        'status': status,
+        'template': template,
+        'endpoint': template.split('.')[0],
+        'request_id': timing.request_id if timing is not None else None,
+        **fields
+    }
+    sys.stdout.write(dumps(line) + '\n')
+
+
+def record_query(template, wall_ms, rows, queue_ms=None, slot_ms=None, bytes_processed=None,
+                 bytes_billed=None, cache_hit=False):
+    """
+    Record one completed query
+
+    Statistics BigQuery did not report (None) are logged as null, e.g. slot
+    time and bytes for a result-cache hit.
+
+    Args:
+        template: Query template name, e.g. 'analytics.summary'
+        wall_ms: Submit to last row, in milliseconds
+        rows: Rows returned
+        queue_ms: Job created to job started, in milliseconds
+        slot_ms: Slot milliseconds consumed
+        bytes_processed: Bytes processed
+        bytes_billed: Bytes billed
+        cache_hit: Whether BigQuery answered from its result cache
+    """
+    _emit(
+        'ok',
+        template,
+        wall_ms=round(wall_ms, 1),
+        queue_ms=round(queue_ms, 1) if queue_ms is not None else None,
+        slot_ms=slot_ms,
+        bytes_processed=bytes_processed,
+        bytes_billed=bytes_billed,
+        rows=rows,
+        cache_hit=bool(cache_hit)
+    )
+
+
+def record_query_error(template):
+    """Record one failed query"""
+    _emit('error', template)
+
+
+def record_coalesced(template):
+    """Record one call answered by an identical in-flight query (no job of its own)"""
+    _emit('coalesced', template)
+
+
+def record_job(template, job, wall_ms, rows):
+    """
+    Record a finished BigQuery job from its statistics
+
+    Args:
+        template: Query template name
+        job: google.cloud.bigquery QueryJob (done)
+        wall_ms: Submit to last row, in milliseconds
+        rows: Rows returned
+    """
+    queue_ms = None
+    if job.created is not None and job.started is not None:
+        queue_ms = (job.started - job.created).total_seconds() * 1000
+
+    record_query(
+        template,
+        wall_ms=wall_ms,
+        rows=rows,
+        queue_ms=queue_ms,
+        slot_ms=job.slot_millis,
+        bytes_processed=job.total_bytes_processed,
+        bytes_billed=job.total_bytes_billed,
+        cache_hit=bool(job.cache_hit)
+    )
@@ -0,0 +1,184 @@
+"""
+Organization Name Index for Search
+In-memory trigram index over organization names, loaded once per function
+instance, so substring search resolves candidates without a BigQuery scan
+"""
+
+import threading
+from array import array
+
+# Terms shorter than this cannot use trigram postings and fall back to a scan
+NGRAM = 3
+
+# Source rows: every searchable name, with the filer ID(s) it is filed under
+NAME_INDEX_QUERY = """
+SELECT organization_name as name, '' as filer_id
+FROM `ca-lobby.ca_lobby.v_organization_summary`
+WHERE organization_name IS NOT NULL
+UNION DISTINCT
+SELECT FILER_NAML as name, FILER_ID as filer_id
+FROM `ca-lobby.ca_lobby.cvr_lobby_disclosure_cd_partitioned`
+WHERE FROM_DATE_DATE >= '2020-01-01'
+  AND FILER_NAML IS NOT NULL
+  AND FILER_ID IS NOT NULL
+  AND TRIM(FILER_ID) != ''
+"""
+
+
+def normalize_name(name):
+    """Normalize a name or search term the way the SQL UPPER(...) LIKE did"""
+    return name.upper()
+
+
+def _ngrams(text):
+    """Distinct n-grams of a normalized string"""
+    return {text[i:i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+
+
+class NameIndex:
+    """
+    Trigram index over distinct organization names
+
+    Names are stored once in insertion order; postings map each trigram to an
+    array of name positions. A search intersects the postings of the term's
+    trigrams, smallest first, and verifies the survivors with a substring check.
+    """
+
+    def __init__(self, rows):
+        """
+        Build the index
+
+        Args:
+            rows: Iterable of (name, filer_id) pairs; filer_id may be '' or None
+        """
+        positions = {}
+        self.names = []
+        self.filer_ids = []
+
+        for name, filer_id in rows:
+            if not name:
+                continue
+            position = positions.get(name)
+            if position is None:
+                position = positions[name] = len(self.names)
+                self.names.append(name)
+                self.filer_ids.append(set())
+            if filer_id:
+                self.filer_ids[position].add(filer_id)
+
+        self._normalized = [normalize_name(name) for name in self.names]
+
+        postings = {}
+        for position, text in enumerate(self._normalized):
+            for gram in _ngrams(text):
+                postings.setdefault(gram, []).append(position)
+        self._postings = {gram: array('I', found) for gram, found in postings.items()}
+
+    def __len__(self):
+        return len(self.names)
+
+    def search(self, term):
+        """
+        Find every indexed name containing term (case-insensitive)
+
+        Args:
+            term: Search text, without wildcards
+
+        Returns:
+            list: Matching name positions, in index order
+        """
+        needle = normalize_name(term)
+        if not needle:
+            return list(range(len(self.names)))
+
+        normalized = self._normalized
+        return [position for position in self._candidates(needle) if needle in normalized[position]]
+
+    def _candidates(self, needle):
+        """
+        Name positions holding every trigram of a normalized term
+
+        Only these names get the substring check; terms shorter than a
+        trigram get every name.
+        """
+        if len(needle) < NGRAM:
+            return range(len(self.names))
+
+        lists = []
+        for gram in _ngrams(needle):
+            found = self._postings.get(gram)
+            if found is None:
+                return []
+            lists.append(found)
+        lists.sort(key=len)
+
+        candidates = set(lists[0])
+        for found in lists[1:]:
+            candidates.intersection_update(found)
+            if not candidates:
+                return []
+        return sorted(candidates)
+
+    def lookup(self, term):
+        """
+        Resolve a search term to candidate names and filer IDs
+
+        Returns:
+            tuple: (list of names, sorted list of filer IDs)
+        """
+        positions = self.search(term)
+        names = [self.names[position] for position in positions]
+        filer_ids = set()
+        for position in positions:
+            filer_ids.update(self.filer_ids[position])
+        return names, sorted(filer_ids)
+
+
+# ============================================================================
+# SHARED INSTANCE
+# ============================================================================
+
+_index = {'value': None, 'version': None, 'building': None}
+_index_lock = threading.Lock()
+
+
+def _build_index(version):
+    """Build the index for a data version and publish it (runs off the request path)"""
+    try:
+        from utils.query_backend import get_query_backend
+
+        rows = get_query_backend().iter_query(NAME_INDEX_QUERY, template='search.name_index')
+        index = NameIndex((row['name'], row['filer_id']) for row in rows)
+        print(f"✅ Name index built: {len(index):,} names")
+    except Exception as e:
+        print(f"WARNING: Name index build failed: {e}")
+        index = None
+
+    with _index_lock:
+        if index is not None:
+            _index['value'] = index
+            _index['version'] = version
+        _index['building'] = None
+
+
+def get_name_index():
+    """
+    Get the process-wide name index for the current data version
+
+    Never blocks on the build: when the index is missing or was built for an
+    older data version, one background build starts and None is returned, so
+    callers fall back to SQL LIKE until it is ready. A stale index is not
+    served because it could miss organizations added by the new load.
+    """
+    from utils.cache import get_data_version
+
+    version = get_data_version()
+    with _index_lock:
+        if _index['value'] is not None and _index['version'] == version:
+            return _index['value']
+        if _index['building'] == version:
+            return None
+        _index['building'] = version
+
+    threading.Thread(target=_build_index, args=(version,), name='name-index', daemon=True).start()
+    return None
@@ -0,0 +1,144 @@
+"""
+Query Backend Interface for API Endpoints
+Endpoints run their SQL templates through get_query_backend() instead of a
+specific database client. Two backends implement the interface:
+
+- bigquery (default): the BigQuery warehouse (utils/bigquery_client.py)
+- duckdb: an embedded engine over a local Parquet snapshot of the same
+  tables (utils/duckdb_backend.py), for millisecond answers without
+  per-query billing and for offline tests and benchmarks
+
+QUERY_BACKEND selects the backend. Templates stay written in BigQuery SQL;
+the DuckDB backend translates the handful of dialect differences.
+"""
+
+import os
+from collections import namedtuple
+
+from utils.concurrency import run_parallel
+
+# Backend used by get_query_backend(): 'bigquery' or 'duckdb'
+QUERY_BACKEND = os.environ.get('QUERY_BACKEND', 'bigquery').lower()
+
+QUERY_BACKENDS = ('bigquery', 'duckdb')
+
+# Rows fetched per results page when iterating large query results
+DEFAULT_PAGE_SIZE = 5000
+
+# A named query parameter; each backend converts it to its own form
+QueryParameter = namedtuple('QueryParameter', ['name', 'type_', 'value', 'array'])
+
+
+def scalar_param(name, type_, value):
+    """
+    Build a scalar query parameter
+
+    Args:
+        name: Parameter name as used in the SQL (@name)
+        type_: BigQuery type, e.g. 'STRING' or 'INT64'
+        value: Parameter value
+    """
+    return QueryParameter(name, type_, value, False)
+
+
+def array_param(name, type_, values):
+    """
+    Build an array query parameter
+
+    Args:
+        name: Parameter name as used in the SQL (@name)
+        type_: BigQuery element type, e.g. 'STRING'
+        values: List of element values
+    """
+    return QueryParameter(name, type_, list(values), True)
+
+
+class QueryBackend:
+    """Base class for query backends
+
+    Subclasses implement iter_query(); execute_query(), execute_queries()
+    and test_connection() are built on it.
+    """
+
+    name = None
+
+    def iter_query(self, query, params=None, page_size=DEFAULT_PAGE_SIZE, template=None):
+        """
+        Execute a query and yield rows as they are fetched
+
+        Args:
+            query (str): SQL query to execute (BigQuery dialect)
+            params (list): Query parameters (see scalar_param / array_param)
+            page_size (int): Rows fetched per page
+            template (str): Query template name, e.g. 'analytics.summary'
+
+        Yields:
+            dict: One result row keyed by column name
+        """
+        raise NotImplementedError
+
+    def execute_query(self, query, params=None, template=None):
+        """
+        Execute a query with optional parameters
+
+        Returns:
+            list: Query results as list of dictionaries
+        """
+        return list(self.iter_query(query, params, template=template))
+
+    def execute_queries(self, queries, template=None):
+        """
+        Execute several independent queries concurrently
+
+        Latency is bounded by the slowest query instead of the sum of all.
+
+        Args:
+            queries (dict): name -> SQL string, or name -> (SQL string, params)
+            template (str): Template name prefix; each query runs as '<template>.<name>'
+
+        Returns:
+            dict: name -> list of result dictionaries
+        """
+        calls = {}
+        for name, query in queries.items():
+            sql, params = query if isinstance(query, tuple) else (query, None)
+            query_template = f"{template}.{name}" if template else None
+            calls[name] = lambda sql=sql, params=params, query_template=query_template: (
+                self.execute_query(sql, params, template=query_template)
+            )
+
+        return run_parallel(calls)
+
+    def test_connection(self):
+        """Test the backend answers a trivial query"""
+        try:
+            result = self.execute_query("SELECT 1 as test", template='health')
+            return bool(result) and result[0]['test'] == 1
+        except Exception as e:
+            print(f"Connection test failed: {e}")
+            return False
+
+
+def get_query_backend(name=None):
+    """
+    Get the configured query backend instance
+
+    Backend modules are imported on first use so that neither client
+    library lands on the cold-start path.
+
+    Args:
+        name: Backend name; defaults to QUERY_BACKEND
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    name = (name or QUERY_BACKEND).lower()
+
+    if name == 'bigquery':
+        from utils.bigquery_client import get_bigquery_client
+        return get_bigquery_client()
+    if name == 'duckdb':
+        from utils.duckdb_backend import get_duckdb_backend
+        return get_duckdb_backend()
+
+    raise ValueError(f"Unknown query backend: {name} (expected one of {', '.join(QUERY_BACKENDS)})")
@@ -0,0 +1,215 @@
+"""
+Query Byte Budgets for API Endpoints
+Per-template maximum_bytes_billed, an optional dry-run cost gate with cached
+estimates, and BigQuery job labels per endpoint
+
+Budgets come from observed job bytes: backend/pipeline/byte_budgets.py reads
+each template's peak billed bytes from the jobs view (by the labels set here)
+and prints the QUERY_BYTE_BUDGETS value. TEMPLATE_BYTE_BUDGETS only covers
+templates without an observed budget.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+
+from utils.cache import LRUCache
+
+GIB = 1 << 30
+
+# Budget for queries without a more specific entry below
+DEFAULT_MAX_BYTES_BILLED = int(os.environ.get('QUERY_MAX_BYTES_BILLED', str(10 * GIB)))
+
+# Fallback bytes a template may bill, keyed by template or template prefix; the
+# most specific entry wins ('analytics.summary' before 'analytics')
+TEMPLATE_BYTE_BUDGETS = {
+    'health': 100 * (1 << 20),
+    'data_version': 100 * (1 << 20),
+    'analytics': 1 * GIB,
+    'search': 2 * GIB,
+    'organization': 2 * GIB,
+    'database_stats': 4 * GIB,
+}
+
+# BigQuery error reason when a job would bill more than maximum_bytes_billed
+BILLING_LIMIT_REASON = 'bytesBilledLimitExceeded'
+
+# Dry runs add a round trip per uncached query, so the gate is opt-in
+DRY_RUN_ENABLED = os.environ.get('QUERY_DRY_RUN', '').lower() in ('1', 'true', 'yes')
+DRY_RUN_CACHE_SIZE = 512  # cached estimates per instance
+DRY_RUN_CACHE_TTL = 3600  # seconds; estimates drift as tables grow
+
+JOB_LABEL_APP = 'ca-lobby-api'
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised when a query is over its template's byte budget
+
+    Either a dry run estimated it above budget, or BigQuery stopped the job
+    at maximum_bytes_billed (estimated_bytes is then BigQuery's stated
+    minimum, or None if the error did not give one).
+    """
+
+    def __init__(self, template, estimated_bytes, budget):
+        self.template = template
+        self.estimated_bytes = estimated_bytes
+        self.budget = budget
+        processed = f"{estimated_bytes:,} bytes" if estimated_bytes is not None else "more bytes"
+        super().__init__(
+            f"Query {template or '(untagged)'} would process {processed} (budget {budget:,})"
+        )
+
+
+def _load_observed_budgets():
+    """Parse QUERY_BYTE_BUDGETS (JSON: query_template label value -> bytes)"""
+    raw = os.environ.get('QUERY_BYTE_BUDGETS')
+    if not raw:
+        return {}
+    try:
+        return {str(label): int(budget) for label, budget in json.loads(raw).items()}
+    except (ValueError, TypeError, AttributeError) as e:
+        print(f"WARNING: Ignoring invalid QUERY_BYTE_BUDGETS: {e}")
+        return {}
+
+
+# Budgets derived from observed job bytes, keyed by query_template label value
+OBSERVED_BYTE_BUDGETS = _load_observed_budgets()
+
+
+def budget_for(template):
+    """
+    Get the maximum bytes billed for a query template
+
+    An observed budget for the exact template wins; otherwise the most
+    specific TEMPLATE_BYTE_BUDGETS entry applies.
+
+    Args:
+        template: Dotted template name, e.g. 'search.results.count' (or None)
+
+    Returns:
+        int: Byte budget for the template
+    """
+    if template and _label_value(template) in OBSERVED_BYTE_BUDGETS:
+        return OBSERVED_BYTE_BUDGETS[_label_value(template)]
+
+    name = template or ''
+    while name:
+        if name in TEMPLATE_BYTE_BUDGETS:
+            return TEMPLATE_BYTE_BUDGETS[name]
+        name = name.rpartition('.')[0]
+    return DEFAULT_MAX_BYTES_BILLED
+
+
+def _label_value(value):
+    """Sanitize a label value (lowercase letters, digits, '_' and '-', max 63 chars)"""
+    return re.sub(r'[^a-z0-9_-]', '_', value.lower())[:63]
+
+
+def job_labels(template):
+    """
+    Build BigQuery job labels for a query template
+
+    Labels show up in INFORMATION_SCHEMA.JOBS and billing exports, so cost can
+    be attributed per endpoint and template.
+
+    Args:
+        template: Dotted template name (or None)
+
+    Returns:
+        dict: Label name -> value
+    """
+    labels = {'app': JOB_LABEL_APP}
+    if template:
+        labels['endpoint'] = _label_value(template.split('.')[0])
+        labels['query_template'] = _label_value(template)
+    return labels
+
+
+# Query fingerprint -> (estimated bytes, estimated at)
+_estimates = LRUCache(DRY_RUN_CACHE_SIZE)
+
+
+def _fingerprint(query, params, template):
+    """Cache key for a query's estimate (SQL text, parameter values, template)"""
+    raw = f"{template}\x00{query}\x00{params!r}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def estimate_bytes(query, params, template, dry_run):
+    """
+    Get a query's estimated bytes processed, dry-running it on a cache miss
+
+    Args:
+        query: SQL text
+        params: Query parameters (their repr is part of the cache key)
+        template: Dotted template name
+        dry_run: Zero-argument callable returning the dry run's bytes processed
+
+    Returns:
+        int: Estimated bytes processed
+    """
+    key = _fingerprint(query, params, template)
+    hit, cached = _estimates.get(key)
+    if hit and time.time() - cached[1] < DRY_RUN_CACHE_TTL:
+        return cached[0]
+
+    estimate = dry_run() or 0
+    _estimates.set(key, (estimate, time.time()))
+    return estimate
+
+
+def check_query_budget(query, params, template, dry_run):
+    """
+    Reject a query whose dry-run estimate exceeds its template's budget
+
+    Does nothing unless the dry-run gate is enabled (QUERY_DRY_RUN=1); the
+    maximum_bytes_billed job setting still caps every query.
+
+    Args:
+        query: SQL text
+        params: Query parameters
+        template: Dotted template name
+        dry_run: Zero-argument callable returning the dry run's bytes processed
+
+    Returns:
+        int: Estimated bytes processed, or None if the gate is disabled
+
+    Raises:
+        QueryBudgetExceeded: If the estimate is above budget_for(template)
+    """
+    if not DRY_RUN_ENABLED:
+        return None
+
+    estimate = estimate_bytes(query, params, template, dry_run)
+    budget = budget_for(template)
+    if estimate > budget:
+        raise QueryBudgetExceeded(template, estimate, budget)
+    return estimate
+
+
+def billing_limit_error(template, error):
+    """
+    Translate BigQuery's bytes-billed-limit failure into QueryBudgetExceeded
+
+    Args:
+        template: Dotted template name of the failed query
+        error: Exception raised by the query job
+
+    Returns:
+        QueryBudgetExceeded, or None if the error is anything else
+    """
+    details = getattr(error, 'errors', None) or []
+    reasons = [item.get('reason') for item in details if isinstance(item, dict)]
+    if BILLING_LIMIT_REASON not in reasons:
+        return None
+
+    # e.g. "Query exceeded limit for bytes billed: 1000. 10485760 or higher required."
+    required = re.search(r'(\d+) or higher required', str(error))
+    return QueryBudgetExceeded(template, int(required.group(1)) if required else None, budget_for(template))
+
+
+def clear_estimates():
+    """Forget all cached dry-run estimates"""
+    _estimates.clear()
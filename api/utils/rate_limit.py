@@ -1,43 +1,129 @@
 """
 Rate Limiting Utility for API Endpoints
-Simple in-memory rate limiter (resets on cold start)
+Sliding-window-counter rate limiter with bounded memory (resets on cold start)
+
+Each IP keeps two counters (current and previous fixed window); the sliding
+window count is the previous count weighted by its overlap plus the current
+count. Every call is O(1) regardless of request rate or number of IPs.
+
+Requests are charged by cost rather than one unit each: a static weight per
+endpoint / query type plus the bytes its query templates have historically
+scanned, so heavy searches drain a client's budget faster than health pings.
 """
 
-from datetime import datetime, timedelta
-from collections import defaultdict
+import os
+import math
+import threading
+import time
+from collections import OrderedDict
 
-# In-memory storage for request counts
-# Note: This resets on serverless cold start, which is acceptable for basic protection
-request_counts = defaultdict(list)
+from utils.response import error_response
 
 # Rate limit configuration
 RATE_LIMIT = 60  # requests per minute per IP
 WINDOW = 60  # seconds
+MAX_TRACKED_KEYS = 100000  # least recently seen IPs are dropped beyond this
+EVICTIONS_PER_CALL = 2  # idle IPs dropped per new IP (keeps each call O(1))
+
+# Cost configuration (units of RATE_LIMIT)
+# Static weight per endpoint or 'endpoint.query_type'; the most specific key wins
+ENDPOINT_COSTS = {
+    'health': 0.5,
+    'health.deep': 2,  # forces a live BigQuery probe
+    'analytics': 1,
+    'search': 2,
+    'organization': 2,  # four filer-clustered queries
+    'database_stats': 4,
+}
+BYTES_PER_COST_UNIT = int(os.environ.get('RATE_LIMIT_BYTES_PER_UNIT', str(1 << 30)))  # 1 GiB
+MAX_REQUEST_COST = 10
+BYTES_EWMA_ALPHA = 0.3  # weight of the newest observation in the bytes average
+
+
+class WindowCounter:
+    """Fixed-size per-IP state: counts for the current and previous windows"""
+
+    __slots__ = ('window_start', 'current', 'previous')
+
+    def __init__(self, window_start):
+        self.window_start = window_start
+        self.current = 0
+        self.previous = 0
+
+    def advance(self, window_start):
+        """Roll the counts forward to the window starting at window_start"""
+        if window_start == self.window_start:
+            return
+        self.previous = self.current if window_start - self.window_start == WINDOW else 0
+        self.current = 0
+        self.window_start = window_start
+
+    def estimate(self, now):
+        """Requests in the sliding window ending now"""
+        overlap = 1 - (now - self.window_start) / WINDOW
+        return self.previous * overlap + self.current
+
+
+# In-memory state, least recently seen IP first
+# Note: This resets on serverless cold start, which is acceptable for basic protection
+request_counts = OrderedDict()
+_lock = threading.Lock()
+
 
+def _window_start(now):
+    """Start of the fixed window containing now"""
+    return now - now % WINDOW
 
-def check_rate_limit(ip: str) -> bool:
+
+def _evict(window_start):
+    """Drop idle IPs from the least recently seen end, then enforce the key cap"""
+    # An IP last seen two or more windows ago counts zero: dropping it is free
+    for _ in range(EVICTIONS_PER_CALL):
+        ip, counter = next(iter(request_counts.items()))
+        if counter.window_start >= window_start - WINDOW:
+            break
+        del request_counts[ip]
+
+    while len(request_counts) > MAX_TRACKED_KEYS:
+        request_counts.popitem(last=False)
+
+
+def _get_counter(ip, now):
+    """Get or create the counter for an IP and mark it most recently seen"""
+    window_start = _window_start(now)
+    counter = request_counts.get(ip)
+    if counter is None:
+        counter = request_counts[ip] = WindowCounter(window_start)
+        _evict(window_start)
+    else:
+        request_counts.move_to_end(ip)
+        counter.advance(window_start)
+    return counter
+
+
+def check_rate_limit(ip: str, cost: float = 1) -> bool:
     """
     Check if a request should be allowed based on rate limiting.
 
     Args:
         ip: The client IP address
+        cost: Units this request consumes (see request_cost)
 
     Returns:
         True if request should be allowed, False if rate limited
     """
-    now = datetime.now()
-    cutoff = now - timedelta(seconds=WINDOW)
+    now = time.time()
 
-    # Clean old requests outside the window
-    request_counts[ip] = [t for t in request_counts[ip] if t > cutoff]
+    with _lock:
+        counter = _get_counter(ip, now)
 
-    # Check if over limit
-    if len(request_counts[ip]) >= RATE_LIMIT:
-        return False
+        # Check if over limit
+        if counter.estimate(now) + cost > RATE_LIMIT:
+            return False
 
-    # Record this request
-    request_counts[ip].append(now)
-    return True
+        # Record this request
+        counter.current += cost
+        return True
 
 
 def get_rate_limit_headers(ip: str) -> dict:
@@ -50,12 +136,119 @@ def get_rate_limit_headers(ip: str) -> dict:
     Returns:
         Dictionary of rate limit headers
     """
-    now = datetime.now()
-    cutoff = now - timedelta(seconds=WINDOW)
-    current_count = len([t for t in request_counts.get(ip, []) if t > cutoff])
+    now = time.time()
+    window_start = _window_start(now)
+
+    with _lock:
+        counter = request_counts.get(ip)
+        if counter is None:
+            current_count = 0
+        else:
+            counter.advance(window_start)
+            current_count = math.ceil(counter.estimate(now))
 
     return {
         "X-RateLimit-Limit": str(RATE_LIMIT),
         "X-RateLimit-Remaining": str(max(0, RATE_LIMIT - current_count)),
-        "X-RateLimit-Reset": str(int((cutoff + timedelta(seconds=WINDOW)).timestamp()))
+        "X-RateLimit-Reset": str(int(window_start + WINDOW))
     }
+
+
+# ============================================================================
+# COST WEIGHTS
+# ============================================================================
+
+# Query template -> moving average of bytes processed per run
+template_bytes = {}
+_template_lock = threading.Lock()
+
+
+def record_query_bytes(template, bytes_processed):
+    """
+    Record the bytes one run of a query template processed
+
+    Called by the shared BigQuery client after every job. Templates are
+    dotted names, e.g. 'analytics.summary' or 'database_stats.payments'.
+
+    Args:
+        template: Query template name (None is ignored)
+        bytes_processed: Bytes the job processed (None is ignored)
+    """
+    if not template or bytes_processed is None:
+        return
+
+    with _template_lock:
+        previous = template_bytes.get(template)
+        template_bytes[template] = (
+            bytes_processed if previous is None
+            else previous + BYTES_EWMA_ALPHA * (bytes_processed - previous)
+        )
+
+
+def request_cost(endpoint, query_type=None):
+    """
+    Cost of one request in rate limit units
+
+    The static weight for the endpoint (or endpoint.query_type) plus one unit
+    per BYTES_PER_COST_UNIT its templates have historically scanned, capped at
+    MAX_REQUEST_COST. Templates under the key count towards it, so
+    'database_stats' includes 'database_stats.payments' and friends.
+
+    Args:
+        endpoint: Endpoint name, e.g. 'search'
+        query_type: Optional query type, e.g. 'summary' for analytics
+
+    Returns:
+        float: Units to charge
+    """
+    key = f"{endpoint}.{query_type}" if query_type else endpoint
+    weight = ENDPOINT_COSTS.get(key, ENDPOINT_COSTS.get(endpoint, 1))
+
+    prefix = key + '.'
+    with _template_lock:
+        scanned = sum(
+            value for template, value in template_bytes.items()
+            if template == key or template.startswith(prefix)
+        )
+
+    return min(MAX_REQUEST_COST, weight + scanned / BYTES_PER_COST_UNIT)
+
+
+def client_ip(handler):
+    """Client IP of a request (first X-Forwarded-For hop behind the Vercel proxy)"""
+    forwarded = handler.headers.get('X-Forwarded-For', '').split(',')[0].strip()
+    if forwarded:
+        return forwarded
+    return handler.client_address[0] if getattr(handler, 'client_address', None) else ''
+
+
+def enforce_rate_limit(handler, cost=1):
+    """
+    Charge a request against its client's budget, answering 429 if exhausted
+
+    Args:
+        handler: BaseHTTPRequestHandler instance
+        cost: Units this request consumes (see request_cost)
+
+    Returns:
+        bool: True if the request may proceed, False if a 429 was sent
+    """
+    ip = client_ip(handler)
+    if check_rate_limit(ip, cost):
+        return True
+
+    body, status, headers = error_response(
+        message="Rate limit exceeded. Please slow down and try again shortly.",
+        status_code=429,
+        error_type="RateLimitError"
+    )
+    rate_headers = get_rate_limit_headers(ip)
+    retry_after = max(1, int(rate_headers['X-RateLimit-Reset']) - int(time.time()))
+    headers = {**headers, **rate_headers, 'Retry-After': str(retry_after)}
+
+    handler.send_response(status)
+    for key, value in headers.items():
+        handler.send_header(key, value)
+    handler.end_headers()
+    handler.wfile.write(body.encode())
+    return False
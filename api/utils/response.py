@@ -1,12 +1,50 @@
 """
 Response Utilities for API Endpoints
-Provides consistent JSON response formatting
+Provides consistent JSON response formatting, HTTP revalidation (ETag / 304)
+and a streaming, compressed response writer
 """
 
-import json
+import os
+import zlib
 from datetime import datetime
 
-def success_response(data, status_code=200, metadata=None):
+from utils.serialization import dumps, get_row_encoder, is_row_list
+from utils.timing import span, current_timing, timing_headers
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "https://ca-lobbymono.vercel.app",
+    "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type"
+}
+
+# Browsers revalidate after a minute; the CDN keeps responses longer and may
+# serve a stale copy while it revalidates in the background. Data only changes
+# once per pipeline load, and the ETag changes with the data version.
+CACHE_CONTROL = os.environ.get(
+    'RESPONSE_CACHE_CONTROL',
+    'public, max-age=60, s-maxage=300, stale-while-revalidate=86400'
+)
+
+
+# Rows are encoded and written in batches of this many rows
+STREAM_CHUNK_ROWS = 500
+
+
+def _headers(etag=None):
+    """Build JSON response headers, with caching headers when an ETag is given"""
+    headers = {"Content-Type": "application/json", **CORS_HEADERS, **timing_headers()}
+    if etag:
+        headers["ETag"] = etag
+        headers["Cache-Control"] = CACHE_CONTROL
+    return headers
+
+
+def success_response(data, status_code=200, metadata=None, etag=None):
     """
     Create a successful JSON response
 
@@ -14,10 +52,20 @@ def success_response(data, status_code=200, metadata=None):
         data: Response data (dict, list, or primitive)
         status_code: HTTP status code (default: 200)
         metadata: Optional metadata dictionary
+        etag: Optional ETag; adds ETag and Cache-Control headers
 
     Returns:
         tuple: (response_body, status_code, headers)
     """
+    return (
+        dumps(_success_payload(data, metadata)),  # dates/decimals encode as strings
+        status_code,
+        _headers(etag)
+    )
+
+
+def _success_payload(data, metadata=None):
+    """Build the success response envelope"""
     response = {
         "success": True,
         "data": data,
@@ -28,18 +76,8 @@ def success_response(data, status_code=200, metadata=None):
     if metadata:
         response["metadata"] = metadata
 
-    headers = {
-        "Content-Type": "application/json",
-        "Access-Control-Allow-Origin": "https://ca-lobbymono.vercel.app",
-        "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
-        "Access-Control-Allow-Headers": "Content-Type"
-    }
+    return response
 
-    return (
-        json.dumps(response, default=str),  # default=str handles dates
-        status_code,
-        headers
-    )
 
 def error_response(message, status_code=500, error_type="ServerError"):
     """
@@ -62,43 +100,307 @@ def error_response(message, status_code=500, error_type="ServerError"):
         "timestamp": datetime.utcnow().isoformat() + "Z"
     }
 
-    headers = {
-        "Content-Type": "application/json",
-        "Access-Control-Allow-Origin": "https://ca-lobbymono.vercel.app",
-        "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
-        "Access-Control-Allow-Headers": "Content-Type"
-    }
-
     return (
-        json.dumps(response),
+        dumps(response),
         status_code,
-        headers
+        _headers()
     )
 
-def paginated_response(data, page, limit, total_count):
+
+def paginated_response(data, page, limit, total_count, next_cursor=None, cursor_mode=False,
+                       approximate=False, etag=None):
     """
-    Create a paginated response with metadata
+    Create a paginated response
+
+    In cursor mode, has_next follows next_cursor and the cursor is returned
+    alongside the usual page counters. approximate flags an estimated total_count.
 
     Args:
         data: List of items for current page
         page: Current page number
         limit: Items per page
         total_count: Total number of items available
+        next_cursor: Cursor for the next page (cursor mode)
+        cursor_mode: Whether the request used keyset pagination
+        approximate: Whether total_count is an estimate
+        etag: Optional ETag; adds ETag and Cache-Control headers
 
     Returns:
         tuple: (response_body, status_code, headers)
     """
+    return (
+        dumps(_paginated_payload(data, page, limit, total_count, next_cursor, cursor_mode,
+                                 approximate)),
+        200,
+        _headers(etag)
+    )
+
+
+def _paginated_payload(data, page, limit, total_count, next_cursor=None, cursor_mode=False,
+                       approximate=False):
+    """Build the paginated response envelope"""
     total_pages = (total_count + limit - 1) // limit  # Ceiling division
 
-    metadata = {
-        "pagination": {
-            "page": page,
-            "limit": limit,
-            "total_count": total_count,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1
-        }
+    pagination = {
+        "page": page,
+        "limit": limit,
+        "total_count": total_count,
+        "total_pages": total_pages,
+        "has_next": page < total_pages,
+        "has_previous": page > 1
     }
 
-    return success_response(data, metadata=metadata)
+    if cursor_mode:
+        pagination["has_next"] = next_cursor is not None
+        pagination["next_cursor"] = next_cursor
+
+    if approximate:
+        pagination["total_count_approximate"] = True
+
+    return {
+        "success": True,
+        "data": data,
+        "pagination": pagination,
+        "timestamp": datetime.utcnow().isoformat() + "Z"
+    }
+
+
+def etag_matches(if_none_match, etag):
+    """
+    Check an If-None-Match request header against the current ETag
+
+    Uses the weak comparison required for If-None-Match (RFC 9110 13.1.2).
+
+    Args:
+        if_none_match: Raw If-None-Match header value (or None)
+        etag: Current ETag of the resource
+
+    Returns:
+        bool: True if the client's copy is current
+    """
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+
+    def opaque(tag):
+        tag = tag.strip()
+        return tag[2:] if tag.startswith('W/') else tag
+
+    return opaque(etag) in {opaque(tag) for tag in if_none_match.split(',')}
+
+
+def not_modified_response(etag):
+    """
+    Create a 304 Not Modified response (no body)
+
+    Args:
+        etag: Current ETag of the resource
+
+    Returns:
+        tuple: (response_body, status_code, headers)
+    """
+    headers = {
+        **CORS_HEADERS,
+        **timing_headers(),
+        "ETag": etag,
+        "Cache-Control": CACHE_CONTROL,
+        "Vary": "Accept-Encoding"
+    }
+    return '', 304, headers
+
+
+# ============================================================================
+# STREAMING WRITER
+# ============================================================================
+
+def negotiate_encoding(accept_encoding):
+    """
+    Pick a content encoding from an Accept-Encoding header
+
+    Prefers brotli (when installed) over gzip; honours q=0 exclusions.
+
+    Args:
+        accept_encoding: Raw Accept-Encoding header value (or None)
+
+    Returns:
+        str: 'br', 'gzip' or None for identity
+    """
+    accepted = set()
+    for part in (accept_encoding or '').split(','):
+        name, _, params = part.strip().partition(';')
+        try:
+            q = float(params.strip()[2:]) if params.strip().startswith('q=') else 1.0
+        except ValueError:
+            q = 1.0
+        if name and q > 0:
+            accepted.add(name.strip().lower())
+
+    if brotli is not None and ('br' in accepted or '*' in accepted):
+        return 'br'
+    if 'gzip' in accepted or '*' in accepted:
+        return 'gzip'
+    return None
+
+
+class _Compressor:
+    """Incremental compressor for one response body"""
+
+    def __init__(self, encoding):
+        if encoding == 'br':
+            self._brotli = brotli.Compressor()
+            self._zlib = None
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip container
+
+    def compress(self, data):
+        return self._brotli.process(data) if self._brotli else self._zlib.compress(data)
+
+    def finish(self):
+        return self._brotli.finish() if self._brotli else self._zlib.flush()
+
+
+def iter_json_chunks(payload, chunk_rows=STREAM_CHUNK_ROWS):
+    """
+    Encode a response envelope as JSON text in chunks
+
+    A list of rows under "data" is encoded in batches with the query's row
+    encoder, so the full body never exists as one string. The concatenated
+    output decodes to the same value as dumps(payload).
+
+    Args:
+        payload: Response envelope dict
+        chunk_rows: Rows per yielded chunk
+
+    Yields:
+        str: JSON text fragments
+    """
+    buffer = []
+
+    for i, (key, value) in enumerate(payload.items()):
+        buffer.append(('{' if i == 0 else ',') + dumps(key) + ':')
+
+        if key != 'data' or not is_row_list(value):
+            buffer.append(dumps(value))
+            continue
+
+        encoder = get_row_encoder(value)
+        buffer.append('[')
+        for start in range(0, len(value), chunk_rows):
+            rows = encoder.encode_rows(value[start:start + chunk_rows])[1:-1]  # strip [ ]
+            buffer.append(rows if start == 0 else ',' + rows)
+            yield ''.join(buffer)
+            buffer = []
+        buffer.append(']')
+
+    buffer.append('}' if payload else '{}')
+    yield ''.join(buffer)
+
+
+def write_json(handler, payload, status_code=200, headers=None):
+    """
+    Stream a JSON response envelope to a request handler
+
+    Compresses with gzip/brotli when the client accepts it. The handlers run
+    on BaseHTTPRequestHandler's default HTTP/1.0 and their rows arrive as
+    materialized lists from the response cache, so the body is written
+    close-delimited as it is encoded (no chunked transfer encoding); the win
+    is never holding the full JSON text and its encoded copy at once.
+
+    With request timing on, the body is encoded before the headers go out so
+    the Server-Timing header includes the encode span.
+
+    Args:
+        handler: BaseHTTPRequestHandler instance
+        payload: Response envelope dict
+        status_code: HTTP status code
+        headers: Response headers (without Content-Length)
+    """
+    encoding = negotiate_encoding(handler.headers.get('Accept-Encoding'))
+    compressor = _Compressor(encoding) if encoding else None
+    timing = current_timing()
+
+    def encoded():
+        for chunk in iter_json_chunks(payload):
+            data = chunk.encode()
+            yield compressor.compress(data) if compressor else data
+        if compressor:
+            yield compressor.finish()
+
+    body = encoded()
+    if timing is not None and timing.enabled:
+        with span('encode'):
+            body = list(body)
+        headers = {**(headers or {}), **timing_headers()}
+
+    handler.send_response(status_code)
+    for key, value in (headers or {}).items():
+        handler.send_header(key, value)
+    handler.send_header('Vary', 'Accept-Encoding')
+    if encoding:
+        handler.send_header('Content-Encoding', encoding)
+    handler.end_headers()
+
+    for data in body:
+        if data:
+            handler.wfile.write(data)
+
+
+def send_bytes(handler, body, content_type, etag=None, headers=None):
+    """
+    Send a binary response body (e.g. an Arrow IPC stream)
+
+    Args:
+        handler: BaseHTTPRequestHandler instance
+        body: Response bytes
+        content_type: MIME type of the body
+        etag: Optional ETag; adds ETag and Cache-Control headers
+        headers: Optional extra headers (e.g. X-Cache)
+    """
+    all_headers = {**_headers(etag), **(headers or {})}
+    all_headers['Content-Type'] = content_type
+    all_headers['Content-Length'] = str(len(body))
+
+    handler.send_response(200)
+    for key, value in all_headers.items():
+        handler.send_header(key, value)
+    handler.end_headers()
+    handler.wfile.write(body)
+
+
+def send_success(handler, data, status_code=200, metadata=None, etag=None, headers=None):
+    """
+    Stream a successful JSON response (streaming counterpart of success_response)
+
+    Args:
+        handler: BaseHTTPRequestHandler instance
+        data: Response data (dict, list, or primitive)
+        status_code: HTTP status code (default: 200)
+        metadata: Optional metadata dictionary
+        etag: Optional ETag; adds ETag and Cache-Control headers
+        headers: Optional extra headers (e.g. X-Cache)
+    """
+    write_json(handler, _success_payload(data, metadata), status_code,
+               {**_headers(etag), **(headers or {})})
+
+
+def send_paginated(handler, data, page, limit, total_count, next_cursor=None, cursor_mode=False,
+                   approximate=False, etag=None, headers=None):
+    """
+    Stream a paginated JSON response (streaming counterpart of paginated_response)
+
+    Args:
+        handler: BaseHTTPRequestHandler instance
+        data: List of items for current page
+        page: Current page number
+        limit: Items per page
+        total_count: Total number of items available
+        next_cursor: Cursor for the next page (cursor mode)
+        cursor_mode: Whether the request used keyset pagination
+        approximate: Whether total_count is an estimate
+        etag: Optional ETag; adds ETag and Cache-Control headers
+        headers: Optional extra headers (e.g. X-Cache)
+    """
+    payload = _paginated_payload(data, page, limit, total_count, next_cursor, cursor_mode, approximate)
+    write_json(handler, payload, 200, {**_headers(etag), **(headers or {})})
@@ -0,0 +1,138 @@
+"""
+JSON Serialization for API Responses
+Typed per-query row encoders with a fast JSON backend (orjson when installed)
+
+Output matches json.dumps(value, default=str) value-for-value: Decimal and
+NUMERIC become strings, dates ISO strings, datetimes str(datetime).
+"""
+
+import json
+import threading
+from datetime import date, datetime, time
+from decimal import Decimal
+
+try:
+    import orjson
+except ImportError:  # optional; falls back to the standard library
+    orjson = None
+
+MAX_CACHED_ENCODERS = 256
+SAMPLE_ROWS = 1000  # rows inspected to infer column types
+
+
+def _default(value):
+    """Fallback for values without a native JSON type (matches default=str)"""
+    return str(value)
+
+
+if orjson is not None:
+    # orjson encodes date/time exactly like str() and Decimal goes through the
+    # (cheap) default; only datetime differs ('T' separator), so only datetime
+    # columns are converted in Python
+    CONVERTED_VALUE_TYPES = (datetime,)
+
+    _ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    _ORJSON_ROW_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(value):
+        """Encode a value as JSON text"""
+        return orjson.dumps(value, default=_default, option=_ORJSON_OPTIONS).decode()
+
+    def _dumps_rows(rows):
+        """Encode converted rows (datetime columns already strings)"""
+        return orjson.dumps(rows, default=_default, option=_ORJSON_ROW_OPTIONS).decode()
+else:
+    # The standard library has no native date/Decimal support: convert them all
+    CONVERTED_VALUE_TYPES = (Decimal, date, datetime, time, bytes)
+
+    def dumps(value):
+        """Encode a value as JSON text"""
+        return json.dumps(value, default=_default)
+
+    _dumps_rows = dumps
+
+
+class RowEncoder:
+    """
+    Encoder for rows of one query shape
+
+    Only the columns whose type needs converting are touched per row; rows of
+    all-native columns go straight to the JSON backend.
+    """
+
+    def __init__(self, converted_columns):
+        self.converted_columns = tuple(converted_columns)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Build an encoder by inspecting value types in a sample of rows
+
+        Each column is typed by its first non-NULL value in the sample.
+        """
+        sample = rows[:SAMPLE_ROWS]
+        columns = []
+        for key in sample[0]:
+            value = next((row.get(key) for row in sample if row.get(key) is not None), None)
+            if isinstance(value, CONVERTED_VALUE_TYPES):
+                columns.append(key)
+        return cls(columns)
+
+    def convert(self, row):
+        """Return the row with converted columns replaced by their JSON-ready values"""
+        if not self.converted_columns:
+            return row
+        converted = dict(row)
+        for column in self.converted_columns:
+            value = converted.get(column)
+            if value is not None:
+                converted[column] = str(value)
+        return converted
+
+    def encode_rows(self, rows):
+        """Encode a list of rows as a JSON array"""
+        if not self.converted_columns:
+            return _dumps_rows(rows)
+        return _dumps_rows([self.convert(row) for row in rows])
+
+
+_NO_CONVERSION = RowEncoder(())
+_encoders = {}
+_encoders_lock = threading.Lock()
+
+
+def get_row_encoder(rows):
+    """
+    Get the cached encoder for a list of rows (dicts)
+
+    Keyed on the column names and value types of the first row, so each query
+    shape is compiled once. An empty list gets an encoder with no converted
+    columns.
+    """
+    if not rows:
+        return _NO_CONVERSION
+    signature = tuple((key, type(value)) for key, value in rows[0].items())
+    encoder = _encoders.get(signature)
+    if encoder is None:
+        encoder = RowEncoder.from_rows(rows)
+        with _encoders_lock:
+            if len(_encoders) >= MAX_CACHED_ENCODERS:
+                _encoders.clear()
+            _encoders[signature] = encoder
+    return encoder
+
+
+def is_row_list(value):
+    """Whether a value is a list of result rows (dicts); an empty list is zero rows"""
+    return isinstance(value, list) and all(isinstance(row, dict) for row in value[:1])
+
+
+def encode_rows(rows):
+    """
+    Encode a list of result rows (dicts) as a JSON array
+
+    Falls back to the generic encoder for anything that is not a list of dicts.
+    """
+    if not is_row_list(rows):
+        return dumps(rows)
+    return get_row_encoder(rows).encode_rows(rows)
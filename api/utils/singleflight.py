@@ -0,0 +1,63 @@
+"""
+Single-Flight Coalescing for API Endpoints
+Concurrent identical calls share one execution: the first caller runs it
+and the others wait on its result (e.g. one BigQuery job for a burst of
+identical dashboard requests)
+"""
+
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key"""
+
+    def __init__(self):
+        self._calls = {}  # key -> [Future of the in-flight call, number of waiters]
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """
+        Run fn once for all concurrent callers with the same key
+
+        Exceptions from fn are raised to every caller waiting on that call.
+        Calls are only coalesced while in flight; nothing is cached.
+
+        Args:
+            key: Hashable call identity
+            fn: Zero-argument callable
+
+        Returns:
+            tuple: (result, shared) where shared is True whenever the result
+                object went to more than one caller (the runner included)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = [Future(), 0]
+            else:
+                call[1] += 1
+
+        future = call[0]
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+        # No waiter can join once the key is removed
+        return result, call[1] > 0
+
+    def in_flight(self):
+        """Number of calls currently running"""
+        with self._lock:
+            return len(self._calls)
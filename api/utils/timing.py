@@ -0,0 +1,131 @@
+"""
+Request Timing for API Endpoints
+Request-scoped timing spans reported in a Server-Timing header, plus a
+request id for every response
+
+Spans are off unless SERVER_TIMING=1; while off, span() returns a shared
+no-op context manager, so instrumented code pays one context variable read.
+"""
+
+import os
+import re
+import threading
+import time
+import uuid
+import contextvars
+from contextlib import nullcontext
+
+TIMING_ENABLED = os.environ.get('SERVER_TIMING', '').lower() in ('1', 'true', 'yes')
+
+# Incoming request id headers honoured, in order (X-Request-Id, then Vercel's own)
+REQUEST_ID_HEADERS = ('X-Request-Id', 'X-Vercel-Id')
+MAX_REQUEST_ID_LENGTH = 128
+
+_NO_SPAN = nullcontext()
+
+_current = contextvars.ContextVar('request_timing', default=None)
+
+
+class RequestTiming:
+    """Timing state for one request: its id and accumulated span durations"""
+
+    __slots__ = ('request_id', 'enabled', 'started', 'spans', '_lock')
+
+    def __init__(self, request_id, enabled=None):
+        self.request_id = request_id
+        self.enabled = TIMING_ENABLED if enabled is None else enabled
+        self.started = time.perf_counter()
+        self.spans = {}  # name -> total milliseconds, in first-seen order
+        self._lock = threading.Lock()  # spans may close in run_parallel threads
+
+    def add(self, name, ms):
+        """Add a duration to a span (repeated spans accumulate)"""
+        with self._lock:
+            self.spans[name] = self.spans.get(name, 0.0) + ms
+
+    def header_value(self, names=None):
+        """Format spans (all, or only the given names) as a Server-Timing value"""
+        with self._lock:
+            spans = [(name, ms) for name, ms in self.spans.items() if names is None or name in names]
+        spans.append(('total', (time.perf_counter() - self.started) * 1000))
+        return ', '.join(f"{name};dur={ms:.1f}" for name, ms in spans)
+
+
+class _Span:
+    """Context manager timing one block into the current request"""
+
+    __slots__ = ('timing', 'name', 'started')
+
+    def __init__(self, timing, name):
+        self.timing = timing
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timing.add(self.name, (time.perf_counter() - self.started) * 1000)
+        return False
+
+
+def _incoming_request_id(handler):
+    """A well-formed request id sent by the client or the Vercel proxy, if any"""
+    headers = getattr(handler, 'headers', None) or {}
+    for name in REQUEST_ID_HEADERS:
+        value = (headers.get(name) or '').strip()
+        if value and len(value) <= MAX_REQUEST_ID_LENGTH and re.fullmatch(r'[\w.:-]+', value):
+            return value
+    return None
+
+
+def begin_request(handler):
+    """
+    Start timing a request; call at the top of every do_GET
+
+    Args:
+        handler: BaseHTTPRequestHandler instance
+
+    Returns:
+        RequestTiming: State for this request (also the current context's)
+    """
+    timing = RequestTiming(_incoming_request_id(handler) or uuid.uuid4().hex)
+    _current.set(timing)
+    return timing
+
+
+def current_timing():
+    """The current request's timing state (None outside a request)"""
+    return _current.get()
+
+
+def span(name):
+    """
+    Time a block as a named span of the current request
+
+    Usage:
+        with span('query_submit'):
+            job = client.query(...)
+
+    Returns a no-op context manager when timing is off or outside a request.
+    """
+    timing = _current.get()
+    if timing is None or not timing.enabled:
+        return _NO_SPAN
+    return _Span(timing, name)
+
+
+def timing_headers():
+    """
+    Response headers for the current request
+
+    Returns:
+        dict: X-Request-Id, plus Server-Timing with the spans so far when timing is on
+    """
+    timing = _current.get()
+    if timing is None:
+        return {}
+    headers = {'X-Request-Id': timing.request_id}
+    if timing.enabled:
+        headers['Server-Timing'] = timing.header_value()
+    return headers
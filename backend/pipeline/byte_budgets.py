@@ -0,0 +1,116 @@
+"""
+Query Byte Budgets Module
+
+Derives the API's per-template maximum_bytes_billed budgets from the bytes
+its jobs actually billed. Every API job carries an app label and a
+query_template label (api/utils/query_budget.py), so the jobs view gives each
+template's observed peak; its budget is that peak times a headroom factor.
+
+The printed JSON is the API's QUERY_BYTE_BUDGETS environment variable.
+"""
+import json
+import logging
+import math
+
+from google.cloud import bigquery
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+JOBS_VIEW = 'ca-lobby.region-us.INFORMATION_SCHEMA.JOBS_BY_PROJECT'
+
+# Value of the API's 'app' job label
+API_JOB_LABEL = 'ca-lobby-api'
+
+LOOKBACK_DAYS = 30
+HEADROOM = 2.0  # budget = observed peak x HEADROOM
+MIN_BUDGET = 100 * (1 << 20)  # never below 100 MiB (BigQuery bills at least 10 MB per table)
+BUDGET_ROUNDING = 1 << 20  # budgets are rounded up to whole MiB
+
+OBSERVED_BYTES_QUERY = f"""
+SELECT
+    (SELECT value FROM UNNEST(labels) WHERE key = 'query_template') as query_template,
+    MAX(total_bytes_billed) as max_bytes_billed,
+    COUNT(*) as job_count
+FROM `{JOBS_VIEW}`
+WHERE creation_time >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL @days DAY)
+  AND job_type = 'QUERY'
+  AND state = 'DONE'
+  AND error_result IS NULL
+  AND EXISTS (SELECT 1 FROM UNNEST(labels) WHERE key = 'app' AND value = @app)
+GROUP BY query_template
+HAVING query_template IS NOT NULL
+"""
+
+
+def budget_from_observed(max_bytes_billed, headroom=HEADROOM):
+    """Budget for a template whose jobs billed at most max_bytes_billed."""
+    budget = math.ceil((max_bytes_billed or 0) * headroom / BUDGET_ROUNDING) * BUDGET_ROUNDING
+    return max(budget, MIN_BUDGET)
+
+
+def derive_byte_budgets(client, days=LOOKBACK_DAYS, headroom=HEADROOM):
+    """
+    Derive per-template byte budgets from the API's successful jobs.
+
+    Jobs that failed (including ones stopped by their current budget) are
+    excluded, since their billed bytes are not the query's real size.
+
+    Args:
+        client: BigQuery client
+        days: Lookback window in days
+        headroom: Multiplier applied to each template's observed peak
+
+    Returns:
+        dict: query_template label value -> budget in bytes, or None if the
+            jobs view could not be read
+    """
+    try:
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[
+                bigquery.ScalarQueryParameter('days', 'INT64', days),
+                bigquery.ScalarQueryParameter('app', 'STRING', API_JOB_LABEL)
+            ]
+        )
+        rows = client.query(OBSERVED_BYTES_QUERY, job_config=job_config).result()
+
+        budgets = {
+            row['query_template']: budget_from_observed(row['max_bytes_billed'], headroom)
+            for row in rows
+        }
+        logger.info(f"Derived byte budgets for {len(budgets)} query templates over {days} days")
+        return budgets
+
+    except Exception as e:
+        logger.error(f"Failed to derive byte budgets: {e}")
+        return None
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+
+    from dotenv import load_dotenv
+    from Bigquery_connection import bigquery_connect
+
+    parser = argparse.ArgumentParser(description='Print QUERY_BYTE_BUDGETS derived from observed API jobs')
+    parser.add_argument('--days', type=int, default=LOOKBACK_DAYS, help='Lookback window in days')
+    parser.add_argument('--headroom', type=float, default=HEADROOM, help='Multiplier on the observed peak')
+    args = parser.parse_args()
+
+    load_dotenv()
+    client = bigquery_connect(os.getenv('CREDENTIALS_LOCATION'))
+    if client is None:
+        raise SystemExit("Could not connect to BigQuery")
+
+    try:
+        budgets = derive_byte_budgets(client, args.days, args.headroom)
+        if budgets is None:
+            raise SystemExit(1)
+        print(json.dumps(budgets, sort_keys=True))
+    finally:
+        client.close()
@@ -0,0 +1,118 @@
+"""
+Canonical Organization Names Module
+
+Builds the org_name_canonical mapping table (raw name -> canonical key ->
+filer_id) after each load, so API search can resolve filer IDs with a plain
+equality join instead of per-request REGEXP_REPLACE matching.
+"""
+import logging
+
+from google.cloud import bigquery
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+CANONICAL_TABLE = 'ca-lobby.ca_lobby.org_name_canonical'
+
+# Every name the search endpoint can return, with the filer ID it files under
+SOURCE_QUERY = """
+SELECT DISTINCT organization_name as raw_name, '' as filer_id
+FROM `ca-lobby.ca_lobby.v_organization_summary`
+WHERE organization_name IS NOT NULL
+UNION DISTINCT
+SELECT DISTINCT FILER_NAML as raw_name, FILER_ID as filer_id
+FROM `ca-lobby.ca_lobby.cvr_lobby_disclosure_cd_partitioned`
+WHERE FROM_DATE_DATE >= '2020-01-01'
+  AND FILER_NAML IS NOT NULL
+  AND FILER_ID IS NOT NULL
+  AND TRIM(FILER_ID) != ''
+"""
+
+
+def canonicalize_names(names):
+    """
+    Normalize organization names to a canonical matching key.
+
+    Rules (replacing the REGEXP_REPLACE join in api/search.py):
+    - Uppercase, trim and collapse whitespace
+    - "X, CITY OF" / "X; COUNTY OF" -> "CITY OF X" / "COUNTY OF X"
+    - CHARTER -> CHAPTER (typo in source data, e.g. Santa Ana)
+
+    Args:
+        names: pandas Series of raw names
+
+    Returns:
+        pd.Series: Canonical keys, aligned with the input index
+    """
+    canonical = (
+        names.fillna('').astype(str)
+        .str.upper()
+        .str.replace(r'\s+', ' ', regex=True)
+        .str.strip()
+        .str.replace('CHARTER', 'CHAPTER', regex=False)
+    )
+
+    # Move trailing "CITY OF" / "COUNTY OF" to the front
+    suffix = canonical.str.extract(r'^(?P<name>.+?)[,;]?\s*(?P<kind>CITY|COUNTY) OF$')
+    has_suffix = suffix['name'].notna()
+    canonical = canonical.where(~has_suffix, suffix['kind'] + ' OF ' + suffix['name'])
+
+    return canonical
+
+
+def build_canonical_table(source_df):
+    """
+    Build the mapping table from (raw_name, filer_id) rows.
+
+    Every raw name gets the highest filer ID filed under any name sharing its
+    canonical key, or '' when no filer shares the key.
+
+    Args:
+        source_df: DataFrame with raw_name and filer_id columns
+
+    Returns:
+        pd.DataFrame: One row per raw_name with raw_name, canonical_name, filer_id
+    """
+    df = source_df[['raw_name', 'filer_id']].copy()
+    df['filer_id'] = df['filer_id'].fillna('').astype(str).str.strip()
+    df['canonical_name'] = canonicalize_names(df['raw_name'])
+
+    filers = df.loc[df['filer_id'] != ''].groupby('canonical_name')['filer_id'].max()
+
+    table = df[['raw_name', 'canonical_name']].drop_duplicates('raw_name').reset_index(drop=True)
+    table['filer_id'] = table['canonical_name'].map(filers).fillna('')
+
+    return table
+
+
+def refresh_org_name_canonical(client, table_id=CANONICAL_TABLE):
+    """
+    Rebuild the org_name_canonical table from current data.
+
+    Args:
+        client: BigQuery client
+        table_id: Full table ID of the mapping table
+
+    Returns:
+        int: Rows written, or None if the refresh failed
+    """
+    try:
+        source_df = client.query(SOURCE_QUERY).to_dataframe()
+        table = build_canonical_table(source_df)
+
+        job_config = bigquery.LoadJobConfig(
+            write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
+            clustering_fields=['raw_name']
+        )
+        client.load_table_from_dataframe(table, table_id, job_config=job_config).result()
+
+        logger.info(f"Wrote {len(table)} canonical name rows to {table_id}")
+        return len(table)
+
+    except Exception as e:
+        logger.error(f"Failed to refresh {table_id}: {e}")
+        return None
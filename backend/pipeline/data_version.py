@@ -0,0 +1,62 @@
+"""
+Data Version Module
+
+Records a new data version after each successful load. The API keys its
+response cache on the latest version, so bumping it invalidates every
+cached response at once.
+"""
+import logging
+
+from google.cloud import bigquery
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+DATA_VERSION_TABLE = 'ca-lobby.ca_lobby.data_version'
+
+
+def bump_data_version(client, loaded_tables, table_id=DATA_VERSION_TABLE):
+    """
+    Append a new, strictly increasing data version row.
+
+    Args:
+        client: BigQuery client
+        loaded_tables: List of table IDs loaded in this run
+        table_id: Full table ID of the version table
+
+    Returns:
+        int: The new version number, or None if the bump failed
+    """
+    try:
+        client.query(f"""
+        CREATE TABLE IF NOT EXISTS `{table_id}` (
+            version INT64 NOT NULL,
+            loaded_at TIMESTAMP NOT NULL,
+            loaded_tables ARRAY<STRING>
+        )
+        """).result()
+
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[
+                bigquery.ArrayQueryParameter('loaded_tables', 'STRING', list(loaded_tables))
+            ]
+        )
+        client.query(f"""
+        INSERT INTO `{table_id}` (version, loaded_at, loaded_tables)
+        SELECT COALESCE(MAX(version), 0) + 1, CURRENT_TIMESTAMP(), @loaded_tables
+        FROM `{table_id}`
+        """, job_config=job_config).result()
+
+        rows = list(client.query(f"SELECT MAX(version) as version FROM `{table_id}`").result())
+        version = rows[0]['version'] if rows else None
+
+        logger.info(f"Data version bumped to {version}")
+        return version
+
+    except Exception as e:
+        logger.error(f"Failed to bump data version: {e}")
+        return None
@@ -0,0 +1,76 @@
+"""
+Firm Clients Module
+
+Rolls lpay_latest up to one row per (lobbying firm, paying filer) pair after
+each load, with the filer's most recent filing name. The API's organization
+profile finds related organizations (filers paying the same firms) from
+this small table instead of self-joining every payment by PAYEE_NAML.
+"""
+import logging
+
+from latest_tables import CVR_LATEST_TABLE, LPAY_LATEST_TABLE
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+FIRM_CLIENTS_TABLE = 'ca-lobby.ca_lobby.firm_clients'
+
+FIRM_CLIENTS_SQL = f"""
+CREATE OR REPLACE TABLE `{FIRM_CLIENTS_TABLE}`
+CLUSTER BY PAYEE_NAML, FILER_ID
+AS
+WITH pairs AS (
+    SELECT
+        PAYEE_NAML,
+        FILER_ID,
+        SUM(CAST(PER_TOTAL AS FLOAT64)) as total_amount,
+        COUNT(*) as payment_count
+    FROM `{LPAY_LATEST_TABLE}`
+    WHERE FILER_ID IS NOT NULL
+      AND PAYEE_NAML IS NOT NULL
+      AND TRIM(PAYEE_NAML) != ''
+    GROUP BY PAYEE_NAML, FILER_ID
+),
+latest_names AS (
+    SELECT
+        FILER_ID,
+        ARRAY_AGG(FILER_NAML ORDER BY RPT_DATE_DATE DESC LIMIT 1)[OFFSET(0)] as FILER_NAML
+    FROM `{CVR_LATEST_TABLE}`
+    WHERE FILER_ID IN (SELECT FILER_ID FROM pairs)
+    GROUP BY FILER_ID
+)
+SELECT
+    p.PAYEE_NAML,
+    p.FILER_ID,
+    n.FILER_NAML,
+    p.total_amount,
+    p.payment_count
+FROM pairs p
+LEFT JOIN latest_names n
+    ON n.FILER_ID = p.FILER_ID
+"""
+
+
+def build_firm_clients(client):
+    """
+    Rebuild the firm_clients table from lpay_latest.
+
+    Args:
+        client: BigQuery client
+
+    Returns:
+        bool: True if the table was rebuilt, False otherwise
+    """
+    try:
+        logger.info(f"Rebuilding {FIRM_CLIENTS_TABLE}...")
+        client.query(FIRM_CLIENTS_SQL).result()
+        logger.info(f"Rebuilt {FIRM_CLIENTS_TABLE}")
+        return True
+
+    except Exception as e:
+        logger.error(f"Failed to rebuild {FIRM_CLIENTS_TABLE}: {e}")
+        return False
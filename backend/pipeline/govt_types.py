@@ -0,0 +1,157 @@
+"""
+Government Type Classification Module
+
+Classifies every payment employer (lpay_cd.EMPLR_NAML) as 'city', 'county'
+or 'other' once per load and writes the employer_govt_type lookup table.
+latest_tables.py joins it into lpay_latest as a clustered GOVT_TYPE column,
+so API queries filter on it instead of chains of UPPER(...) LIKE per row.
+
+Organization names (v_organization_summary.organization_name) are classified
+with the same rules into org_govt_type, which the API's database statistics
+join on the organization name.
+"""
+import logging
+import os
+
+import pandas as pd
+from google.cloud import bigquery
+
+from canonical_names import canonicalize_names
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+GOVT_TYPE_TABLE = 'ca-lobby.ca_lobby.employer_govt_type'
+ORG_GOVT_TYPE_TABLE = 'ca-lobby.ca_lobby.org_govt_type'
+
+# Maintained list of entities the pattern rules miss or misclassify
+GOVT_ENTITIES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'govt_entities.csv')
+
+SOURCE_QUERY = """
+SELECT DISTINCT EMPLR_NAML
+FROM `ca-lobby.ca_lobby.lpay_cd`
+WHERE EMPLR_NAML IS NOT NULL
+  AND EMPLR_NAML != ''
+"""
+
+ORG_SOURCE_QUERY = """
+SELECT DISTINCT organization_name
+FROM `ca-lobby.ca_lobby.v_organization_summary`
+WHERE organization_name IS NOT NULL
+  AND organization_name != ''
+"""
+
+# Pattern rules, checked in order (same rules the API used to apply per request)
+GOVT_TYPE_PATTERNS = [
+    ('city', r'CITY OF|LEAGUE.*CITIES'),
+    ('county', r'COUNTY|CSAC|ASSOCIATION OF COUNTIES'),
+]
+
+
+def load_govt_entities(path=GOVT_ENTITIES_FILE):
+    """
+    Load the maintained entity lookup list.
+
+    Args:
+        path: CSV file with name and govt_type columns
+
+    Returns:
+        dict: Canonical name -> govt_type (empty if the file is missing)
+    """
+    if not os.path.exists(path):
+        logger.warning(f"Entity lookup list not found: {path}")
+        return {}
+
+    entities = pd.read_csv(path, dtype=str).dropna()
+    return dict(zip(canonicalize_names(entities['name']), entities['govt_type'].str.strip().str.lower()))
+
+
+def classify_govt_types(names, entities=None):
+    """
+    Classify employer names as city, county or other.
+
+    The lookup list wins over the pattern rules; the first matching pattern
+    wins otherwise.
+
+    Args:
+        names: pandas Series of employer names
+        entities: Optional dict from load_govt_entities
+
+    Returns:
+        pd.Series: govt_type per name, aligned with the input index
+    """
+    canonical = canonicalize_names(names)
+    govt_type = pd.Series('other', index=names.index)
+
+    # Apply in reverse so earlier patterns take precedence
+    for value, pattern in reversed(GOVT_TYPE_PATTERNS):
+        govt_type = govt_type.mask(canonical.str.contains(pattern, regex=True), value)
+
+    if entities:
+        listed = canonical.map(entities)
+        govt_type = listed.fillna(govt_type)
+
+    return govt_type
+
+
+def refresh_employer_govt_type(client, table_id=GOVT_TYPE_TABLE, entities_path=GOVT_ENTITIES_FILE):
+    """
+    Rebuild the employer_govt_type table from current payment data.
+
+    Args:
+        client: BigQuery client
+        table_id: Full table ID of the lookup table
+        entities_path: Maintained entity lookup list
+
+    Returns:
+        int: Rows written, or None if the refresh failed
+    """
+    return _refresh_govt_type_table(client, SOURCE_QUERY, 'EMPLR_NAML', table_id, entities_path)
+
+
+def refresh_org_govt_type(client, table_id=ORG_GOVT_TYPE_TABLE, entities_path=GOVT_ENTITIES_FILE):
+    """
+    Rebuild the org_govt_type table from the organization summary view.
+
+    Args:
+        client: BigQuery client
+        table_id: Full table ID of the lookup table
+        entities_path: Maintained entity lookup list
+
+    Returns:
+        int: Rows written, or None if the refresh failed
+    """
+    return _refresh_govt_type_table(client, ORG_SOURCE_QUERY, 'organization_name', table_id, entities_path)
+
+
+def _refresh_govt_type_table(client, source_query, name_column, table_id, entities_path):
+    """
+    Classify the distinct names returned by source_query and load them.
+
+    Returns:
+        int: Rows written, or None if the refresh failed
+    """
+    try:
+        source = client.query(source_query).to_dataframe()
+        table = pd.DataFrame({
+            name_column: source[name_column],
+            'govt_type': classify_govt_types(source[name_column], load_govt_entities(entities_path))
+        })
+
+        job_config = bigquery.LoadJobConfig(
+            write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
+            clustering_fields=[name_column]
+        )
+        client.load_table_from_dataframe(table, table_id, job_config=job_config).result()
+
+        counts = table['govt_type'].value_counts().to_dict()
+        logger.info(f"Wrote {len(table)} {name_column} classifications to {table_id}: {counts}")
+        return len(table)
+
+    except Exception as e:
+        logger.error(f"Failed to refresh {table_id}: {e}")
+        return None
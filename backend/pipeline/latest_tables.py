@@ -0,0 +1,84 @@
+"""
+Latest Amendment Tables Module
+
+Materializes the latest amendment of every filing after each load, so API
+queries read pre-deduplicated tables instead of re-running
+MAX(AMEND_ID) / ROW_NUMBER() over the full disclosure and payment tables.
+"""
+import logging
+
+from govt_types import GOVT_TYPE_TABLE
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+CVR_LATEST_TABLE = 'ca-lobby.ca_lobby.cvr_lobby_disclosure_latest'
+LPAY_LATEST_TABLE = 'ca-lobby.ca_lobby.lpay_latest'
+
+# Latest amendment of each disclosure filing
+CVR_LATEST_SQL = f"""
+CREATE OR REPLACE TABLE `{CVR_LATEST_TABLE}`
+PARTITION BY DATE_TRUNC(RPT_DATE_DATE, MONTH)
+CLUSTER BY FILER_ID
+AS
+SELECT *
+FROM `ca-lobby.ca_lobby.cvr_lobby_disclosure_cd`
+WHERE FILING_ID IS NOT NULL
+QUALIFY ROW_NUMBER() OVER (PARTITION BY FILING_ID ORDER BY AMEND_ID DESC) = 1
+"""
+
+# Payments belonging to the latest amendment of each filing, with the
+# disclosure's filer and dates attached (lpay_cd has neither) and the
+# employer's government type from govt_types.py
+LPAY_LATEST_SQL = f"""
+CREATE OR REPLACE TABLE `{LPAY_LATEST_TABLE}`
+PARTITION BY DATE_TRUNC(RPT_DATE_DATE, MONTH)
+CLUSTER BY FILER_ID
+AS
+SELECT
+    pay.*,
+    c.FILER_ID,
+    c.FROM_DATE_DATE,
+    c.THRU_DATE_DATE,
+    c.RPT_DATE_DATE,
+    COALESCE(g.govt_type, 'other') as GOVT_TYPE
+FROM `ca-lobby.ca_lobby.lpay_cd` pay
+INNER JOIN `{CVR_LATEST_TABLE}` c
+    ON pay.FILING_ID = c.FILING_ID
+    AND pay.AMEND_ID = c.AMEND_ID
+LEFT JOIN `{GOVT_TYPE_TABLE}` g
+    ON g.EMPLR_NAML = pay.EMPLR_NAML
+"""
+
+# Build order matters: lpay_latest joins cvr_lobby_disclosure_latest
+LATEST_TABLES = [
+    (CVR_LATEST_TABLE, CVR_LATEST_SQL),
+    (LPAY_LATEST_TABLE, LPAY_LATEST_SQL),
+]
+
+
+def build_latest_tables(client):
+    """
+    Rebuild the latest-amendment tables.
+
+    Args:
+        client: BigQuery client
+
+    Returns:
+        bool: True if every table was rebuilt, False otherwise
+    """
+    for table_id, sql in LATEST_TABLES:
+        try:
+            logger.info(f"Rebuilding {table_id}...")
+            client.query(sql).result()
+            logger.info(f"Rebuilt {table_id}")
+
+        except Exception as e:
+            logger.error(f"Failed to rebuild {table_id}: {e}")
+            return False
+
+    return True
@@ -0,0 +1,101 @@
+"""
+Parquet Snapshot Module
+
+Exports every table and view the API query templates read to a local
+directory of Parquet files, one <table>.parquet per table. The API's DuckDB
+backend (QUERY_BACKEND=duckdb, LOCAL_SNAPSHOT_DIR=<directory>) answers the
+same templates from the snapshot without BigQuery.
+"""
+import logging
+import os
+
+import pyarrow.parquet as pq
+
+from canonical_names import CANONICAL_TABLE
+from data_version import DATA_VERSION_TABLE
+from firm_clients import FIRM_CLIENTS_TABLE
+from govt_types import GOVT_TYPE_TABLE, ORG_GOVT_TYPE_TABLE
+from latest_tables import CVR_LATEST_TABLE, LPAY_LATEST_TABLE
+from spending_cube import SPENDING_CUBE_TABLE
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Tables and views read by the API (api/*.py and api/utils/)
+SNAPSHOT_TABLES = [
+    'ca-lobby.ca_lobby.cvr_lobby_disclosure_cd',
+    'ca-lobby.ca_lobby.cvr_lobby_disclosure_cd_partitioned',
+    'ca-lobby.ca_lobby.v_organization_summary',
+    CVR_LATEST_TABLE,
+    LPAY_LATEST_TABLE,
+    GOVT_TYPE_TABLE,
+    ORG_GOVT_TYPE_TABLE,
+    SPENDING_CUBE_TABLE,
+    FIRM_CLIENTS_TABLE,
+    CANONICAL_TABLE,
+    DATA_VERSION_TABLE,
+]
+
+
+def snapshot_path(destination_dir, table_id):
+    """Parquet file for a table: the table name without project and dataset."""
+    return os.path.join(destination_dir, f"{table_id.split('.')[-1]}.parquet")
+
+
+def export_snapshot(client, destination_dir, tables=None):
+    """
+    Export tables to Parquet files for the API's local query backend.
+
+    Each file is written under a temporary name and renamed into place, so a
+    failed export never leaves a truncated table behind.
+
+    Args:
+        client: BigQuery client
+        destination_dir: Directory for the snapshot (created if missing)
+        tables: Table IDs to export (defaults to SNAPSHOT_TABLES)
+
+    Returns:
+        bool: True if every table was exported, False otherwise
+    """
+    os.makedirs(destination_dir, exist_ok=True)
+
+    for table_id in tables or SNAPSHOT_TABLES:
+        path = snapshot_path(destination_dir, table_id)
+        try:
+            logger.info(f"Exporting {table_id}...")
+            arrow_table = client.query(f"SELECT * FROM `{table_id}`").result().to_arrow()
+            pq.write_table(arrow_table, f"{path}.tmp", compression='zstd')
+            os.replace(f"{path}.tmp", path)
+            logger.info(f"Exported {arrow_table.num_rows:,} rows to {path}")
+
+        except Exception as e:
+            logger.error(f"Failed to export {table_id}: {e}")
+            return False
+
+    return True
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from dotenv import load_dotenv
+    from Bigquery_connection import bigquery_connect
+
+    parser = argparse.ArgumentParser(description='Export the API tables to a local Parquet snapshot')
+    parser.add_argument('destination', help='Snapshot directory (the API reads LOCAL_SNAPSHOT_DIR)')
+    args = parser.parse_args()
+
+    load_dotenv()
+    client = bigquery_connect(os.getenv('CREDENTIALS_LOCATION'))
+    if client is None:
+        raise SystemExit("Could not connect to BigQuery")
+
+    try:
+        if not export_snapshot(client, args.destination):
+            raise SystemExit(1)
+    finally:
+        client.close()
@@ -0,0 +1,60 @@
+"""
+Spending Cube Module
+
+Rolls lpay_latest up to year x quarter x govt_type x employer x payee after
+each load. The analytics spending charts read this small table for any year
+range instead of re-aggregating raw payments per request.
+"""
+import logging
+
+from latest_tables import LPAY_LATEST_TABLE
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+SPENDING_CUBE_TABLE = 'ca-lobby.ca_lobby.spending_cube'
+
+SPENDING_CUBE_SQL = f"""
+CREATE OR REPLACE TABLE `{SPENDING_CUBE_TABLE}`
+CLUSTER BY year, govt_type
+AS
+SELECT
+    EXTRACT(YEAR FROM RPT_DATE_DATE) as year,
+    EXTRACT(QUARTER FROM RPT_DATE_DATE) as quarter,
+    GOVT_TYPE as govt_type,
+    COALESCE(EMPLR_NAML, '') as employer_name,
+    COALESCE(PAYEE_NAML, '') as payee_name,
+    SUM(CAST(PER_TOTAL AS FLOAT64)) as total_amount,
+    COUNT(*) as payment_count
+FROM `{LPAY_LATEST_TABLE}`
+WHERE RPT_DATE_DATE IS NOT NULL
+  AND RPT_DATE_DATE <= CURRENT_DATE()
+  AND PER_TOTAL IS NOT NULL
+  AND CAST(PER_TOTAL AS FLOAT64) > 0
+GROUP BY year, quarter, govt_type, employer_name, payee_name
+"""
+
+
+def build_spending_cube(client):
+    """
+    Rebuild the spending cube from lpay_latest.
+
+    Args:
+        client: BigQuery client
+
+    Returns:
+        bool: True if the cube was rebuilt, False otherwise
+    """
+    try:
+        logger.info(f"Rebuilding {SPENDING_CUBE_TABLE}...")
+        client.query(SPENDING_CUBE_SQL).result()
+        logger.info(f"Rebuilt {SPENDING_CUBE_TABLE}")
+        return True
+
+    except Exception as e:
+        logger.error(f"Failed to rebuild {SPENDING_CUBE_TABLE}: {e}")
+        return False
@@ -0,0 +1,51 @@
+"""
+Tests for byte_budgets module.
+"""
+import os
+from unittest.mock import Mock
+
+import pytest
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from byte_budgets import derive_byte_budgets, budget_from_observed, MIN_BUDGET
+
+
+class TestDeriveByteBudgets:
+    """Tests for derive_byte_budgets function."""
+
+    def test_budget_is_observed_peak_with_headroom(self):
+        """Test that each template gets its peak billed bytes times the headroom."""
+        mock_client = Mock()
+        mock_client.query.return_value.result.return_value = [
+            {'query_template': 'search_results', 'max_bytes_billed': 3 << 30, 'job_count': 40},
+            {'query_template': 'health', 'max_bytes_billed': 0, 'job_count': 900}
+        ]
+
+        result = derive_byte_budgets(mock_client, headroom=2.0)
+
+        assert result == {'search_results': 6 << 30, 'health': MIN_BUDGET}
+
+    def test_only_successful_api_jobs_are_counted(self):
+        """Test that the jobs query filters on the API label and skips failed jobs."""
+        mock_client = Mock()
+        mock_client.query.return_value.result.return_value = []
+
+        derive_byte_budgets(mock_client)
+
+        sql = mock_client.query.call_args.args[0]
+        assert "key = 'app' AND value = @app" in sql
+        assert 'error_result IS NULL' in sql
+
+    def test_budgets_round_up_to_whole_mib(self):
+        """Test that budgets are rounded up, never down."""
+        assert budget_from_observed((500 << 20) + 1, headroom=1.0) == 501 << 20
+
+    def test_returns_none_on_failure(self):
+        """Test that a failed lookup returns None."""
+        mock_client = Mock()
+        mock_client.query.side_effect = Exception('API error')
+
+        assert derive_byte_budgets(mock_client) is None
@@ -0,0 +1,119 @@
+"""
+Tests for canonical_names module.
+"""
+import os
+from unittest.mock import Mock, patch
+
+import pandas as pd
+import pytest
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from canonical_names import canonicalize_names, build_canonical_table, refresh_org_name_canonical
+
+
+class TestCanonicalizeNames:
+    """Tests for canonicalize_names function."""
+
+    @pytest.mark.parametrize('raw, expected', [
+        ('Santa Monica, City of', 'CITY OF SANTA MONICA'),
+        ('CITY OF SANTA MONICA', 'CITY OF SANTA MONICA'),
+        ('LOS ANGELES; COUNTY OF', 'COUNTY OF LOS ANGELES'),
+        ('LOS ANGELES COUNTY OF', 'COUNTY OF LOS ANGELES'),
+        ('COUNTY OF LOS ANGELES', 'COUNTY OF LOS ANGELES'),
+        ('SANTA ANA CHARTER', 'SANTA ANA CHAPTER'),
+        ('  Pacific   Gas  and Electric ', 'PACIFIC GAS AND ELECTRIC'),
+        ('LEAGUE OF CALIFORNIA CITIES', 'LEAGUE OF CALIFORNIA CITIES'),
+    ])
+    def test_canonical_forms(self, raw, expected):
+        """Test that name variants collapse to one canonical key."""
+        result = canonicalize_names(pd.Series([raw]))
+
+        assert result.iloc[0] == expected
+
+    def test_handles_missing_names(self):
+        """Test that NaN/None become empty keys."""
+        result = canonicalize_names(pd.Series([None, float('nan')]))
+
+        assert list(result) == ['', '']
+
+    def test_preserves_index(self):
+        """Test that output aligns with the input index."""
+        names = pd.Series(['a', 'b'], index=[10, 20])
+
+        assert list(canonicalize_names(names).index) == [10, 20]
+
+
+class TestBuildCanonicalTable:
+    """Tests for build_canonical_table function."""
+
+    def test_view_name_inherits_raw_filer_id(self):
+        """Test that a view-only name resolves to the raw filer with the same key."""
+        source = pd.DataFrame({
+            'raw_name': ['SANTA MONICA, CITY OF', 'CITY OF SANTA MONICA'],
+            'filer_id': ['', 'C001']
+        })
+
+        table = build_canonical_table(source).set_index('raw_name')
+
+        assert table.loc['SANTA MONICA, CITY OF', 'filer_id'] == 'C001'
+        assert table.loc['CITY OF SANTA MONICA', 'filer_id'] == 'C001'
+
+    def test_bare_filer_name_does_not_match_city_suffix(self):
+        """Test that "X, CITY OF" no longer resolves to a filer filed as bare "X" (old REGEXP join did)."""
+        source = pd.DataFrame({
+            'raw_name': ['SANTA MONICA, CITY OF', 'SANTA MONICA'],
+            'filer_id': ['', 'C001']
+        })
+
+        table = build_canonical_table(source).set_index('raw_name')
+
+        assert table.loc['SANTA MONICA, CITY OF', 'filer_id'] == ''
+        assert table.loc['SANTA MONICA', 'filer_id'] == 'C001'
+
+    def test_unmatched_name_has_empty_filer_id(self):
+        """Test that names with no filer get an empty filer ID."""
+        source = pd.DataFrame({'raw_name': ['ACME CORP'], 'filer_id': [None]})
+
+        table = build_canonical_table(source)
+
+        assert table.loc[0, 'filer_id'] == ''
+
+    def test_one_row_per_raw_name(self):
+        """Test that a raw name filed under several IDs appears once with the max ID."""
+        source = pd.DataFrame({
+            'raw_name': ['ACME CORP', 'ACME CORP'],
+            'filer_id': ['C001', 'C002']
+        })
+
+        table = build_canonical_table(source)
+
+        assert len(table) == 1
+        assert table.loc[0, 'filer_id'] == 'C002'
+        assert list(table.columns) == ['raw_name', 'canonical_name', 'filer_id']
+
+
+class TestRefreshOrgNameCanonical:
+    """Tests for refresh_org_name_canonical function."""
+
+    @patch('canonical_names.bigquery.LoadJobConfig')
+    def test_loads_table(self, mock_job_config):
+        """Test that the rebuilt table is loaded and its size returned."""
+        mock_client = Mock()
+        mock_client.query.return_value.to_dataframe.return_value = pd.DataFrame({
+            'raw_name': ['ACME CORP'], 'filer_id': ['C001']
+        })
+
+        result = refresh_org_name_canonical(mock_client, 'p.d.t')
+
+        assert result == 1
+        mock_client.load_table_from_dataframe.return_value.result.assert_called_once()
+
+    def test_returns_none_on_failure(self):
+        """Test that a failed refresh returns None."""
+        mock_client = Mock()
+        mock_client.query.side_effect = Exception('API error')
+
+        assert refresh_org_name_canonical(mock_client) is None
@@ -0,0 +1,47 @@
+"""
+Tests for data_version module.
+"""
+import os
+from unittest.mock import Mock
+
+import pytest
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_version import bump_data_version
+
+
+class TestBumpDataVersion:
+    """Tests for bump_data_version function."""
+
+    def test_returns_new_version(self):
+        """Test that the new version number is returned."""
+        mock_client = Mock()
+        mock_client.query.return_value.result.return_value = [{'version': 7}]
+
+        result = bump_data_version(mock_client, ['ca-lobby.ca_lobby.lpay_cd'])
+
+        assert result == 7
+
+    def test_inserts_incremented_version(self):
+        """Test that the insert derives the next version from the current max."""
+        mock_client = Mock()
+        mock_client.query.return_value.result.return_value = [{'version': 1}]
+
+        bump_data_version(mock_client, ['ca-lobby.ca_lobby.lpay_cd'], table_id='p.d.versions')
+
+        statements = [call.args[0] for call in mock_client.query.call_args_list]
+        insert = next(sql for sql in statements if 'INSERT INTO' in sql)
+        assert 'COALESCE(MAX(version), 0) + 1' in insert
+        assert '`p.d.versions`' in insert
+
+    def test_returns_none_on_failure(self):
+        """Test that a failed bump is logged and returns None."""
+        mock_client = Mock()
+        mock_client.query.side_effect = Exception('API error')
+
+        result = bump_data_version(mock_client, ['ca-lobby.ca_lobby.lpay_cd'])
+
+        assert result is None
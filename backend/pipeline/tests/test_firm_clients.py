@@ -0,0 +1,37 @@
+"""
+Tests for firm_clients module.
+"""
+import os
+from unittest.mock import Mock
+
+import pytest
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from firm_clients import build_firm_clients, FIRM_CLIENTS_TABLE
+
+
+class TestBuildFirmClients:
+    """Tests for build_firm_clients function."""
+
+    def test_rebuilds_pairs_from_latest_payments(self):
+        """Test that firm/filer pairs are aggregated from lpay_latest and clustered by firm."""
+        mock_client = Mock()
+
+        result = build_firm_clients(mock_client)
+
+        sql = mock_client.query.call_args.args[0]
+        assert result is True
+        assert f'CREATE OR REPLACE TABLE `{FIRM_CLIENTS_TABLE}`' in sql
+        assert 'CLUSTER BY PAYEE_NAML, FILER_ID' in sql
+        assert 'lpay_latest' in sql
+        assert 'GROUP BY PAYEE_NAML, FILER_ID' in sql
+
+    def test_returns_false_on_failure(self):
+        """Test that a failed rebuild returns False."""
+        mock_client = Mock()
+        mock_client.query.side_effect = Exception('API error')
+
+        assert build_firm_clients(mock_client) is False
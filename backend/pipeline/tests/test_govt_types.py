@@ -0,0 +1,107 @@
+"""
+Tests for govt_types module.
+"""
+import os
+from unittest.mock import Mock, patch
+
+import pandas as pd
+import pytest
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from govt_types import classify_govt_types, load_govt_entities, refresh_employer_govt_type, refresh_org_govt_type
+
+
+class TestClassifyGovtTypes:
+    """Tests for classify_govt_types function."""
+
+    @pytest.mark.parametrize('name, expected', [
+        ('CITY OF SANTA MONICA', 'city'),
+        ('Santa Monica, City of', 'city'),
+        ('LEAGUE OF CALIFORNIA CITIES', 'city'),
+        ('COUNTY OF LOS ANGELES', 'county'),
+        ('CSAC', 'county'),
+        ('CALIFORNIA STATE ASSOCIATION OF COUNTIES', 'county'),
+        ('PACIFIC GAS AND ELECTRIC', 'other'),
+        (None, 'other'),
+    ])
+    def test_pattern_rules(self, name, expected):
+        """Test that the pattern rules match the former SQL LIKE chains."""
+        assert classify_govt_types(pd.Series([name])).iloc[0] == expected
+
+    def test_city_rule_wins_over_county(self):
+        """Test that names matching both rules are classified as city."""
+        assert classify_govt_types(pd.Series(['CITY OF ORANGE COUNTY'])).iloc[0] == 'city'
+
+    def test_entity_list_overrides_patterns(self):
+        """Test that the maintained list wins over the pattern rules."""
+        names = pd.Series(['Urban Counties of California', 'ORANGE COUNTY BUSINESS COUNCIL'])
+        entities = {'URBAN COUNTIES OF CALIFORNIA': 'county', 'ORANGE COUNTY BUSINESS COUNCIL': 'other'}
+
+        assert list(classify_govt_types(names, entities)) == ['county', 'other']
+
+
+class TestLoadGovtEntities:
+    """Tests for load_govt_entities function."""
+
+    def test_loads_canonical_keys(self, tmp_path):
+        """Test that list names are canonicalized for matching."""
+        path = tmp_path / 'entities.csv'
+        path.write_text('name,govt_type\nUrban  Counties of California,County\n')
+
+        assert load_govt_entities(str(path)) == {'URBAN COUNTIES OF CALIFORNIA': 'county'}
+
+    def test_missing_file_returns_empty(self, tmp_path):
+        """Test that a missing list falls back to pattern rules only."""
+        assert load_govt_entities(str(tmp_path / 'missing.csv')) == {}
+
+    def test_shipped_list_is_valid(self):
+        """Test that the maintained list only uses known govt types."""
+        assert set(load_govt_entities().values()) <= {'city', 'county', 'other'}
+
+
+class TestRefreshEmployerGovtType:
+    """Tests for refresh_employer_govt_type function."""
+
+    @patch('govt_types.bigquery.LoadJobConfig')
+    def test_loads_table(self, mock_job_config):
+        """Test that classified employers are loaded and the row count returned."""
+        mock_client = Mock()
+        mock_client.query.return_value.to_dataframe.return_value = pd.DataFrame({
+            'EMPLR_NAML': ['CITY OF SANTA MONICA', 'ACME CORP']
+        })
+
+        result = refresh_employer_govt_type(mock_client, 'p.d.t')
+
+        assert result == 2
+        loaded = mock_client.load_table_from_dataframe.call_args.args[0]
+        assert list(loaded['govt_type']) == ['city', 'other']
+
+    def test_returns_none_on_failure(self):
+        """Test that a failed refresh returns None."""
+        mock_client = Mock()
+        mock_client.query.side_effect = Exception('API error')
+
+        assert refresh_employer_govt_type(mock_client) is None
+
+
+class TestRefreshOrgGovtType:
+    """Tests for refresh_org_govt_type function."""
+
+    @patch('govt_types.bigquery.LoadJobConfig')
+    def test_loads_table_keyed_on_organization_name(self, mock_job_config):
+        """Test that organization names are classified with the employer rules."""
+        mock_client = Mock()
+        mock_client.query.return_value.to_dataframe.return_value = pd.DataFrame({
+            'organization_name': ['COUNTY OF MARIN', 'LEAGUE OF CALIFORNIA CITIES', 'CITY NATIONAL BANK']
+        })
+
+        result = refresh_org_govt_type(mock_client, 'p.d.t')
+
+        assert result == 3
+        loaded = mock_client.load_table_from_dataframe.call_args.args[0]
+        assert list(loaded.columns) == ['organization_name', 'govt_type']
+        assert list(loaded['govt_type']) == ['county', 'city', 'other']
+        assert mock_job_config.call_args.kwargs['clustering_fields'] == ['organization_name']
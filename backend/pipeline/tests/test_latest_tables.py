@@ -0,0 +1,61 @@
+"""
+Tests for latest_tables module.
+"""
+import os
+from unittest.mock import Mock
+
+import pytest
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from latest_tables import build_latest_tables, CVR_LATEST_TABLE, LPAY_LATEST_TABLE
+
+
+class TestBuildLatestTables:
+    """Tests for build_latest_tables function."""
+
+    def test_builds_cvr_before_lpay(self):
+        """Test that lpay_latest is built after the table it joins."""
+        mock_client = Mock()
+
+        result = build_latest_tables(mock_client)
+
+        statements = [call.args[0] for call in mock_client.query.call_args_list]
+        assert result is True
+        assert len(statements) == 2
+        assert f'CREATE OR REPLACE TABLE `{CVR_LATEST_TABLE}`' in statements[0]
+        assert f'CREATE OR REPLACE TABLE `{LPAY_LATEST_TABLE}`' in statements[1]
+
+    def test_tables_are_partitioned_and_clustered(self):
+        """Test that both tables partition by report date and cluster by filer."""
+        mock_client = Mock()
+
+        build_latest_tables(mock_client)
+
+        cvr_sql, lpay_sql = [call.args[0] for call in mock_client.query.call_args_list]
+        assert 'PARTITION BY DATE_TRUNC(RPT_DATE_DATE, MONTH)' in cvr_sql
+        assert 'PARTITION BY DATE_TRUNC(RPT_DATE_DATE, MONTH)' in lpay_sql
+        assert 'CLUSTER BY FILER_ID' in cvr_sql
+        assert 'CLUSTER BY FILER_ID' in lpay_sql
+
+    def test_lpay_latest_has_govt_type(self):
+        """Test that payments get a GOVT_TYPE column defaulting to other."""
+        mock_client = Mock()
+
+        build_latest_tables(mock_client)
+
+        lpay_sql = mock_client.query.call_args_list[1].args[0]
+        assert "COALESCE(g.govt_type, 'other') as GOVT_TYPE" in lpay_sql
+        assert 'employer_govt_type' in lpay_sql
+
+    def test_stops_on_failure(self):
+        """Test that a failed cvr build skips the dependent lpay build."""
+        mock_client = Mock()
+        mock_client.query.side_effect = Exception('API error')
+
+        result = build_latest_tables(mock_client)
+
+        assert result is False
+        assert mock_client.query.call_count == 1
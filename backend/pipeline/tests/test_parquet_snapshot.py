@@ -0,0 +1,51 @@
+"""
+Tests for parquet_snapshot module.
+"""
+import os
+from unittest.mock import Mock
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parquet_snapshot import export_snapshot, snapshot_path, SNAPSHOT_TABLES
+
+
+class TestExportSnapshot:
+    """Tests for export_snapshot function."""
+
+    def test_writes_one_file_per_table(self, tmp_path):
+        """Test that each table lands in <table>.parquet."""
+        mock_client = Mock()
+        mock_client.query.return_value.result.return_value.to_arrow.return_value = pa.table({
+            'FILER_ID': ['F1', 'F2'],
+            'PER_TOTAL': [500.0, 700.0]
+        })
+
+        result = export_snapshot(mock_client, str(tmp_path), tables=['ca-lobby.ca_lobby.lpay_latest'])
+
+        assert result is True
+        assert os.listdir(tmp_path) == ['lpay_latest.parquet']
+        assert pq.read_table(tmp_path / 'lpay_latest.parquet').num_rows == 2
+
+    def test_snapshot_covers_api_tables(self):
+        """Test that the derived tables the API reads are exported."""
+        names = {table_id.split('.')[-1] for table_id in SNAPSHOT_TABLES}
+        assert {'cvr_lobby_disclosure_latest', 'lpay_latest', 'spending_cube',
+                'v_organization_summary', 'org_name_canonical', 'firm_clients'} <= names
+
+    def test_snapshot_path_drops_project_and_dataset(self):
+        """Test that files are named after the table only."""
+        assert snapshot_path('/snap', 'ca-lobby.ca_lobby.spending_cube') == '/snap/spending_cube.parquet'
+
+    def test_returns_false_on_failure(self, tmp_path):
+        """Test that a failed export returns False and leaves no partial file."""
+        mock_client = Mock()
+        mock_client.query.side_effect = Exception('API error')
+
+        assert export_snapshot(mock_client, str(tmp_path)) is False
+        assert os.listdir(tmp_path) == []
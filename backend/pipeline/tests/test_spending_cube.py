@@ -0,0 +1,36 @@
+"""
+Tests for spending_cube module.
+"""
+import os
+from unittest.mock import Mock
+
+import pytest
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from spending_cube import build_spending_cube, SPENDING_CUBE_TABLE
+
+
+class TestBuildSpendingCube:
+    """Tests for build_spending_cube function."""
+
+    def test_rebuilds_cube_from_latest_payments(self):
+        """Test that the cube is aggregated from lpay_latest."""
+        mock_client = Mock()
+
+        result = build_spending_cube(mock_client)
+
+        sql = mock_client.query.call_args.args[0]
+        assert result is True
+        assert f'CREATE OR REPLACE TABLE `{SPENDING_CUBE_TABLE}`' in sql
+        assert 'lpay_latest' in sql
+        assert 'GROUP BY year, quarter, govt_type, employer_name, payee_name' in sql
+
+    def test_returns_false_on_failure(self):
+        """Test that a failed rebuild returns False."""
+        mock_client = Mock()
+        mock_client.query.side_effect = Exception('API error')
+
+        assert build_spending_cube(mock_client) is False
@@ -0,0 +1,62 @@
+"""
+Tests for upload_pipeline post-load stages.
+"""
+import os
+from unittest.mock import Mock
+
+import pytest
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import upload_pipeline
+from upload_pipeline import run_post_load_stages
+
+STAGES = [
+    'refresh_employer_govt_type',
+    'build_latest_tables',
+    'build_spending_cube',
+    'build_firm_clients',
+    'refresh_org_name_canonical',
+    'refresh_org_govt_type',
+]
+
+
+@pytest.fixture
+def stages(monkeypatch):
+    """Replace every stage and the version bump with succeeding mocks."""
+    mocks = {name: Mock(return_value=True) for name in STAGES}
+    mocks['bump_data_version'] = Mock(return_value=2)
+    for name, mock in mocks.items():
+        monkeypatch.setattr(upload_pipeline, name, mock)
+    return mocks
+
+
+class TestRunPostLoadStages:
+    """Tests for run_post_load_stages function."""
+
+    def test_bumps_version_after_all_stages(self, stages):
+        """Test that the data version is bumped once every stage succeeded."""
+        assert run_post_load_stages(Mock(), ['ca-lobby.ca_lobby.lpay_cd']) is True
+
+        assert all(stages[name].called for name in STAGES)
+        stages['bump_data_version'].assert_called_once()
+
+    @pytest.mark.parametrize('failed', STAGES)
+    @pytest.mark.parametrize('failure', [None, False])
+    def test_failed_stage_keeps_data_version(self, stages, failed, failure):
+        """Test that a failed stage stops the run without invalidating API caches."""
+        stages[failed].return_value = failure
+
+        assert run_post_load_stages(Mock(), ['ca-lobby.ca_lobby.lpay_cd']) is False
+
+        stages['bump_data_version'].assert_not_called()
+        later = STAGES[STAGES.index(failed) + 1:]
+        assert not any(stages[name].called for name in later)
+
+    def test_failed_bump_is_a_failure(self, stages):
+        """Test that a failed version bump is reported."""
+        stages['bump_data_version'].return_value = None
+
+        assert run_post_load_stages(Mock(), []) is False
@@ -14,6 +14,12 @@ from upload import upload_to_bigquery
 from rowtypeforce import row_type_force
 from Bigquery_connection import bigquery_connect
 from Bignewdownload_2 import Bignewdownload
+from data_version import bump_data_version
+from canonical_names import refresh_org_name_canonical
+from latest_tables import build_latest_tables
+from govt_types import refresh_employer_govt_type, refresh_org_govt_type
+from spending_cube import build_spending_cube
+from firm_clients import build_firm_clients
 
 # Configure logging
 logging.basicConfig(
@@ -58,6 +64,45 @@ def get_files_to_process(download_dir, today):
     return files
 
 
+def run_post_load_stages(client, loaded_tables):
+    """
+    Rebuild derived tables after new data lands, then bump the data version.
+
+    Stages run in dependency order and stop at the first failure. The data
+    version is only bumped when every stage succeeded, so API caches are never
+    invalidated and refilled from stale or partially rebuilt tables.
+
+    Args:
+        client: BigQuery client
+        loaded_tables: List of table IDs loaded in this run
+
+    Returns:
+        bool: True if every stage succeeded and the version was bumped
+    """
+    # lpay_latest joins employer_govt_type, so classify employers first
+    stages = [
+        ('employer_govt_type', refresh_employer_govt_type),
+        ('latest_tables', build_latest_tables),
+        ('spending_cube', build_spending_cube),
+        ('firm_clients', build_firm_clients),
+        ('org_name_canonical', refresh_org_name_canonical),
+        ('org_govt_type', refresh_org_govt_type),
+    ]
+
+    for name, stage in stages:
+        # Stages return False or None on failure (row counts or True on success)
+        result = stage(client)
+        if result is None or result is False:
+            logger.error(f"Post-load stage {name} failed; data version not bumped")
+            return False
+
+    # Invalidate API response caches once derived tables are in place
+    if bump_data_version(client, loaded_tables) is None:
+        logger.error("Data version bump failed")
+        return False
+    return True
+
+
 def main(dry_run=False):
     """
     Main pipeline execution.
@@ -88,6 +133,7 @@ def main(dry_run=False):
     logger.info(f"Found {len(files_to_process)} files to process")
 
     client = None
+    loaded_tables = []
     try:
         client = bigquery_connect(credentials_path)
 
@@ -112,12 +158,17 @@ def main(dry_run=False):
                     logger.info(f"[DRY RUN] Would upload {len(cleaned_df)} rows to {full_table_id}")
                 else:
                     # Upload to BigQuery
-                    upload_to_bigquery(cleaned_df, full_table_id, credentials_path, project_id)
+                    if upload_to_bigquery(cleaned_df, full_table_id, credentials_path, project_id):
+                        loaded_tables.append(full_table_id)
 
             except Exception as e:
                 logger.error(f"Failed to process {filepath}: {e}")
                 continue  # Continue with next file
 
+        if loaded_tables and not run_post_load_stages(client, loaded_tables):
+            # SystemExit is not an Exception: the client is still closed below
+            raise SystemExit(1)
+
     except Exception as e:
         logger.error(f"Pipeline failed: {e}")
         raise
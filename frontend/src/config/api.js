@@ -17,6 +17,7 @@ export const API_ENDPOINTS = {
   health: `${API_BASE_URL}/api/health`,
   analytics: `${API_BASE_URL}/api/analytics`,
   search: `${API_BASE_URL}/api/search`,
+  organization: `${API_BASE_URL}/api/organization`,
   status: `${API_BASE_URL}/api/status`,
   cacheStats: `${API_BASE_URL}/api/cache/stats`,
   searchSuggestions: `${API_BASE_URL}/api/search/suggestions`,
@@ -70,4 +71,7 @@ export const apiCall = async (url, options = {}) => {
     }
     throw error;
   }
-};
\ No newline at end of file
+};
+// Organization profile by filer ID (filings, payments by year, top firms, related organizations)
+export const fetchOrganizationProfile = (filerId, options = {}) =>
+  apiCall(`${API_ENDPOINTS.organization}/${encodeURIComponent(filerId)}`, options);
@@ -10,34 +10,22 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'api'))
 
 from utils.bigquery_client import BigQueryClient
+from utils.query_backend import scalar_param
 
-def test_city_recipients():
+def year_params(year):
+    """Year filter for spending_cube queries (None = most recent year in the cube)"""
+    return [scalar_param('year', 'INT64', year)]
+
+def test_city_recipients(year=None):
     """Test the city recipients query"""
     query = """
-    WITH city_payments AS (
-        SELECT
-            d.FILING_ID,
-            d.RPT_DATE_DATE,
-            pay.PAYEE_NAML as recipient_name,
-            CAST(pay.PER_TOTAL AS FLOAT64) as amount
-        FROM `ca-lobby.ca_lobby.lpay_cd` pay
-        JOIN `ca-lobby.ca_lobby.cvr_lobby_disclosure_cd` d
-            ON pay.FILING_ID = d.FILING_ID
-            AND pay.AMEND_ID = d.AMEND_ID
-        WHERE pay.PAYEE_NAML IS NOT NULL
-          AND pay.PER_TOTAL IS NOT NULL
-          AND CAST(pay.PER_TOTAL AS FLOAT64) > 0
-          AND d.RPT_DATE_DATE IS NOT NULL
-          AND EXTRACT(YEAR FROM d.RPT_DATE_DATE) = 2025
-          AND (
-            UPPER(pay.EMPLR_NAML) LIKE '%CITY OF%'
-            OR UPPER(pay.EMPLR_NAML) LIKE '%LEAGUE%CITIES%'
-          )
-    )
     SELECT
-        recipient_name,
-        CAST(ROUND(SUM(amount)) AS INT64) as total_amount
-    FROM city_payments
+        payee_name as recipient_name,
+        CAST(ROUND(SUM(total_amount)) AS INT64) as total_amount
+    FROM `ca-lobby.ca_lobby.spending_cube`
+    WHERE govt_type = 'city'
+      AND payee_name != ''
+      AND year = COALESCE(@year, (SELECT MAX(year) FROM `ca-lobby.ca_lobby.spending_cube`))
     GROUP BY recipient_name
     HAVING total_amount > 0
     ORDER BY total_amount DESC
@@ -49,7 +37,7 @@ def test_city_recipients():
 
     try:
         client = BigQueryClient()
-        result = client.execute_query(query)
+        result = client.execute_query(query, year_params(year))
 
         if result:
             print(f"✓ Query returned {len(result)} results")
@@ -79,34 +67,16 @@ def test_city_recipients():
         import traceback
         traceback.print_exc()
 
-def test_county_recipients():
+def test_county_recipients(year=None):
     """Test the county recipients query"""
     query = """
-    WITH county_payments AS (
-        SELECT
-            d.FILING_ID,
-            d.RPT_DATE_DATE,
-            pay.PAYEE_NAML as recipient_name,
-            CAST(pay.PER_TOTAL AS FLOAT64) as amount
-        FROM `ca-lobby.ca_lobby.lpay_cd` pay
-        JOIN `ca-lobby.ca_lobby.cvr_lobby_disclosure_cd` d
-            ON pay.FILING_ID = d.FILING_ID
-            AND pay.AMEND_ID = d.AMEND_ID
-        WHERE pay.PAYEE_NAML IS NOT NULL
-          AND pay.PER_TOTAL IS NOT NULL
-          AND CAST(pay.PER_TOTAL AS FLOAT64) > 0
-          AND d.RPT_DATE_DATE IS NOT NULL
-          AND EXTRACT(YEAR FROM d.RPT_DATE_DATE) = 2025
-          AND (
-            UPPER(pay.EMPLR_NAML) LIKE '%COUNTY%'
-            OR UPPER(pay.EMPLR_NAML) LIKE '%CSAC%'
-            OR UPPER(pay.EMPLR_NAML) LIKE '%ASSOCIATION OF COUNTIES%'
-          )
-    )
     SELECT
-        recipient_name,
-        CAST(ROUND(SUM(amount)) AS INT64) as total_amount
-    FROM county_payments
+        payee_name as recipient_name,
+        CAST(ROUND(SUM(total_amount)) AS INT64) as total_amount
+    FROM `ca-lobby.ca_lobby.spending_cube`
+    WHERE govt_type = 'county'
+      AND payee_name != ''
+      AND year = COALESCE(@year, (SELECT MAX(year) FROM `ca-lobby.ca_lobby.spending_cube`))
     GROUP BY recipient_name
     HAVING total_amount > 0
     ORDER BY total_amount DESC
@@ -118,7 +88,7 @@ def test_county_recipients():
 
     try:
         client = BigQueryClient()
-        result = client.execute_query(query)
+        result = client.execute_query(query, year_params(year))
 
         if result:
             print(f"✓ Query returned {len(result)} results")
@@ -194,6 +164,7 @@ def explore_lpay_data():
         traceback.print_exc()
 
 if __name__ == '__main__':
-    test_city_recipients()
-    test_county_recipients()
+    year = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    test_city_recipients(year)
+    test_county_recipients(year)
     explore_lpay_data()